@@ -1,12 +1,35 @@
 
+from typing import Callable, Optional
 from flask import Flask
 from Python_Apps.GTN_MVC_Example.config import Config
+from Python_Apps.GTN_MVC_Example.service.provider import ServiceProvider
+from Python_Apps.GTN_MVC_Example.view.json_provider import FastJSONProvider
+from Python_Apps.GTN_MVC_Example.controller.consistency import bp as consistency_bp
 from Python_Apps.GTN_MVC_Example.controller.game_controller import bp as game_bp
+from Python_Apps.GTN_MVC_Example.controller.metrics_controller import bp as metrics_bp
 
-def create_app() -> Flask:
+def build_service():
+    # Imported here: the service pulls in the storage driver and the numpy scoring tables
+    from Python_Apps.GTN_MVC_Example.service.game_service import GameService
+    svc = GameService()
+    if Config.AUTO_MIGRATE:
+        svc.repo.ensure_schema()
+    return svc
+
+def create_app(service_factory: Optional[Callable] = None) -> Flask:
+    """Build the app without touching the database.
+
+    The GameService (and its connection pool) is built by the first request in
+    each process, so this is safe to call before a pre-forking server forks.
+    Create the schema beforehand with `python -m Python_Apps.GTN_MVC_Example.migrate`.
+    """
     app = Flask(__name__)
     app.config.from_object(Config)
-    app.json.sort_keys = False  # preserve insertion order in responses
+    app.json = FastJSONProvider(app)  # model-aware encoder; keeps insertion order
+    app.extensions["gtn_service"] = ServiceProvider(service_factory or build_service)
+    app.register_blueprint(metrics_bp)
+    if Config.DB_REPLICA_HOSTS or Config.SQLITE_REPLICA_PATHS:
+        app.register_blueprint(consistency_bp)  # read-your-writes cookie; only needed with replicas
     app.register_blueprint(game_bp)
     return app
 
@@ -0,0 +1,55 @@
+
+import asyncio
+import threading
+from flask import Flask
+from Python_Apps.GTN_MVC_Example.config import Config
+from Python_Apps.GTN_MVC_Example.service.provider import ServiceProvider
+from Python_Apps.GTN_MVC_Example.view.json_provider import FastJSONProvider
+
+class AsyncFlask(Flask):
+    """Flask app that runs every async view on one long-lived event loop.
+
+    Stock Flask starts a fresh loop per request, which would throw away the
+    async connection pool each time. Here the loop lives in a daemon thread and
+    request threads hand their coroutines to it. Threads do not survive a fork,
+    so the loop is started by the first request in each process.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._loop = ServiceProvider(self._start_loop)
+
+    @staticmethod
+    def _start_loop() -> asyncio.AbstractEventLoop:
+        loop = asyncio.new_event_loop()
+        threading.Thread(target=loop.run_forever, name="gtn-async-loop", daemon=True).start()
+        return loop
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return self._loop.get()
+
+    def async_to_sync(self, func):
+        def run(*args, **kwargs):
+            return asyncio.run_coroutine_threadsafe(func(*args, **kwargs), self.loop).result()
+        return run
+
+def build_async_service():
+    from Python_Apps.GTN_MVC_Example.service.async_game_service import AsyncGameService
+    return AsyncGameService()
+
+def create_async_app() -> Flask:
+    # Imported here so the sync app never needs an async driver installed
+    from Python_Apps.GTN_MVC_Example.controller.async_game_controller import bp as game_async_bp
+
+    app = AsyncFlask(__name__)
+    app.config.from_object(Config)
+    app.json = FastJSONProvider(app)  # model-aware encoder; keeps insertion order
+    # Built per process on first use; its pool binds to that process's loop
+    app.extensions["gtn_service"] = ServiceProvider(build_async_service)
+    app.register_blueprint(game_async_bp)
+    return app
+
+if __name__ == "__main__":
+    app = create_async_app()
+    app.run(debug=True)
@@ -0,0 +1,294 @@
+
+"""Benchmark / load test for the GTN API.
+
+Drives create_app() (or create_async_app()) against a local storage stand-in and
+reports p50/p95/p99 latency, requests per second and DB queries per request for
+each endpoint. Results can be saved as a baseline and compared on later runs.
+
+Run from the repository root:
+
+    python -m Python_Apps.GTN_MVC_Example.benchmark.bench_api --engine sqlite
+    python -m Python_Apps.GTN_MVC_Example.benchmark.bench_api --mode server --clients 8
+    python -m Python_Apps.GTN_MVC_Example.benchmark.bench_api --app async --mode server --clients 8
+    python -m Python_Apps.GTN_MVC_Example.benchmark.bench_api --save-baseline bench_baseline.json
+    python -m Python_Apps.GTN_MVC_Example.benchmark.bench_api --compare bench_baseline.json
+"""
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Tuple
+import argparse
+import http.client
+import itertools
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+ENDPOINTS = ("start", "guess", "game", "games", "games_page", "rounds", "stats", "leaderboard")
+# The async app has no /stats or /leaderboard routes
+ASYNC_ENDPOINTS = tuple(e for e in ENDPOINTS if e not in ("stats", "leaderboard"))
+
+# Statuses a healthy run answers with; any other, a 4xx included, is counted
+# as an error rather than timed as a fast success
+EXPECTED_STATUS = {"start": (201,)}
+DEFAULT_EXPECTED_STATUS = (200, 304)
+
+def _random_guess() -> str:
+    return "".join(random.sample("0123456789", 4))
+
+class QueryCounter:
+    """Counts SQL statements by wrapping the repository's execute hooks."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def wrap(self, fn: Callable) -> Callable:
+        def counted(*args, **kwargs):
+            with self._lock:
+                self.count += 1
+            return fn(*args, **kwargs)
+        return counted
+
+    def wrap_async(self, fn: Callable) -> Callable:
+        async def counted(*args, **kwargs):
+            with self._lock:
+                self.count += 1
+            return await fn(*args, **kwargs)
+        return counted
+
+def _storage_repo(repo):
+    # Unwrap decorators such as CachingGameRepository down to the storage engine
+    while "repo" in vars(repo):
+        repo = vars(repo)["repo"]
+    return repo
+
+def build_app(app_kind: str, engine: str, counter: QueryCounter):
+    """Point Config at a throwaway database, then import and build the app and its schema."""
+    os.environ["GTN_DB_ENGINE"] = engine
+    os.environ.setdefault("GTN_SQLITE_PATH", os.path.join(tempfile.mkdtemp(prefix="gtn-bench-"), "gtn.sqlite3"))
+
+    if app_kind == "async":
+        import asyncio
+        from Python_Apps.GTN_MVC_Example.async_app import create_async_app
+        app = create_async_app()
+        svc = app.extensions["gtn_service"].get()  # built up front so the counter can wrap its repository
+        asyncio.run_coroutine_threadsafe(svc.repo.ensure_schema(), app.loop).result()
+        repo = _storage_repo(svc.repo)
+        repo._run = counter.wrap_async(repo._run)
+        repo._run_many = counter.wrap_async(repo._run_many)
+    else:
+        from Python_Apps.GTN_MVC_Example.app import create_app
+        app = create_app()
+        svc = app.extensions["gtn_service"].get()
+        svc.repo.ensure_schema()
+        repo = _storage_repo(svc.repo)
+        if hasattr(repo, "_execute"):
+            repo._execute = counter.wrap(repo._execute)
+            repo._executemany = counter.wrap(repo._executemany)
+    return app
+
+# --- Transports ---
+class TestClientTransport:
+    def __init__(self, app) -> None:
+        self.client = app.test_client()
+
+    def request(self, method: str, path: str) -> Tuple[int, bytes]:
+        resp = self.client.open(path, method=method)
+        return resp.status_code, resp.get_data()
+
+    def close(self) -> None:
+        pass
+
+class ServerTransport:
+    """Runs the app on a real local WSGI server (werkzeug, threaded) on an ephemeral port."""
+
+    def __init__(self, app) -> None:
+        from werkzeug.serving import make_server
+        logging.getLogger("werkzeug").setLevel(logging.WARNING)  # no per-request access log
+        self.server = make_server("127.0.0.1", 0, app, threaded=True)
+        self.port = self.server.server_port
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def request(self, method: str, path: str) -> Tuple[int, bytes]:
+        conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=30)
+        try:
+            conn.request(method, path)
+            resp = conn.getresponse()
+            return resp.status, resp.read()
+        finally:
+            conn.close()
+
+    def close(self) -> None:
+        self.server.shutdown()
+
+# --- Workload ---
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * pct / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+def _request_for(endpoint: str, game_ids: List[int]) -> Tuple[str, str]:
+    gid = random.choice(game_ids)
+    if endpoint == "start":
+        return "POST", "/start"
+    if endpoint == "guess":
+        return "POST", f"/{gid}/{_random_guess()}"
+    if endpoint == "game":
+        return "GET", f"/game/{gid}"
+    if endpoint == "games":
+        return "GET", "/games"
+    if endpoint == "games_page":
+        return "GET", "/games?limit=50"
+    if endpoint == "stats":
+        return "GET", "/stats"
+    if endpoint == "leaderboard":
+        return "GET", "/leaderboard?limit=20"
+    return "GET", f"/rounds/{gid}"
+
+def run_endpoint(transport, counter: QueryCounter, endpoint: str, game_ids: List[int],
+                 requests: int, clients: int) -> Dict[str, float]:
+    latencies: List[float] = []
+    errors = 0
+    expected = EXPECTED_STATUS.get(endpoint, DEFAULT_EXPECTED_STATUS)
+    lock = threading.Lock()
+
+    def one(_: int) -> None:
+        nonlocal errors
+        method, path = _request_for(endpoint, game_ids)
+        t0 = time.perf_counter()
+        status, _body = transport.request(method, path)
+        elapsed = time.perf_counter() - t0
+        with lock:
+            latencies.append(elapsed)
+            if status not in expected:
+                errors += 1
+
+    queries_before = counter.count
+    t0 = time.perf_counter()
+    if clients <= 1:
+        for i in range(requests):
+            one(i)
+    else:
+        with ThreadPoolExecutor(max_workers=clients) as pool:
+            list(pool.map(one, range(requests)))
+    wall = time.perf_counter() - t0
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "errors": errors,
+        "rps": requests / wall if wall else 0.0,
+        "p50_ms": _percentile(latencies, 50) * 1000,
+        "p95_ms": _percentile(latencies, 95) * 1000,
+        "p99_ms": _percentile(latencies, 99) * 1000,
+        "queries_per_request": (counter.count - queries_before) / requests,
+    }
+
+def seed(transport, games: int, rounds_per_game: int) -> List[int]:
+    ids = []
+    for _ in range(games):
+        _status, body = transport.request("POST", "/start")
+        ids.append(json.loads(body)["gameId"])
+    for gid, _ in itertools.product(ids, range(rounds_per_game)):
+        transport.request("POST", f"/{gid}/{_random_guess()}")
+    return ids
+
+# --- Baselines ---
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            tolerance: float) -> List[str]:
+    """Return one message per metric that regressed by more than `tolerance` (a fraction).
+
+    Error responses always fail the comparison, whatever the baseline had.
+    """
+    regressions = []
+    for endpoint, cur in results.items():
+        if cur["errors"]:
+            regressions.append(f"{endpoint}: {cur['errors']} of {cur['requests']} requests failed")
+        base = baseline.get(endpoint)
+        if not base:
+            continue
+        if cur["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{endpoint}: p95 {cur['p95_ms']:.2f}ms vs baseline {base['p95_ms']:.2f}ms")
+        if cur["rps"] < base["rps"] * (1 - tolerance):
+            regressions.append(f"{endpoint}: {cur['rps']:.0f} req/s vs baseline {base['rps']:.0f} req/s")
+        # Query counts are deterministic, so any increase is a regression
+        if cur["queries_per_request"] > base["queries_per_request"] + 0.01:
+            regressions.append(
+                f"{endpoint}: {cur['queries_per_request']:.2f} queries/request "
+                f"vs baseline {base['queries_per_request']:.2f}"
+            )
+    return regressions
+
+def print_table(results: Dict[str, Dict[str, float]]) -> None:
+    print(f"{'endpoint':<12}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'q/req':>8}{'errors':>8}")
+    for endpoint, r in results.items():
+        print(f"{endpoint:<12}{r['rps']:>10.0f}{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}"
+              f"{r['p99_ms']:>10.2f}{r['queries_per_request']:>8.2f}{r['errors']:>8}")
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the GTN API against a local storage stand-in.")
+    parser.add_argument("--app", choices=("sync", "async"), default="sync")
+    parser.add_argument("--engine", choices=("sqlite", "memory"), default="sqlite")
+    parser.add_argument("--mode", choices=("client", "server"), default="client",
+                        help="Flask test client, or a real local WSGI server over HTTP")
+    parser.add_argument("--requests", type=int, default=500, help="requests per endpoint")
+    parser.add_argument("--clients", type=int, default=1, help="concurrent clients")
+    parser.add_argument("--games", type=int, default=200, help="games to seed before measuring")
+    parser.add_argument("--rounds", type=int, default=3, help="rounds to seed per game")
+    parser.add_argument("--endpoints", help="comma-separated; default: every endpoint the app serves")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--json", dest="json_out", help="write results to this file")
+    parser.add_argument("--save-baseline", help="write results as a baseline file")
+    parser.add_argument("--compare", help="baseline file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed fractional slowdown before a metric counts as a regression")
+    args = parser.parse_args(argv)
+
+    if args.app == "async" and args.engine == "memory":
+        parser.error("the async app has no in-memory engine; use --engine sqlite")
+    served = ASYNC_ENDPOINTS if args.app == "async" else ENDPOINTS
+    endpoints = args.endpoints.split(",") if args.endpoints else list(served)
+    unknown = [e for e in endpoints if e not in served]
+    if unknown:
+        parser.error(f"not served by the {args.app} app: {', '.join(unknown)}")
+
+    random.seed(args.seed)
+    counter = QueryCounter()
+    app = build_app(args.app, args.engine, counter)
+    transport = ServerTransport(app) if args.mode == "server" else TestClientTransport(app)
+    try:
+        game_ids = seed(transport, args.games, args.rounds)
+        results = {
+            endpoint: run_endpoint(transport, counter, endpoint, game_ids, args.requests, args.clients)
+            for endpoint in endpoints
+        }
+    finally:
+        transport.close()
+
+    print(f"app={args.app} engine={args.engine} mode={args.mode} clients={args.clients}")
+    print_table(results)
+
+    for path in (args.json_out, args.save_baseline):
+        if path:
+            with open(path, "w") as fh:
+                json.dump(results, fh, indent=2)
+
+    if args.compare:
+        with open(args.compare) as fh:
+            regressions = compare(results, json.load(fh), args.tolerance)
+        for line in regressions:
+            print("REGRESSION", line)
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+
+"""Memory benchmark for the bulk-read representations of games.
+
+Compares, for N rows:
+  before   - dict rows (cursor(dictionary=True)) mapped to a plain @dataclass Game
+  after    - tuple rows mapped to the slotted Game
+  columns  - tuple rows packed into an array-backed GameColumns
+
+With --engine synthetic (the default) rows are generated in-process, each with
+its own str and datetime objects as a driver would return them, so only the
+representation is measured. With --engine sqlite a temporary database is
+seeded with N games and read back through SQLiteGameRepository (list_games vs
+game_columns); "before" is not available there since the repository no longer
+produces dict rows.
+
+Run from the repository root:
+
+    python -m Python_Apps.GTN_MVC_Example.benchmark.bench_memory --rows 1000000
+    python -m Python_Apps.GTN_MVC_Example.benchmark.bench_memory --engine sqlite --rows 1000000
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterator, List
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from Python_Apps.GTN_MVC_Example.model.game_columns import GameColumns
+from Python_Apps.GTN_MVC_Example.repository.game_repository import GAME_FIELDS, GameRepository
+
+@dataclass
+class LegacyGame:
+    """Game as it was before slots: a regular instance __dict__ per object."""
+    id: int
+    answer: str
+    is_finished: bool
+    started_at: datetime | None = None
+    round_count: int = 0
+    last_guess: str | None = None
+    best_exact: int = 0
+    finished_at: datetime | None = None
+
+_START = datetime(2024, 1, 1)
+
+def _tuple_rows(n: int) -> Iterator[tuple]:
+    for i in range(n):
+        # str() and a fresh datetime per row, as the driver allocates them
+        started = _START + timedelta(seconds=i)
+        finished = i % 3 == 0
+        yield (i + 1, str(1023 + i % 8000).zfill(4), int(finished), started, i % 9,
+               str(4567 + i % 4000), i % 5, started + timedelta(seconds=90) if finished else None)
+
+def _dict_rows(n: int) -> Iterator[dict]:
+    for row in _tuple_rows(n):
+        yield dict(zip(GAME_FIELDS, row))
+
+def build_before(n: int):
+    rows = list(_dict_rows(n))  # fetchall() materializes every row before mapping
+    return [LegacyGame(id=r["id"], answer=r["answer"], is_finished=bool(r["is_finished"]),
+                       started_at=r["started_at"], round_count=r["round_count"], last_guess=r["last_guess"],
+                       best_exact=r["best_exact"], finished_at=r["finished_at"]) for r in rows]
+
+def build_after(n: int):
+    rows = list(_tuple_rows(n))
+    return list(map(GameRepository._row_to_game, rows))
+
+def build_columns(n: int, chunk_size: int = 500):
+    cols = GameColumns()
+    rows = _tuple_rows(n)
+    while True:
+        chunk = [row for _, row in zip(range(chunk_size), rows)]  # fetchmany()
+        if not chunk:
+            return cols
+        cols.extend_rows(chunk)
+
+def measure(name: str, build: Callable[[], object]) -> Dict[str, float]:
+    # Timed without tracemalloc (which slows allocation several-fold), then built again under it
+    gc.collect()
+    t0 = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - t0
+    del result
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    n = len(result)
+    del result
+    gc.collect()
+    return {"name": name, "rows": n, "retained_mb": retained / 2**20, "peak_mb": peak / 2**20,
+            "bytes_per_row": retained / max(n, 1), "seconds": elapsed}
+
+def _seed_sqlite(path: str, n: int) -> None:
+    from Python_Apps.GTN_MVC_Example.repository.sqlite_game_repository import connect_sqlite
+    conn = connect_sqlite(path)
+    conn.execute("BEGIN")
+    conn.executemany(
+        "INSERT INTO game (id, answer, is_finished, started_at, round_count, last_guess, best_exact, finished_at) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        _tuple_rows(n),
+    )
+    conn.execute("COMMIT")
+    conn.close()
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare memory use of bulk game representations.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--engine", choices=("synthetic", "sqlite"), default="synthetic")
+    parser.add_argument("--chunk-size", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    if args.engine == "sqlite":
+        from Python_Apps.GTN_MVC_Example.repository.sqlite_game_repository import SQLiteGameRepository
+        path = os.path.join(tempfile.mkdtemp(prefix="gtn-mem-"), "gtn.sqlite3")
+        repo = SQLiteGameRepository(path)
+        repo.ensure_schema()
+        _seed_sqlite(path, args.rows)
+        cases = [("after (list_games)", repo.list_games),
+                 ("columns (game_columns)", lambda: repo.game_columns(chunk_size=args.chunk_size))]
+    else:
+        cases = [("before (dict rows, dataclass)", lambda: build_before(args.rows)),
+                 ("after (tuple rows, slots)", lambda: build_after(args.rows)),
+                 ("columns (GameColumns)", lambda: build_columns(args.rows, args.chunk_size))]
+
+    print(f"engine={args.engine} rows={args.rows}")
+    print(f"{'representation':<32}{'retained MB':>13}{'peak MB':>10}{'B/row':>8}{'seconds':>9}")
+    for name, build in cases:
+        r = measure(name, build)
+        print(f"{r['name']:<32}{r['retained_mb']:>13.1f}{r['peak_mb']:>10.1f}"
+              f"{r['bytes_per_row']:>8.0f}{r['seconds']:>9.2f}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
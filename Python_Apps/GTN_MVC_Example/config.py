@@ -6,4 +6,45 @@ class Config:
     DB_USER = os.getenv("GTN_DB_USER", "root")
     DB_PASS = os.getenv("GTN_DB_PASSWORD", "RootRoot")  # <- change for your setup
     DB_NAME = os.getenv("GTN_DB_NAME", "gtn")           # <- your DB name
+    # Connection pool, per process: size DB_POOL_MAX to the threads per gunicorn worker
+    DB_POOL_MIN = int(os.getenv("GTN_DB_POOL_MIN", "1"))
+    DB_POOL_MAX = int(os.getenv("GTN_DB_POOL_MAX", "10"))
+    DB_POOL_TIMEOUT = float(os.getenv("GTN_DB_POOL_TIMEOUT", "5"))     # seconds to wait for a free connection
+    DB_POOL_RECYCLE = float(os.getenv("GTN_DB_POOL_RECYCLE", "1800"))  # close connections older than this
+    DB_ENGINE = os.getenv("GTN_DB_ENGINE", "mysql")                   # mysql | sqlite | memory
+    SQLITE_PATH = os.getenv("GTN_SQLITE_PATH", "gtn.sqlite3")
+    # Read replicas (repository/replicated_repository.py); empty means every read goes to the primary
+    DB_REPLICA_HOSTS = os.getenv("GTN_DB_REPLICA_HOSTS", "")            # host[:port],host[:port],...
+    SQLITE_REPLICA_PATHS = os.getenv("GTN_SQLITE_REPLICA_PATHS", "")    # local stand-ins: path,path,...
+    REPLICA_MAX_LAG = float(os.getenv("GTN_REPLICA_MAX_LAG", "5"))      # seconds; laggier replicas are skipped
+    REPLICA_LAG_CHECK = float(os.getenv("GTN_REPLICA_LAG_CHECK", "1"))  # seconds between lag probes
+    # Shards (repository/sharded_repository.py); empty means one database. Not combined with replicas.
+    DB_SHARD_HOSTS = os.getenv("GTN_DB_SHARD_HOSTS", "")                # host[:port],... in shard order
+    SQLITE_SHARD_PATHS = os.getenv("GTN_SQLITE_SHARD_PATHS", "")        # local stand-ins: path,path,...
+    SHARD_ID_STRIDE = int(os.getenv("GTN_SHARD_ID_STRIDE", "16"))       # most shards ever; fixed once ids exist
+    # Write-behind rounds (repository/write_behind.py): guesses are queued and group-committed
+    WRITE_BEHIND = os.getenv("GTN_WRITE_BEHIND", "0") == "1"
+    WRITE_BEHIND_WAIT = os.getenv("GTN_WRITE_BEHIND_WAIT", "1") == "1"     # default for ?wait=: answer after the commit
+    WRITE_BEHIND_QUEUE = int(os.getenv("GTN_WRITE_BEHIND_QUEUE", "10000"))  # queued rounds before guesses block
+    WRITE_BEHIND_BATCH = int(os.getenv("GTN_WRITE_BEHIND_BATCH", "500"))    # most rounds per commit
+    WRITE_BEHIND_DELAY = float(os.getenv("GTN_WRITE_BEHIND_DELAY", "0"))   # seconds a batch waits to fill (0: what queued meanwhile)
+    WRITE_BEHIND_TIMEOUT = float(os.getenv("GTN_WRITE_BEHIND_TIMEOUT", "10"))  # seconds a waiting guess waits
+    AUTO_MIGRATE = os.getenv("GTN_AUTO_MIGRATE", "0") == "1"          # create the schema on first use (dev only)
+    GAME_CACHE_SIZE = int(os.getenv("GTN_GAME_CACHE_SIZE", "10000"))  # 0 disables the game cache
+    GAME_CACHE_TTL = float(os.getenv("GTN_GAME_CACHE_TTL", "300"))    # seconds
+    GAMES_PAGE_DEFAULT = int(os.getenv("GTN_GAMES_PAGE_DEFAULT", "100"))  # /games page without ?limit=
+    GAMES_PAGE_MAX = int(os.getenv("GTN_GAMES_PAGE_MAX", "1000"))       # largest ?limit= on /games
+    ROUNDS_PAGE_MAX = int(os.getenv("GTN_ROUNDS_PAGE_MAX", "1000"))     # largest ?limit= on /rounds/<id>
+    GAMES_STREAM_CHUNK = int(os.getenv("GTN_GAMES_STREAM_CHUNK", "500"))  # rows per fetch when streaming
+    START_BATCH_MAX = int(os.getenv("GTN_START_BATCH_MAX", "10000"))    # largest POST /start?count=
+    GUESS_BATCH_MAX = int(os.getenv("GTN_GUESS_BATCH_MAX", "1000"))     # largest POST /guesses body
+    HINT_CACHE_SIZE = int(os.getenv("GTN_HINT_CACHE_SIZE", "2000"))     # games with cached solver state
+    STATS_COUNTER_SLOTS = int(os.getenv("GTN_STATS_COUNTER_SLOTS", "16"))  # rows per counter, spreads hot-row writes
+    STATS_CACHE_TTL = float(os.getenv("GTN_STATS_CACHE_TTL", "5"))          # seconds /stats and /leaderboard are cached
+    LEADERBOARD_MAX = int(os.getenv("GTN_LEADERBOARD_MAX", "100"))          # largest ?limit= on /leaderboard
+    RESPONSE_CACHE_SIZE = int(os.getenv("GTN_RESPONSE_CACHE_SIZE", "0"))   # cached GET responses; 0 disables
+    RESPONSE_CACHE_TTL = float(os.getenv("GTN_RESPONSE_CACHE_TTL", "30"))  # seconds, bounds cross-worker staleness
+    SLOW_QUERY_MS = float(os.getenv("GTN_SLOW_QUERY_MS", "200"))   # log statements slower than this
+    SERVER_TIMING = os.getenv("GTN_SERVER_TIMING", "1") == "1"     # add Server-Timing headers
+    JSON_PROVIDER = os.getenv("GTN_JSON_PROVIDER", "auto")        # auto | orjson | stdlib (view/json_provider.py)
     JSON_SORT_KEYS = False  # preserve insertion order in Flask responses
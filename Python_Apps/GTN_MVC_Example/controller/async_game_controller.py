@@ -0,0 +1,78 @@
+
+from typing import TYPE_CHECKING
+from flask import Blueprint, current_app, jsonify
+from werkzeug.local import LocalProxy
+from Python_Apps.GTN_MVC_Example.config import Config
+from Python_Apps.GTN_MVC_Example.controller.request_args import int_arg, history_arg
+
+if TYPE_CHECKING:
+    from Python_Apps.GTN_MVC_Example.service.async_game_service import AsyncGameService
+
+# Same routes and payloads as controller/game_controller.py, served by AsyncGameService
+bp = Blueprint("game_async", __name__)
+
+def _service() -> "AsyncGameService":
+    return current_app.extensions["gtn_service"].get()
+
+# Built on first use in each worker process (see create_async_app)
+svc: "AsyncGameService" = LocalProxy(_service)
+
+@bp.before_app_request
+async def auto_migrate():
+    # Off by default: the schema is created by the migrate command (see migrate.py)
+    if Config.AUTO_MIGRATE:
+        await svc.repo.ensure_schema()
+
+@bp.post("/start")
+async def start_game():
+    game = await svc.start_game()
+    return jsonify({"message": "Game started", "gameId": game.id}), 201
+
+@bp.get("/game/<int:gameId>")
+async def get_game(gameId: int):
+    game = await svc.get_game(gameId)
+    if not game:
+        return jsonify({"error": "Not found"}), 404
+    return jsonify(game), 200
+
+@bp.get("/games")
+async def list_games():
+    try:
+        after_id = int_arg("after_id")
+        limit = int_arg("limit")
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
+    limit = max(1, min(Config.GAMES_PAGE_DEFAULT if limit is None else limit, Config.GAMES_PAGE_MAX))
+    games = await svc.list_games(after_id, limit)
+    resp = jsonify(games)
+    if len(games) == limit:
+        resp.headers["X-Next-After-Id"] = str(games[-1].id)
+    return resp, 200
+
+@bp.get("/rounds/<int:gameId>")
+async def list_rounds(gameId: int):
+    try:
+        since_id = int_arg("since")
+        limit = int_arg("limit")
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
+    if limit is not None:
+        limit = max(1, min(limit, Config.ROUNDS_PAGE_MAX))
+    rounds = await svc.list_rounds(gameId, since_id, limit)
+    return jsonify(rounds), 200
+
+@bp.post("/<int:gameId>/<guess>")
+async def make_guess(gameId: int, guess: str):
+    try:
+        result = await svc.make_guess(gameId, guess, history_arg())
+        payload = {
+            "status": result["status"],
+            "game": result["game"],
+            "rounds": result["rounds"],
+            "result": result["result"],
+        }
+        return jsonify(payload), 200
+    except LookupError:
+        return jsonify({"error": "Game not found"}), 404
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
@@ -0,0 +1,89 @@
+
+"""Conditional GET for the read endpoints: validators, 304s and the shared response cache.
+
+Validators come from state the service already has cheaply (the game's
+snapshot, or games_version() for the list), so a matching If-None-Match is
+answered before anything is read from `round` or serialized.
+"""
+from __future__ import annotations
+from datetime import datetime, timezone
+from typing import Iterable, Optional, Tuple
+from flask import Response, g, request
+from Python_Apps.GTN_MVC_Example.model.game import Game
+from Python_Apps.GTN_MVC_Example.service.response_cache import CachedResponse, ResponseCache
+
+def _arg(value) -> str:
+    return "" if value is None else str(value)
+
+def game_etag(game: Game) -> str:
+    return f"g{game.id}-{game.round_count}-{int(game.is_finished)}"
+
+def rounds_etag(game: Game, since_id: Optional[int], limit: Optional[int]) -> str:
+    # Rounds only change when round_count does; the query args pick the slice
+    return f"r{game.id}-{game.round_count}-{int(game.is_finished)}-{_arg(since_id)}-{_arg(limit)}"
+
+def games_etag(version: Tuple[int, int, int], after_id: Optional[int], limit: Optional[int]) -> str:
+    # (max id, finished games, rounds): list items carry round snapshots, so rounds count too
+    max_id, finished, rounds = version
+    return f"l{max_id}-{finished}-{rounds}-{_arg(after_id)}-{_arg(limit)}"
+
+def game_last_modified(game: Game) -> Optional[datetime]:
+    """When the game last changed, where the snapshot knows it (not for games with open rounds)."""
+    if game.is_finished:
+        changed = game.finished_at
+    elif game.round_count == 0:
+        changed = game.started_at
+    else:
+        return None
+    # Stored timestamps are naive local time; HTTP dates are UTC
+    return changed.astimezone(timezone.utc) if changed else None
+
+def not_modified(etag: str, last_modified: Optional[datetime] = None) -> Optional[Response]:
+    """A 304 if the request's validators still match, else None."""
+    if request.if_none_match:
+        matched = request.if_none_match.contains_weak(etag)
+    elif last_modified is not None and request.if_modified_since is not None:
+        matched = last_modified.replace(microsecond=0) <= request.if_modified_since
+    else:
+        matched = False
+    if not matched:
+        return None
+    resp = Response(status=304)
+    resp.set_etag(etag)
+    if last_modified is not None:
+        resp.last_modified = last_modified
+    return resp
+
+def from_cache(cache: Optional[ResponseCache]) -> Optional[Response]:
+    """Serve a GET straight from the shared response cache (200 or 304), if present."""
+    if cache is None:
+        return None
+    g.gtn_cache_generation = cache.generation  # read before the handler loads anything
+    entry = cache.get(request.full_path)
+    if entry is None:
+        return None
+    resp = not_modified(entry.etag, entry.last_modified)
+    if resp is None:
+        resp = Response(entry.body, mimetype=entry.mimetype)
+        resp.set_etag(entry.etag)
+        if entry.last_modified is not None:
+            resp.last_modified = entry.last_modified
+    resp.headers.update(entry.headers)
+    return resp
+
+def conditional(
+    resp: Response,
+    etag: str,
+    last_modified: Optional[datetime] = None,
+    cache: Optional[ResponseCache] = None,
+    tags: Iterable[str] = (),
+) -> Response:
+    """Attach validators to a 200 response and store it in the shared cache."""
+    resp.set_etag(etag)
+    if last_modified is not None:
+        resp.last_modified = last_modified
+    if cache is not None:
+        headers = {k: v for k, v in resp.headers.items() if k == "X-Next-After-Id"}
+        entry = CachedResponse(resp.get_data(), resp.mimetype, etag, last_modified, headers)
+        cache.put(request.full_path, entry, tags, g.get("gtn_cache_generation"))
+    return resp
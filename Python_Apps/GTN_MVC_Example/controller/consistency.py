@@ -0,0 +1,33 @@
+import math
+from flask import Blueprint, g, request
+from Python_Apps.GTN_MVC_Example.config import Config
+from Python_Apps.GTN_MVC_Example.repository.replicated_repository import begin_session, current_session, end_session
+
+# Read-your-writes across requests when reads go to replicas (repository/replicated_repository.py).
+# A request that writes sets a short-lived cookie with the write's time; requests carrying it
+# read from the primary until every eligible replica must have caught up with that write.
+bp = Blueprint("consistency", __name__)
+LAST_WRITE_COOKIE = "gtn_last_write"
+
+@bp.before_app_request
+def _begin_read_session():
+    try:
+        last_write = float(request.cookies.get(LAST_WRITE_COOKIE, 0))
+    except ValueError:
+        last_write = 0.0
+    g.gtn_read_session = begin_session(last_write)
+
+@bp.after_app_request
+def _remember_write(response):
+    session = current_session()
+    if session is not None and session.wrote:
+        # Past max lag (+1s granularity) a replica either has the write or is skipped
+        response.set_cookie(LAST_WRITE_COOKIE, f"{session.last_write:.3f}",
+                            max_age=math.ceil(Config.REPLICA_MAX_LAG) + 1, httponly=True, samesite="Lax")
+    return response
+
+@bp.teardown_app_request
+def _end_read_session(exc):
+    token = g.pop("gtn_read_session", None)
+    if token is not None:
+        end_session(token)
@@ -1,43 +1,198 @@
 
-from flask import Blueprint, request, jsonify
-from Python_Apps.GTN_MVC_Example.service.game_service import GameService
-from Python_Apps.GTN_MVC_Example.view.json_view import game_to_dict, games_to_list, rounds_to_list
+from typing import TYPE_CHECKING
+from flask import Blueprint, Response, current_app, request, jsonify
+from werkzeug.local import LocalProxy
+from Python_Apps.GTN_MVC_Example.config import Config
+from Python_Apps.GTN_MVC_Example.controller.conditional import (
+    conditional, from_cache, game_etag, game_last_modified, games_etag, not_modified, rounds_etag,
+)
+from Python_Apps.GTN_MVC_Example.controller.request_args import bool_arg, int_arg, history_arg
+from Python_Apps.GTN_MVC_Example.repository.base import LEADERBOARD_ORDERS
+from Python_Apps.GTN_MVC_Example.repository.connection_pool import PoolTimeoutError
+from Python_Apps.GTN_MVC_Example.repository.write_behind import WriteBehindTimeout
+from Python_Apps.GTN_MVC_Example.view.json_view import game_json, stats_to_dict
+
+if TYPE_CHECKING:
+    from Python_Apps.GTN_MVC_Example.service.game_service import GameService
 
 bp = Blueprint("game", __name__)
-svc = GameService()
+
+def _service() -> "GameService":
+    return current_app.extensions["gtn_service"].get()
+
+# The app's GameService, built on first use in each worker process (see create_app)
+svc: "GameService" = LocalProxy(_service)
+
+@bp.app_errorhandler(PoolTimeoutError)
+def pool_exhausted(err):
+    # Every pooled connection stayed busy for DB_POOL_TIMEOUT seconds: shed load
+    resp = jsonify({"error": "Database busy, try again"})
+    resp.headers["Retry-After"] = "1"
+    return resp, 503
+
+@bp.app_errorhandler(WriteBehindTimeout)
+def write_behind_backlog(err):
+    # The round is still queued and will most likely be written: check /rounds before guessing again
+    resp = jsonify({"error": "Guess queued but not yet saved, try again shortly"})
+    resp.headers["Retry-After"] = "1"
+    return resp, 503
+
+def _stream_ndjson(games):
+    for g in games:
+        yield game_json(g) + "\n"
+
+def _stream_json_array(games):
+    yield "["
+    first = True
+    for g in games:
+        yield ("" if first else ",") + game_json(g)
+        first = False
+    yield "]"
 
 @bp.post("/start")
 def start_game():
+    # ?count=N starts N games in one go (tournaments, load tests)
+    try:
+        count = int_arg("count")
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
+    if count is not None:
+        if not 1 <= count <= Config.START_BATCH_MAX:
+            return jsonify({"error": f"count must be between 1 and {Config.START_BATCH_MAX}."}), 400
+        ids = [g.id for g in svc.start_games(count)]
+        return jsonify({
+            "message": "Games started",
+            "count": len(ids),
+            "firstGameId": ids[0],
+            "lastGameId": ids[-1],
+            # Consecutive on a single database; spread over the shards when sharded
+            "contiguous": ids[-1] - ids[0] == len(ids) - 1,
+            "gameIds": ids,
+        }), 201
     game = svc.start_game()
     # Return new gameId as JSON (201 Created)
     return jsonify({"message": "Game started", "gameId": game.id}), 201
 
 @bp.get("/game/<int:gameId>")
 def get_game(gameId: int):
+    # Conditional GET: ETag from (id, round count, finished); see controller/conditional.py
+    cached = from_cache(svc.responses)
+    if cached:
+        return cached
     game = svc.get_game(gameId)
     if not game:
         return jsonify({"error": "Not found"}), 404
-    return jsonify(game_to_dict(game)), 200
+    etag, last_modified = game_etag(game), game_last_modified(game)
+    return not_modified(etag, last_modified) or conditional(
+        jsonify(game), etag, last_modified, svc.responses, (f"game:{gameId}",)
+    )
 
 @bp.get("/games")
 def list_games():
-    games = svc.list_games()
-    return jsonify(games_to_list(games)), 200
+    # ?after_id=&limit= pages newest-first by id; only ?stream=ndjson|json returns every game
+    try:
+        after_id = int_arg("after_id")
+        limit = int_arg("limit")
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
+
+    stream = request.args.get("stream")
+    if stream == "ndjson":
+        return Response(_stream_ndjson(svc.iter_games(after_id)), mimetype="application/x-ndjson"), 200
+    if stream == "json":
+        return Response(_stream_json_array(svc.iter_games(after_id)), mimetype="application/json"), 200
+    if stream is not None:
+        return jsonify({"error": "stream must be 'ndjson' or 'json'."}), 400
+
+    limit = max(1, min(Config.GAMES_PAGE_DEFAULT if limit is None else limit, Config.GAMES_PAGE_MAX))
+    cached = from_cache(svc.responses)
+    if cached:
+        return cached
+    # Version first: a write landing before the page is read only makes the ETag older, never newer
+    etag = games_etag(svc.games_version(), after_id, limit)
+    unchanged = not_modified(etag)
+    if unchanged:
+        return unchanged
+    games = svc.list_games(after_id, limit)
+    resp = jsonify(games)
+    if len(games) == limit:
+        # Cursor for the next page
+        resp.headers["X-Next-After-Id"] = str(games[-1].id)
+    return conditional(resp, etag, cache=svc.responses, tags=("games",))
 
 @bp.get("/rounds/<int:gameId>")
 def list_rounds(gameId: int):
-    rounds = svc.list_rounds(gameId)
-    return jsonify(rounds_to_list(rounds)), 200
+    # ?since=<roundId> returns only newer rounds; ?limit=N caps to the newest N
+    try:
+        since_id = int_arg("since")
+        limit = int_arg("limit")
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
+    if limit is not None:
+        limit = max(1, min(limit, Config.ROUNDS_PAGE_MAX))
+    cached = from_cache(svc.responses)
+    if cached:
+        return cached
+    game = svc.get_game(gameId)
+    if not game:
+        return jsonify([]), 200
+    etag, last_modified = rounds_etag(game, since_id, limit), game_last_modified(game)
+    return not_modified(etag, last_modified) or conditional(
+        jsonify(svc.list_rounds(gameId, since_id, limit)), etag, last_modified, svc.responses, (f"game:{gameId}",)
+    )
+
+@bp.get("/hint/<int:gameId>")
+def get_hint(gameId: int):
+    hint = svc.hint(gameId)
+    if not hint:
+        return jsonify({"error": "Not found"}), 404
+    return jsonify(hint), 200
+
+@bp.get("/stats")
+def get_stats():
+    return jsonify(stats_to_dict(svc.stats())), 200
+
+@bp.get("/leaderboard")
+def get_leaderboard():
+    # ?by=rounds|time picks the ordering of fastest wins; ?limit=N (default 10)
+    by = request.args.get("by", "rounds")
+    if by not in LEADERBOARD_ORDERS:
+        return jsonify({"error": "by must be 'rounds' or 'time'."}), 400
+    try:
+        limit = int_arg("limit")
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
+    limit = max(1, min(limit or 10, Config.LEADERBOARD_MAX))
+    return jsonify(svc.leaderboard(by, limit)), 200
+
+@bp.post("/guesses")
+def make_guesses():
+    # Body: [{"gameId": 1, "guess": "0123"}, ...] or [[1, "0123"], ...]; results come back in order
+    data = request.get_json(silent=True)
+    if not isinstance(data, list):
+        return jsonify({"error": "Body must be a JSON array of guesses."}), 400
+    if len(data) > Config.GUESS_BATCH_MAX:
+        return jsonify({"error": f"At most {Config.GUESS_BATCH_MAX} guesses per batch."}), 400
+    pairs = []
+    for item in data:
+        if isinstance(item, dict):
+            item = (item.get("gameId"), item.get("guess"))
+        if not (isinstance(item, (list, tuple)) and len(item) == 2
+                and isinstance(item[0], int) and not isinstance(item[0], bool) and isinstance(item[1], str)):
+            return jsonify({"error": "Each guess needs an integer gameId and a string guess."}), 400
+        pairs.append((item[0], item[1]))
+    return jsonify(svc.make_guesses(pairs)), 200
 
 @bp.post("/<int:gameId>/<guess>")
 def make_guess(gameId: int, guess: str):
     try:
-        result = svc.make_guess(gameId, guess)
-        # Serialize nested objects
+        # ?wait=0 answers before a write-behind round is committed (GTN_WRITE_BEHIND)
+        result = svc.make_guess(gameId, guess, history_arg(), bool_arg("wait"))
+        # Models go to jsonify as-is; the app JSON provider encodes them (view/json_provider.py)
         payload = {
             "status": result["status"],
-            "game": game_to_dict(result["game"]),
-            "rounds": rounds_to_list(result["rounds"]),
+            "game": result["game"],
+            "rounds": result["rounds"],
             "result": result["result"],
         }
         return jsonify(payload), 200
@@ -0,0 +1,37 @@
+
+import time
+from flask import Blueprint, Response, g, request
+from Python_Apps.GTN_MVC_Example.config import Config
+from Python_Apps.GTN_MVC_Example.repository.instrumentation import METRICS, start_request, end_request
+
+# Per-request DB instrumentation (Server-Timing header) and the Prometheus /metrics endpoint
+bp = Blueprint("metrics", __name__)
+
+@bp.before_app_request
+def _start_timing():
+    g.gtn_started = time.perf_counter()
+    g.gtn_stats_token = start_request()
+
+@bp.after_app_request
+def _finish_timing(response):
+    token = g.pop("gtn_stats_token", None)
+    if token is None:
+        return response
+    stats = end_request(token)
+    elapsed = time.perf_counter() - g.pop("gtn_started")
+    METRICS.add_request(request.url_rule.rule if request.url_rule else "<unmatched>",
+                        request.method, response.status_code, elapsed)
+    # A streamed body (/games?stream=) is produced after this hook, so its queries would be
+    # missing from the header; leave it off rather than under-report them
+    if Config.SERVER_TIMING and not response.is_streamed:
+        response.headers["Server-Timing"] = (
+            f'db;dur={stats.exec_time * 1000:.2f};desc="{stats.queries} queries, {stats.rows} rows", '
+            f"pool;dur={stats.pool_wait * 1000:.2f}, "
+            f"repo;dur={stats.repo_time * 1000:.2f}, "
+            f"app;dur={elapsed * 1000:.2f}"
+        )
+    return response
+
+@bp.get("/metrics")
+def metrics():
+    return Response(METRICS.render_prometheus(), mimetype="text/plain; version=0.0.4"), 200
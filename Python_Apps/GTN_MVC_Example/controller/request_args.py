@@ -0,0 +1,30 @@
+from flask import request
+
+def int_arg(name: str) -> int | None:
+    raw = request.args.get(name)
+    if raw is None or raw == "":
+        return None
+    if not raw.isdigit():
+        raise ValueError(f"{name} must be a non-negative integer.")
+    return int(raw)
+
+def bool_arg(name: str) -> bool | None:
+    raw = request.args.get(name)
+    if raw is None or raw == "":
+        return None
+    if raw in ("1", "true"):
+        return True
+    if raw in ("0", "false"):
+        return False
+    raise ValueError(f"{name} must be 1/true or 0/false.")
+
+def history_arg() -> int | None:
+    # ?rounds=all (default) | new (just this round) | N (newest N rounds)
+    raw = request.args.get("rounds", "all")
+    if raw == "all":
+        return None
+    if raw == "new":
+        return 1
+    if raw.isdigit():
+        return int(raw)
+    raise ValueError("rounds must be 'all', 'new' or a number.")
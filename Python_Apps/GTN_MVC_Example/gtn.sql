@@ -6,7 +6,11 @@ CREATE TABLE IF NOT EXISTS game (
             id INT AUTO_INCREMENT PRIMARY KEY,
             answer CHAR(4) NOT NULL,
             is_finished TINYINT(1) NOT NULL DEFAULT 0,
-            started_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+            started_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            round_count INT NOT NULL DEFAULT 0,
+            last_guess CHAR(4) NULL,
+            best_exact INT NOT NULL DEFAULT 0,
+            finished_at TIMESTAMP NULL
         );
 
         CREATE TABLE IF NOT EXISTS round (
@@ -18,4 +22,21 @@ CREATE TABLE IF NOT EXISTS game (
             created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
             CONSTRAINT fk_round_game FOREIGN KEY (game_id) REFERENCES game(id) ON DELETE CASCADE,
             INDEX idx_round_game_created (game_id, created_at)
-        );
\ No newline at end of file
+        );
+
+        CREATE TABLE IF NOT EXISTS stat_counter (
+            name VARCHAR(32) NOT NULL,
+            slot INT NOT NULL,
+            value BIGINT NOT NULL DEFAULT 0,
+            PRIMARY KEY (name, slot)
+        );
+
+        CREATE TABLE IF NOT EXISTS leaderboard (
+            game_id INT PRIMARY KEY,
+            rounds INT NOT NULL,
+            seconds INT NOT NULL,
+            finished_at TIMESTAMP NULL,
+            CONSTRAINT fk_leaderboard_game FOREIGN KEY (game_id) REFERENCES game(id) ON DELETE CASCADE,
+            INDEX idx_leaderboard_rounds (rounds, seconds),
+            INDEX idx_leaderboard_time (seconds, rounds)
+        );
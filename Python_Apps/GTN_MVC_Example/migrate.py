@@ -0,0 +1,46 @@
+
+"""Create or upgrade the GTN schema; run before starting the app, and after upgrades.
+
+The app never creates tables itself (unless GTN_AUTO_MIGRATE=1, meant for
+local development). Every step is idempotent, so running this again is safe.
+The engine and database come from the same GTN_* variables the app reads.
+
+From the repository root:
+
+    python -m Python_Apps.GTN_MVC_Example.migrate
+    python -m Python_Apps.GTN_MVC_Example.migrate --async   # through the async driver instead
+"""
+from __future__ import annotations
+from typing import List
+import argparse
+import asyncio
+import time
+from Python_Apps.GTN_MVC_Example.config import Config
+
+def migrate() -> None:
+    from Python_Apps.GTN_MVC_Example.repository.factory import make_repository
+    make_repository().ensure_schema()
+
+async def migrate_async() -> None:
+    from Python_Apps.GTN_MVC_Example.repository.async_game_repository import make_async_repository
+    repo = make_async_repository()
+    try:
+        await repo.ensure_schema()
+    finally:
+        await repo.close()
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Create or upgrade the GTN database schema.")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="use the async driver (aiomysql/aiosqlite), for async-only deployments")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    if args.use_async:
+        asyncio.run(migrate_async())
+    else:
+        migrate()
+    print(f"schema up to date on {Config.DB_ENGINE} in {time.perf_counter() - t0:.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,14 @@
 from dataclasses import dataclass
 from datetime import datetime
 
-@dataclass
+@dataclass(slots=True)
 class Game:
     id: int
     answer: str
     is_finished: bool
     started_at: datetime | None = None
+    # Snapshot kept up to date as rounds are recorded, so readers don't scan `round`
+    round_count: int = 0
+    last_guess: str | None = None
+    best_exact: int = 0
+    finished_at: datetime | None = None
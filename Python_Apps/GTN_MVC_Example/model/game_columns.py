@@ -0,0 +1,96 @@
+
+from __future__ import annotations
+from array import array
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator
+from Python_Apps.GTN_MVC_Example.model.game import Game
+
+_EPOCH = datetime(1970, 1, 1)
+_NO_TIME = -(2 ** 63)    # NULL timestamp
+_NO_CODE = b"\0\0\0\0"   # NULL last_guess
+CODE_WIDTH = 4           # answer and last_guess are CHAR(4)
+
+def _seconds(d: datetime | None) -> int:
+    # Naive local timestamps, stored as whole seconds from 1970-01-01 (no timezone math)
+    return _NO_TIME if d is None else (d - _EPOCH) // timedelta(seconds=1)
+
+def _datetime(s: int) -> datetime | None:
+    return None if s == _NO_TIME else _EPOCH + timedelta(seconds=s)
+
+class GameColumns:
+    """Array-backed, column-oriented batch of games for bulk reads.
+
+    Each column is one typed array (or a fixed-width bytearray for the 4-char
+    codes), so a row costs about 38 bytes instead of a Game object plus its
+    str and datetime objects. Rows keep the order they were appended in.
+    Timestamps keep whole seconds only, which is all the schema stores.
+    Indexing or iterating builds Game objects on demand.
+    """
+
+    __slots__ = ("ids", "answers", "is_finished", "started_at", "round_count",
+                 "last_guess", "best_exact", "finished_at")
+
+    def __init__(self) -> None:
+        self.ids = array("q")
+        self.answers = bytearray()
+        self.is_finished = bytearray()
+        self.started_at = array("q")
+        self.round_count = array("i")
+        self.last_guess = bytearray()
+        self.best_exact = bytearray()
+        self.finished_at = array("q")
+
+    def append_row(self, row: tuple) -> None:
+        """Append one row in GAME_FIELDS order, as the repository's cursors return it."""
+        game_id, answer, is_finished, started_at, round_count, last_guess, best_exact, finished_at = row
+        self.ids.append(game_id)
+        self.answers += answer.encode("ascii")
+        self.is_finished.append(1 if is_finished else 0)
+        self.started_at.append(_seconds(started_at))
+        self.round_count.append(round_count)
+        self.last_guess += _NO_CODE if last_guess is None else last_guess.encode("ascii")
+        self.best_exact.append(best_exact)
+        self.finished_at.append(_seconds(finished_at))
+
+    def extend_rows(self, rows: Iterable[tuple]) -> None:
+        for row in rows:
+            self.append_row(row)
+
+    def append(self, game: Game) -> None:
+        self.append_row((game.id, game.answer, game.is_finished, game.started_at, game.round_count,
+                         game.last_guess, game.best_exact, game.finished_at))
+
+    @classmethod
+    def from_games(cls, games: Iterable[Game]) -> "GameColumns":
+        cols = cls()
+        for g in games:
+            cols.append(g)
+        return cols
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, i: int) -> Game:
+        if i < 0:
+            i += len(self.ids)
+        lo, hi = i * CODE_WIDTH, (i + 1) * CODE_WIDTH
+        guess = self.last_guess[lo:hi]
+        return Game(
+            self.ids[i],
+            self.answers[lo:hi].decode("ascii"),
+            bool(self.is_finished[i]),
+            _datetime(self.started_at[i]),
+            self.round_count[i],
+            None if guess == _NO_CODE else guess.decode("ascii"),
+            self.best_exact[i],
+            _datetime(self.finished_at[i]),
+        )
+
+    def __iter__(self) -> Iterator[Game]:
+        for i in range(len(self.ids)):
+            yield self[i]
+
+    def nbytes(self) -> int:
+        """Payload bytes held by the columns (excluding small fixed object overheads)."""
+        return (sum(a.itemsize * len(a) for a in (self.ids, self.started_at, self.round_count, self.finished_at))
+                + len(self.answers) + len(self.is_finished) + len(self.last_guess) + len(self.best_exact))
@@ -0,0 +1,9 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+@dataclass(slots=True)
+class LeaderboardEntry:
+    game_id: int
+    rounds: int
+    seconds: int
+    finished_at: datetime | None = None
@@ -1,9 +1,9 @@
 from dataclasses import dataclass
 from datetime import datetime
 
-@dataclass
+@dataclass(slots=True)
 class Round:
-    id: int
+    id: int | None  # None while a write-behind round is still queued
     game_id: int
     guess: str
     exact_match: int
@@ -0,0 +1,301 @@
+
+from __future__ import annotations
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import AsyncIterator, Callable, Iterable, Optional, List, Tuple
+import asyncio
+import sqlite3
+import weakref
+from Python_Apps.GTN_MVC_Example.model.game import Game
+from Python_Apps.GTN_MVC_Example.model.round import Round
+from Python_Apps.GTN_MVC_Example.config import Config
+from Python_Apps.GTN_MVC_Example.repository.base import after_round, finished, stats_rows
+from Python_Apps.GTN_MVC_Example.repository.game_repository import (
+    COUNTER_UPSERT, GAME_COLUMNS, LEADERBOARD_INSERT, SNAPSHOT_BACKFILL, SNAPSHOT_COLUMNS, SNAPSHOT_UPDATE,
+    GameRepository, leaderboard_params, snapshot_params,
+)
+from Python_Apps.GTN_MVC_Example.repository.sqlite_game_repository import SQLITE_COUNTER_UPSERT, SQLITE_DDL
+
+class AsyncGameRepository:
+    """asyncio counterpart of GameRepository on top of an aiomysql pool.
+
+    SQL is shared with GameRepository. Pools are bound to an event loop, so one
+    pool is kept per running loop; close() releases the current loop's pool.
+    """
+
+    placeholder = "%s"
+    for_update = " FOR UPDATE"
+    counter_upsert = COUNTER_UPSERT
+
+    def __init__(self, pool_size: int = 5) -> None:
+        self.pool_size = pool_size
+        self._pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, object]" = weakref.WeakKeyDictionary()
+        self._schema_ready = False
+
+    # --- Connection handling (overridden per driver) ---
+    async def _create_pool(self):
+        import aiomysql  # optional dependency, only needed for the async MySQL path
+        return await aiomysql.create_pool(
+            minsize=1,
+            maxsize=self.pool_size,
+            host=Config.DB_HOST,
+            port=Config.DB_PORT,
+            user=Config.DB_USER,
+            password=Config.DB_PASS,
+            db=Config.DB_NAME,
+            # aiomysql drops connections released mid-transaction, so reads run in
+            # autocommit and record_guess opens its transaction explicitly
+            autocommit=True,
+        )
+
+    async def _pool(self):
+        loop = asyncio.get_running_loop()
+        pool = self._pools.get(loop)
+        if pool is None:
+            pool = self._pools[loop] = await self._create_pool()
+        return pool
+
+    @asynccontextmanager
+    async def _conn(self):
+        pool = await self._pool()
+        async with pool.acquire() as conn:
+            yield conn
+
+    async def close(self) -> None:
+        pool = self._pools.pop(asyncio.get_running_loop(), None)
+        if pool is not None:
+            pool.close()
+            await pool.wait_closed()
+
+    async def _cursor(self, conn):
+        return await conn.cursor()  # tuple rows, mapped positionally like GameRepository
+
+    async def _begin(self, conn) -> None:
+        await conn.begin()
+
+    def _sql(self, sql: str) -> str:
+        return sql if self.placeholder == "%s" else sql.replace("%s", self.placeholder)
+
+    async def _run(self, conn, sql: str, params: tuple = ()):
+        cur = await self._cursor(conn)
+        await cur.execute(self._sql(sql), params)
+        return cur
+
+    async def _run_many(self, conn, sql: str, seq_params: List[tuple]) -> None:
+        cur = await self._cursor(conn)
+        await cur.executemany(self._sql(sql), seq_params)
+        await cur.close()
+
+    async def ensure_schema(self) -> None:
+        if self._schema_ready:
+            return
+        async with self._conn() as conn:
+            for ddl in GameRepository.DDL:
+                cur = await self._run(conn, ddl)
+                await cur.close()
+            await self._migrate_snapshot(conn)
+            await conn.commit()
+        self._schema_ready = True
+
+    async def _migrate_snapshot(self, conn) -> None:
+        """Same as GameRepository._migrate_snapshot."""
+        cur = await self._run(conn, "SELECT * FROM game LIMIT 0")
+        await cur.fetchall()
+        existing = {d[0] for d in cur.description}
+        await cur.close()
+        missing = [(name, ddl) for name, ddl in SNAPSHOT_COLUMNS if name not in existing]
+        for name, ddl in missing:
+            cur = await self._run(conn, f"ALTER TABLE game ADD COLUMN {name} {ddl}")
+            await cur.close()
+        if missing:
+            cur = await self._run(conn, SNAPSHOT_BACKFILL)
+            await cur.close()
+
+    # --- Game CRUD ---
+    async def create_game(self, answer: str) -> Game:
+        started_at = datetime.now().replace(microsecond=0)
+        async with self._conn() as conn:
+            await self._begin(conn)
+            try:
+                cur = await self._run(
+                    conn,
+                    "INSERT INTO game (answer, is_finished, started_at) VALUES (%s, %s, %s)",
+                    (answer, 0, started_at),
+                )
+                game = Game(id=cur.lastrowid, answer=answer, is_finished=False, started_at=started_at)
+                await cur.close()
+                await self._write_stats(conn, [(None, game)])
+                await conn.commit()
+                return game
+            except BaseException:
+                await conn.rollback()
+                raise
+
+    async def get_game(self, game_id: int) -> Optional[Game]:
+        async with self._conn() as conn:
+            cur = await self._run(
+                conn,
+                f"SELECT {GAME_COLUMNS} FROM game WHERE id=%s",
+                (game_id,),
+            )
+            row = await cur.fetchone()
+            await cur.close()
+            return GameRepository._row_to_game(row) if row else None
+
+    async def list_games(self, after_id: Optional[int] = None, limit: Optional[int] = None) -> List[Game]:
+        async with self._conn() as conn:
+            cur = await self._run(conn, *GameRepository._games_page_sql(after_id, limit))
+            rows = await cur.fetchall()
+            await cur.close()
+            return [GameRepository._row_to_game(r) for r in rows]
+
+    async def _lock_game(self, conn, game_id: int) -> Optional[Game]:
+        cur = await self._run(conn, f"SELECT {GAME_COLUMNS} FROM game WHERE id=%s" + self.for_update, (game_id,))
+        row = await cur.fetchone()
+        await cur.close()
+        return GameRepository._row_to_game(row) if row else None
+
+    async def mark_finished(self, game_id: int) -> None:
+        async with self._conn() as conn:
+            await self._begin(conn)
+            try:
+                game = await self._lock_game(conn, game_id)
+                if game is not None and not game.is_finished:
+                    done = finished(game, datetime.now().replace(microsecond=0))
+                    cur = await self._run(conn, SNAPSHOT_UPDATE, snapshot_params(done))
+                    await cur.close()
+                    await self._write_stats(conn, [(game, done)])
+                await conn.commit()
+            except BaseException:
+                await conn.rollback()
+                raise
+
+    # --- Round operations ---
+    async def list_rounds(self, game_id: int, since_id: Optional[int] = None, limit: Optional[int] = None) -> List[Round]:
+        async with self._conn() as conn:
+            cur = await self._run(conn, *GameRepository._rounds_sql(game_id, since_id, limit))
+            rows = await cur.fetchall()
+            await cur.close()
+            return [GameRepository._row_to_round(r) for r in rows]
+
+    # --- Unit of work ---
+    async def record_guess(
+        self,
+        game_id: int,
+        guess: str,
+        score: Callable[[str], Tuple[int, int]],
+        history: Optional[int] = None,
+    ) -> Optional[Tuple[Game, Round, List[Round]]]:
+        """Same contract as GameRepository.record_guess."""
+        async with self._conn() as conn:
+            await self._begin(conn)
+            try:
+                game = await self._lock_game(conn, game_id)
+                if game is None:
+                    await conn.rollback()
+                    return None
+
+                exact, partial = score(game.answer)
+                cur = await self._run(
+                    conn,
+                    "INSERT INTO round (game_id, guess, exact_match, partial_match) VALUES (%s, %s, %s, %s)",
+                    (game_id, guess, exact, partial),
+                )
+                new_round = Round(id=cur.lastrowid, game_id=game_id, guess=guess, exact_match=exact, partial_match=partial)
+                await cur.close()
+
+                before, game = game, after_round(game, guess, exact, datetime.now().replace(microsecond=0))
+                cur = await self._run(conn, SNAPSHOT_UPDATE, snapshot_params(game))
+                await cur.close()
+                await self._write_stats(conn, [(before, game)])
+
+                cur = await self._run(conn, *GameRepository._rounds_sql(game_id, None, history))
+                rounds = [GameRepository._row_to_round(r) for r in await cur.fetchall()]
+                await cur.close()
+                await conn.commit()
+                return game, new_round, rounds
+            except BaseException:
+                await conn.rollback()
+                raise
+
+    async def _write_stats(self, conn, changes: Iterable[Tuple[Optional[Game], Game]]) -> None:
+        """Same as GameRepository._write_stats."""
+        counters, entries = stats_rows(changes)
+        if counters:
+            await self._run_many(conn, self.counter_upsert, counters)
+        if entries:
+            await self._run_many(conn, LEADERBOARD_INSERT, [leaderboard_params(e) for e in entries])
+
+class _AsyncSQLitePool:
+    """A small asyncio pool of aiosqlite connections to one database file."""
+
+    def __init__(self, path: str, size: int) -> None:
+        self.path = path
+        self.size = size
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._created = 0
+
+    async def _connect(self):
+        import aiosqlite  # optional dependency, only needed for the async SQLite path
+        conn = await aiosqlite.connect(self.path, detect_types=sqlite3.PARSE_DECLTYPES, isolation_level=None)
+        await conn.execute("PRAGMA journal_mode=WAL")
+        await conn.execute("PRAGMA busy_timeout=5000")
+        await conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator:
+        if self._idle.empty() and self._created < self.size:
+            self._created += 1
+            conn = await self._connect()
+        else:
+            conn = await self._idle.get()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                await conn.rollback()
+            self._idle.put_nowait(conn)
+
+    def close(self) -> None:
+        pass
+
+    async def wait_closed(self) -> None:
+        while not self._idle.empty():
+            conn = self._idle.get_nowait()
+            await conn.close()
+
+class AsyncSQLiteGameRepository(AsyncGameRepository):
+    """AsyncGameRepository on aiosqlite, for local runs and throughput comparisons.
+
+    Connections run in autocommit mode; record_guess takes the write lock up
+    front with BEGIN IMMEDIATE instead of SELECT ... FOR UPDATE.
+    """
+
+    placeholder = "?"
+    for_update = ""
+    counter_upsert = SQLITE_COUNTER_UPSERT
+
+    def __init__(self, path: str | None = None, pool_size: int = 5) -> None:
+        super().__init__(pool_size)
+        self.path = path or Config.SQLITE_PATH
+
+    async def _create_pool(self):
+        return _AsyncSQLitePool(self.path, self.pool_size)
+
+    async def _begin(self, conn) -> None:
+        await conn.execute("BEGIN IMMEDIATE")
+
+    async def ensure_schema(self) -> None:
+        if self._schema_ready:
+            return
+        async with self._conn() as conn:
+            for ddl in SQLITE_DDL:
+                await conn.execute(ddl)
+            await self._migrate_snapshot(conn)
+        self._schema_ready = True
+
+def make_async_repository() -> AsyncGameRepository:
+    if Config.DB_ENGINE == "sqlite":
+        return AsyncSQLiteGameRepository()
+    return AsyncGameRepository()
@@ -0,0 +1,217 @@
+
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from dataclasses import replace
+from datetime import datetime
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, Optional, List, Tuple
+from Python_Apps.GTN_MVC_Example.config import Config
+from Python_Apps.GTN_MVC_Example.model.game import Game
+from Python_Apps.GTN_MVC_Example.model.game_columns import GameColumns
+from Python_Apps.GTN_MVC_Example.model.leaderboard import LeaderboardEntry
+from Python_Apps.GTN_MVC_Example.model.round import Round
+from Python_Apps.GTN_MVC_Example.repository.instrumentation import timed
+
+def after_round(game: Game, guess: str, exact: int, at: datetime) -> Game:
+    """The game's snapshot once a round is recorded; a win (exact == 4) also finishes it."""
+    won = exact == 4 and not game.is_finished
+    return replace(
+        game,
+        round_count=game.round_count + 1,
+        last_guess=guess,
+        best_exact=max(game.best_exact, exact),
+        is_finished=game.is_finished or won,
+        finished_at=at if won else game.finished_at,
+    )
+
+def finished(game: Game, at: datetime) -> Game:
+    """The game's snapshot once it is marked finished (keeps an existing finished_at)."""
+    if game.is_finished:
+        return game
+    return replace(game, is_finished=True, finished_at=at)
+
+def round_results(rounds: Iterable[Optional[Round]]) -> List[Optional[Tuple[int, int]]]:
+    """(exact, partial) for each round from record_rounds, keeping the Nones: record_guesses' answer."""
+    return [None if r is None else (r.exact_match, r.partial_match) for r in rounds]
+
+# /leaderboard orderings: fastest wins by round count or by wall time, ties broken by the other
+LEADERBOARD_ORDERS = ("rounds", "time")
+
+def stats_delta(before: Optional[Game], after: Game) -> Tuple[Dict[str, int], Optional[LeaderboardEntry]]:
+    """Counter increments, plus the leaderboard entry on a win, for one change of a game's snapshot.
+
+    `before` is None for a game the aggregates have not seen yet, so summing
+    stats_delta(None, g) over every game rebuilds them from scratch.
+    """
+    delta: Dict[str, int] = {}
+    if before is None:
+        delta["games_started"] = 1
+    rounds = after.round_count - (before.round_count if before else 0)
+    if rounds:
+        delta["rounds"] = rounds
+    entry = None
+    if after.is_finished and not (before and before.is_finished):
+        delta["games_finished"] = 1
+        if after.best_exact == 4:
+            seconds = 0
+            if after.finished_at and after.started_at:
+                seconds = max(0, int((after.finished_at - after.started_at).total_seconds()))
+            entry = LeaderboardEntry(after.id, after.round_count, seconds, after.finished_at)
+            delta["games_won"] = 1
+            delta["win_rounds"] = entry.rounds
+            delta["win_seconds"] = seconds
+            delta[f"wins_in_{entry.rounds}"] = 1
+    return delta, entry
+
+def stats_rows(
+    changes: Iterable[Tuple[Optional[Game], Game]],
+) -> Tuple[List[Tuple[str, int, int]], List[LeaderboardEntry]]:
+    """Fold snapshot changes into (name, slot, increment) counter rows and new leaderboard entries.
+
+    Each counter is split over Config.STATS_COUNTER_SLOTS rows by a hash of the
+    game id so concurrent writers rarely update the same row. (Hashed, not
+    id % slots: a shard's ids share one residue, see sharded_repository.py.)
+    Rows come back sorted, which keeps the lock order the same across transactions.
+    """
+    counters: Dict[Tuple[str, int], int] = {}
+    entries: List[LeaderboardEntry] = []
+    for before, after in changes:
+        delta, entry = stats_delta(before, after)
+        slot = (after.id * 0x9E3779B1 >> 16) % Config.STATS_COUNTER_SLOTS
+        for name, n in delta.items():
+            counters[(name, slot)] = counters.get((name, slot), 0) + n
+        if entry is not None:
+            entries.append(entry)
+    return [(name, slot, n) for (name, slot), n in sorted(counters.items())], entries
+
+def time_interface(cls: type) -> type:
+    """Wrap every BaseGameRepository interface method `cls` defines in a timing hook."""
+    for name, attr in list(vars(cls).items()):
+        if not name.startswith("_") and callable(attr) and name in vars(BaseGameRepository):
+            setattr(cls, name, timed(name, attr))
+    return cls
+
+class BaseGameRepository(ABC):
+    """Storage interface used by GameService. See repository/factory.py for the engines.
+
+    Every engine's implementation of an interface method is wrapped in a timing
+    hook (see repository/instrumentation.py) when the engine class is defined.
+    """
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        time_interface(cls)
+
+    # --- Schema ---
+    def ensure_schema(self) -> None:
+        """Create missing tables and apply column migrations; idempotent.
+
+        Run by the migrate command (migrate.py), never implicitly at startup.
+        Engines without a schema do nothing.
+        """
+
+    # --- Game CRUD ---
+    @abstractmethod
+    def create_game(self, answer: str) -> Game: ...
+
+    def create_games(self, answers: List[str]) -> List[Game]:
+        """Start one game per answer; returns them in the same order.
+
+        This default calls create_game per answer; SQL engines write them in
+        one transaction with multi-row inserts.
+        """
+        return [self.create_game(answer) for answer in answers]
+
+    @abstractmethod
+    def get_game(self, game_id: int) -> Optional[Game]: ...
+
+    @abstractmethod
+    def list_games(self, after_id: Optional[int] = None, limit: Optional[int] = None) -> List[Game]: ...
+
+    @abstractmethod
+    def iter_games(self, after_id: Optional[int] = None, chunk_size: int = 500) -> Iterator[Game]: ...
+
+    def game_columns(self, after_id: Optional[int] = None, limit: Optional[int] = None,
+                     chunk_size: int = 500) -> GameColumns:
+        """Bulk read, newest first, into an array-backed GameColumns.
+
+        This default goes through iter_games; SQL engines fill the columns
+        straight from cursor rows without building a Game per row.
+        """
+        return GameColumns.from_games(islice(self.iter_games(after_id, chunk_size), limit))
+
+    @abstractmethod
+    def games_version(self) -> Tuple[int, int, int]:
+        """(max game id, finished games, rounds recorded): changes whenever any game listing does."""
+
+    @abstractmethod
+    def mark_finished(self, game_id: int) -> None: ...
+
+    # --- Round operations ---
+    @abstractmethod
+    def add_round(self, game_id: int, guess: str, exact: int, partial: int) -> Round: ...
+
+    @abstractmethod
+    def list_rounds(self, game_id: int, since_id: Optional[int] = None, limit: Optional[int] = None) -> List[Round]: ...
+
+    # --- Unit of work ---
+    @abstractmethod
+    def record_guess(
+        self,
+        game_id: int,
+        guess: str,
+        score: Callable[[str], Tuple[int, int]],
+        history: Optional[int] = None,
+    ) -> Optional[Tuple[Game, Round, List[Round]]]: ...
+
+    @abstractmethod
+    def record_rounds(
+        self,
+        guesses: List[Tuple[int, str]],
+        score: Callable[[str, str], Tuple[int, int]],
+    ) -> List[Optional[Round]]:
+        """Record many (game_id, guess) pairs in one transaction.
+
+        `score(answer, guess)` returns (exact, partial). Returns the round
+        written for each input pair, id included, in order, or None where the
+        game does not exist.
+        """
+
+    def record_guesses(
+        self,
+        guesses: List[Tuple[int, str]],
+        score: Callable[[str, str], Tuple[int, int]],
+    ) -> List[Optional[Tuple[int, int]]]:
+        """record_rounds, answering one (exact, partial) per input pair, or None where the game does not exist."""
+        return round_results(self.record_rounds(guesses, score))
+
+    # --- Aggregates ---
+    @abstractmethod
+    def get_stats(self) -> Dict[str, int]:
+        """Current value of every counter maintained by stats_delta."""
+
+    @abstractmethod
+    def leaderboard(self, by: str = "rounds", limit: int = 10) -> List[LeaderboardEntry]:
+        """Fastest wins, ordered as named in LEADERBOARD_ORDERS."""
+
+    @abstractmethod
+    def rebuild_stats(self, chunk_size: int = 500) -> Dict[str, int]:
+        """Recompute the aggregates from the stored games; returns the new counters."""
+
+    # --- Bulk transfer ---
+    @abstractmethod
+    def export_rows(self, table: str, after_id: Optional[int] = None, chunk_size: int = 1000) -> Iterator[List[tuple]]:
+        """Stream "game" or "round" in ascending id order, as lists of up to chunk_size raw rows.
+
+        Rows are tuples in GAME_FIELDS / ROUND_FIELDS order; `after_id` resumes
+        after the last id already exported.
+        """
+
+    @abstractmethod
+    def import_rows(self, table: str, rows: List[tuple]) -> int:
+        """Insert exported rows, ids included, in one transaction; returns how many were new.
+
+        Rows whose id is already stored are skipped, so a batch can be replayed
+        after an interrupted import. The aggregates are not touched; run
+        rebuild_stats once the games are in.
+        """
@@ -0,0 +1,224 @@
+
+from __future__ import annotations
+from collections import deque
+from typing import Any, Callable, Deque, Optional
+import logging
+import threading
+import time
+
+log = logging.getLogger("gtn.pool")
+
+class PoolTimeoutError(TimeoutError):
+    """No connection became available within the pool's wait timeout."""
+
+class PoolClosedError(RuntimeError):
+    """get_connection() was called after close_all()."""
+
+class _Entry:
+    __slots__ = ("conn", "created_at", "last_used")
+
+    def __init__(self, conn: Any) -> None:
+        self.conn = conn
+        self.created_at = self.last_used = time.monotonic()
+
+class PooledConnection:
+    """Proxy handed out by ConnectionPool; close() returns the connection to the pool."""
+
+    def __init__(self, pool: "ConnectionPool", entry: _Entry) -> None:
+        self._pool = pool
+        self._entry: Optional[_Entry] = entry
+
+    def __getattr__(self, name: str):
+        return getattr(self._entry.conn, name)
+
+    def close(self) -> None:
+        if self._entry is not None:
+            self._pool._release(self._entry)
+            self._entry = None
+
+class ConnectionPool:
+    """Thread-safe, driver-agnostic connection pool.
+
+    - grows on demand from min_size up to max_size;
+    - once max_size connections are out, get_connection() waits up to `timeout`
+      seconds for one to come back instead of failing straight away;
+    - connections older than `max_age` seconds are closed on return, and ones
+      idle longer than `ping_after` seconds are health-checked before reuse;
+    - stats() reports size, in-use, idle, waiters and wait time.
+
+    The lock only guards the bookkeeping: opening, pinging and closing
+    connections (all network round trips on MySQL) happen outside it, so one
+    slow or dead connection never stalls other checkouts and returns.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        min_size: int = 1,
+        max_size: int = 5,
+        timeout: float = 5.0,
+        max_age: float = 1800.0,
+        ping_after: float = 30.0,
+        ping: Optional[Callable[[Any], bool]] = None,
+        name: str = "gtn_pool",
+    ) -> None:
+        if max_size < 1 or min_size < 0 or min_size > max_size:
+            raise ValueError("pool sizes must satisfy 0 <= min_size <= max_size and max_size >= 1")
+        self.name = name
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_age = max_age
+        self.ping_after = ping_after
+        self._connect = connect
+        self._ping = ping
+        self._idle: Deque[_Entry] = deque()
+        self._cond = threading.Condition()
+        self._size = 0          # open connections, idle + in use (+ ones being opened)
+        self._in_use = 0
+        self._waiters = 0
+        self._waits = 0
+        self._wait_seconds = 0.0
+        self._timeouts = 0
+        self._created = 0
+        self._recycled = 0
+        self._closed = False
+        for _ in range(min_size):
+            self._size += 1
+            self._created += 1
+            self._idle.append(self._open())
+
+    # --- Internals ---
+    def _open(self) -> _Entry:
+        return _Entry(self._connect())
+
+    def _discard(self, entry: _Entry) -> None:
+        # Called without the lock held; the caller has already given up the entry's slot
+        try:
+            entry.conn.close()
+        except Exception:  # the connection is being thrown away anyway
+            log.debug("error closing pooled connection", exc_info=True)
+
+    def _usable(self, entry: _Entry, now: float) -> bool:
+        if now - entry.created_at > self.max_age:
+            return False
+        if self._ping is not None and now - entry.last_used > self.ping_after:
+            try:
+                return bool(self._ping(entry.conn))
+            except Exception:
+                return False
+        return True
+
+    # --- Public API ---
+    def get_connection(self) -> PooledConnection:
+        deadline = time.monotonic() + self.timeout
+        waited_from: Optional[float] = None
+        while True:
+            entry: Optional[_Entry] = None
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise PoolClosedError(f"{self.name}: pool is closed")
+                    if self._idle:
+                        entry = self._idle.pop()  # LIFO keeps the warmest connections busy
+                        self._in_use += 1         # reserved while it is checked below
+                        break
+                    if self._size < self.max_size:
+                        self._size += 1
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        self._record_wait(waited_from)
+                        raise PoolTimeoutError(
+                            f"{self.name}: no connection available after {self.timeout}s "
+                            f"({self._in_use} in use, max {self.max_size})"
+                        )
+                    if waited_from is None:
+                        waited_from = time.monotonic()
+                    self._waiters += 1
+                    try:
+                        self._cond.wait(remaining)
+                    finally:
+                        self._waiters -= 1
+            if entry is None:
+                break
+            # Ping (a network round trip on MySQL) outside the lock
+            if self._usable(entry, time.monotonic()):
+                with self._cond:
+                    self._record_wait(waited_from)
+                return PooledConnection(self, entry)
+            with self._cond:
+                self._in_use -= 1
+                self._size -= 1
+                self._recycled += 1
+                self._cond.notify()
+            self._discard(entry)
+
+        # Open the new connection outside the lock so other threads keep moving
+        try:
+            entry = self._open()
+        except BaseException:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._created += 1
+            self._in_use += 1
+            self._record_wait(waited_from)
+        return PooledConnection(self, entry)
+
+    def _record_wait(self, waited_from: Optional[float]) -> None:
+        if waited_from is not None:
+            self._waits += 1
+            self._wait_seconds += time.monotonic() - waited_from
+
+    def _release(self, entry: _Entry) -> None:
+        healthy = True
+        try:
+            # Never hand the next caller an open transaction
+            if getattr(entry.conn, "in_transaction", False):
+                entry.conn.rollback()
+        except Exception:
+            healthy = False
+        now = time.monotonic()
+        with self._cond:
+            self._in_use -= 1
+            keep = healthy and not self._closed and now - entry.created_at <= self.max_age
+            if keep:
+                entry.last_used = now
+                self._idle.append(entry)
+            else:
+                self._size -= 1
+                self._recycled += 1
+            self._cond.notify()
+        if not keep:
+            self._discard(entry)
+
+    def close_all(self) -> None:
+        """Close idle connections and refuse new checkouts; checked-out ones are closed when returned."""
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+            self._recycled += len(idle)
+            self._closed = True
+            self._cond.notify_all()  # waiters raise PoolClosedError
+        for entry in idle:
+            self._discard(entry)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "size": self._size,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "waiters": self._waiters,
+                "max_size": self.max_size,
+                "waits_total": self._waits,
+                "wait_seconds_total": round(self._wait_seconds, 6),
+                "timeouts_total": self._timeouts,
+                "created_total": self._created,
+                "recycled_total": self._recycled,
+            }
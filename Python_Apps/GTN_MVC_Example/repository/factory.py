@@ -0,0 +1,65 @@
+from typing import List, Optional, Tuple
+from Python_Apps.GTN_MVC_Example.config import Config
+from Python_Apps.GTN_MVC_Example.repository.base import BaseGameRepository
+
+def make_repository(engine: str | None = None) -> BaseGameRepository:
+    """Build the storage engine named by `engine` (default Config.DB_ENGINE).
+
+    mysql  - GameRepository, the production engine
+    sqlite - SQLiteGameRepository on Config.SQLITE_PATH (":memory:" is not shared across connections)
+    memory - MemoryGameRepository, dict/array-backed, nothing persisted
+
+    With read replicas configured (Config.DB_REPLICA_HOSTS for mysql,
+    Config.SQLITE_REPLICA_PATHS for sqlite) the engine is wrapped in a
+    ReplicatedGameRepository that sends reads to them. With shards configured
+    (Config.DB_SHARD_HOSTS, Config.SQLITE_SHARD_PATHS) it is a
+    ShardedGameRepository over one engine per shard instead.
+    """
+    engine = (engine or Config.DB_ENGINE).lower()
+    if engine == "mysql":
+        from Python_Apps.GTN_MVC_Example.repository.game_repository import GameRepository
+        shard_hosts = _split(Config.DB_SHARD_HOSTS)
+        if shard_hosts:
+            return _sharded([
+                GameRepository(pool_name=f"gtn_shard{i}", host=host, port=port, shard=(i, Config.SHARD_ID_STRIDE))
+                for i, (host, port) in enumerate(map(_address, shard_hosts))
+            ])
+        replicas = []
+        for i, (host, port) in enumerate(map(_address, _split(Config.DB_REPLICA_HOSTS))):
+            replicas.append(GameRepository(pool_name=f"gtn_replica{i}", host=host, port=port))
+        return _with_replicas(GameRepository(), replicas)
+    if engine == "sqlite":
+        from Python_Apps.GTN_MVC_Example.repository.sqlite_game_repository import SQLiteGameRepository
+        shard_paths = _split(Config.SQLITE_SHARD_PATHS)
+        if shard_paths:
+            return _sharded([
+                SQLiteGameRepository(path, pool_name=f"gtn_sqlite_shard{i}", shard=(i, Config.SHARD_ID_STRIDE))
+                for i, path in enumerate(shard_paths)
+            ])
+        return _with_replicas(SQLiteGameRepository(), [
+            SQLiteGameRepository(path, pool_name=f"gtn_sqlite_replica{i}")
+            for i, path in enumerate(_split(Config.SQLITE_REPLICA_PATHS))
+        ])
+    if engine == "memory":
+        from Python_Apps.GTN_MVC_Example.repository.memory_game_repository import MemoryGameRepository
+        return MemoryGameRepository()
+    raise ValueError(f"Unknown DB engine: {engine!r} (expected mysql, sqlite or memory)")
+
+def _split(value: str) -> List[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+def _address(value: str) -> Tuple[str, Optional[int]]:
+    host, _, port = value.partition(":")
+    return host, int(port) if port else None
+
+def _sharded(shards: List[BaseGameRepository]) -> BaseGameRepository:
+    if _split(Config.DB_REPLICA_HOSTS) or _split(Config.SQLITE_REPLICA_PATHS):
+        raise ValueError("Shards and read replicas cannot be configured together")
+    from Python_Apps.GTN_MVC_Example.repository.sharded_repository import ShardedGameRepository
+    return ShardedGameRepository(shards, Config.SHARD_ID_STRIDE)
+
+def _with_replicas(primary: BaseGameRepository, replicas: List[BaseGameRepository]) -> BaseGameRepository:
+    if not replicas:
+        return primary
+    from Python_Apps.GTN_MVC_Example.repository.replicated_repository import ReplicatedGameRepository
+    return ReplicatedGameRepository(primary, replicas)
@@ -0,0 +1,170 @@
+
+from __future__ import annotations
+from collections import OrderedDict
+from typing import Callable, Optional, List, Tuple
+import threading
+import time
+from Python_Apps.GTN_MVC_Example.model.game import Game
+from Python_Apps.GTN_MVC_Example.model.round import Round
+from Python_Apps.GTN_MVC_Example.config import Config
+from Python_Apps.GTN_MVC_Example.repository.base import BaseGameRepository
+
+def _version(game: Game) -> Tuple[int, bool]:
+    # A game only ever gains rounds and goes from open to finished
+    return game.round_count, game.is_finished
+
+class GameCache:
+    """Bounded LRU cache of Game objects keyed by game id, with a per-entry TTL.
+
+    All access goes through one lock so it is safe under Flask's threaded server.
+    Cached Game objects are shared between callers and must not be mutated.
+
+    Snapshots only move forward: put() keeps the cached game when it has seen
+    more rounds (or is finished and the new one is not), so a slow reader
+    cannot replace a writer's newer snapshot with the one it read earlier.
+    A snapshot read while an invalidation ran may be stale too, so callers
+    read `generation` before loading and pass it to put(), which then skips it.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 300.0) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self._items: "OrderedDict[int, Tuple[float, Game]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.generation = 0  # bumped by every invalidate() and clear()
+
+    def get(self, game_id: int) -> Optional[Game]:
+        with self._lock:
+            entry = self._items.get(game_id)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, game = entry
+            if expires_at < time.monotonic():
+                del self._items[game_id]
+                self.misses += 1
+                return None
+            self._items.move_to_end(game_id)
+            self.hits += 1
+            return game
+
+    def put(self, game: Game, generation: int | None = None) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            entry = self._items.get(game.id)
+            if entry is not None and _version(entry[1]) > _version(game):
+                return
+            self._items[game.id] = (time.monotonic() + self.ttl, game)
+            self._items.move_to_end(game.id)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, game_id: int) -> None:
+        with self._lock:
+            self.generation += 1
+            self._items.pop(game_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._items.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._items),
+                "maxSize": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+class CachingGameRepository:
+    """Sits between GameService and a GameRepository and serves get_game from a GameCache.
+
+    create_game and record_guess write through to the cache; mark_finished,
+    add_round, record_rounds and record_guesses change the stored snapshot and invalidate it.
+    Every other call is passed straight to the wrapped repository.
+
+    The cache is per process: with several workers, a snapshot cached in one
+    can be behind writes made through another until its TTL runs out, and so
+    can the /game and /rounds ETags built from it. Writes through this
+    process put or invalidate the entry, so they are never served stale here.
+    """
+
+    def __init__(self, repo: BaseGameRepository, cache: GameCache | None = None) -> None:
+        self.repo = repo
+        self.cache = cache or GameCache(Config.GAME_CACHE_SIZE, Config.GAME_CACHE_TTL)
+
+    def __getattr__(self, name: str):
+        return getattr(self.repo, name)
+
+    def create_game(self, answer: str) -> Game:
+        game = self.repo.create_game(answer)
+        self.cache.put(game)
+        return game
+
+    def get_game(self, game_id: int) -> Optional[Game]:
+        game = self.cache.get(game_id)
+        if game is None:
+            generation = self.cache.generation  # read before loading, see GameCache
+            game = self.repo.get_game(game_id)
+            if game is not None:
+                self.cache.put(game, generation)
+        return game
+
+    def mark_finished(self, game_id: int) -> None:
+        self.repo.mark_finished(game_id)
+        self.cache.invalidate(game_id)
+
+    def add_round(self, game_id: int, guess: str, exact: int, partial: int) -> Round:
+        try:
+            return self.repo.add_round(game_id, guess, exact, partial)
+        finally:
+            self.cache.invalidate(game_id)
+
+    def record_guess(
+        self,
+        game_id: int,
+        guess: str,
+        score: Callable[[str], Tuple[int, int]],
+        history: Optional[int] = None,
+    ) -> Optional[Tuple[Game, Round, List[Round]]]:
+        generation = self.cache.generation
+        recorded = self.repo.record_guess(game_id, guess, score, history)
+        if recorded is None:
+            self.cache.invalidate(game_id)
+        else:
+            self.cache.put(recorded[0], generation)
+        return recorded
+
+    def record_rounds(
+        self,
+        guesses: List[Tuple[int, str]],
+        score: Callable[[str, str], Tuple[int, int]],
+    ) -> List[Optional[Round]]:
+        try:
+            return self.repo.record_rounds(guesses, score)
+        finally:
+            self._invalidate_all(guesses)
+
+    def record_guesses(
+        self,
+        guesses: List[Tuple[int, str]],
+        score: Callable[[str, str], Tuple[int, int]],
+    ) -> List[Optional[Tuple[int, int]]]:
+        try:
+            return self.repo.record_guesses(guesses, score)
+        finally:
+            self._invalidate_all(guesses)
+
+    def _invalidate_all(self, guesses: List[Tuple[int, str]]) -> None:
+        for gid in {gid for gid, _ in guesses}:
+            self.cache.invalidate(gid)
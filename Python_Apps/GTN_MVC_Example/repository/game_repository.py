@@ -1,38 +1,239 @@
 
 from __future__ import annotations
-from typing import Optional, List
-import mysql.connector
-from mysql.connector import pooling
+from typing import Callable, Dict, Iterable, Iterator, Optional, List, Tuple
+from datetime import datetime
+from itertools import chain
+import os
+import time
 from Python_Apps.GTN_MVC_Example.model.game import Game
+from Python_Apps.GTN_MVC_Example.model.game_columns import GameColumns
+from Python_Apps.GTN_MVC_Example.model.leaderboard import LeaderboardEntry
 from Python_Apps.GTN_MVC_Example.model.round import Round
 from Python_Apps.GTN_MVC_Example.config import Config
+from Python_Apps.GTN_MVC_Example.repository.base import BaseGameRepository, after_round, finished, stats_rows
+from Python_Apps.GTN_MVC_Example.repository.connection_pool import ConnectionPool
+from Python_Apps.GTN_MVC_Example.repository.instrumentation import METRICS, record_pool_wait, record_query, record_rows
 
-class GameRepository:
-    def __init__(self, pool_name: str = "gtn_pool", pool_size: int = 5) -> None:
-        self._pool = pooling.MySQLConnectionPool(
-            pool_name=pool_name,
-            pool_size=pool_size,
-            host=Config.DB_HOST,
-            port=Config.DB_PORT,
+# Cursors return plain tuples; every SELECT lists its columns in *_FIELDS order,
+# which is also the field order of the model, so rows map to models positionally.
+GAME_FIELDS = ("id", "answer", "is_finished", "started_at", "round_count", "last_guess", "best_exact", "finished_at")
+ROUND_FIELDS = ("id", "game_id", "guess", "exact_match", "partial_match", "created_at")
+LEADERBOARD_FIELDS = ("game_id", "rounds", "seconds", "finished_at")
+GAME_COLUMNS = ", ".join(GAME_FIELDS)
+ROUND_COLUMNS = ", ".join(ROUND_FIELDS)
+LEADERBOARD_COLUMNS = ", ".join(LEADERBOARD_FIELDS)
+
+# Tables moved by the bulk export/import (service/bulk_transfer.py); the aggregates are rebuilt, not copied
+TRANSFER_FIELDS = {"game": GAME_FIELDS, "round": ROUND_FIELDS}
+
+def transfer_fields(table: str) -> Tuple[str, ...]:
+    fields = TRANSFER_FIELDS.get(table)
+    if fields is None:
+        raise ValueError(f"Unknown table: {table!r} (expected game or round)")
+    return fields
+
+# Snapshot columns added after the first release, with the DDL used to add them
+# to an existing game table (see _migrate_snapshot)
+SNAPSHOT_COLUMNS = (
+    ("round_count", "INT NOT NULL DEFAULT 0"),
+    ("last_guess", "CHAR(4) NULL"),
+    ("best_exact", "INT NOT NULL DEFAULT 0"),
+    ("finished_at", "TIMESTAMP NULL"),
+)
+
+# Recompute every snapshot from `round`; only run when the columns are first added
+SNAPSHOT_BACKFILL = """
+    UPDATE game SET
+        round_count = (SELECT COUNT(*) FROM round r WHERE r.game_id = game.id),
+        best_exact = COALESCE((SELECT MAX(r.exact_match) FROM round r WHERE r.game_id = game.id), 0),
+        last_guess = (SELECT r.guess FROM round r WHERE r.game_id = game.id
+                      ORDER BY r.created_at DESC, r.id DESC LIMIT 1),
+        finished_at = CASE WHEN is_finished = 1 THEN
+                          (SELECT MAX(r.created_at) FROM round r WHERE r.game_id = game.id)
+                      END
+"""
+
+# Snapshot values are computed in Python under the row lock and written absolutely
+SNAPSHOT_UPDATE = (
+    "UPDATE game SET round_count=%s, last_guess=%s, best_exact=%s, is_finished=%s, finished_at=%s WHERE id=%s"
+)
+
+def snapshot_params(game: Game) -> tuple:
+    return (game.round_count, game.last_guess, game.best_exact, int(game.is_finished), game.finished_at, game.id)
+
+# Aggregates behind /stats and /leaderboard (see stats_rows in repository/base.py)
+COUNTER_UPSERT = (
+    "INSERT INTO stat_counter (name, slot, value) VALUES (%s, %s, %s) "
+    "ON DUPLICATE KEY UPDATE value = value + VALUES(value)"
+)
+LEADERBOARD_INSERT = "INSERT INTO leaderboard (game_id, rounds, seconds, finished_at) VALUES (%s, %s, %s, %s)"
+LEADERBOARD_ORDER_BY = {"rounds": "rounds, seconds, game_id", "time": "seconds, rounds, game_id"}
+
+GAME_INSERT = "INSERT INTO game (answer, is_finished, started_at) VALUES (%s, %s, %s)"
+ROUND_INSERT = "INSERT INTO round (game_id, guess, exact_match, partial_match) VALUES (%s, %s, %s, %s)"
+
+def with_id(insert: str) -> str:
+    """The same INSERT with an explicit leading id column (see _new_ids)."""
+    table_cols, values = insert.split(" VALUES ")
+    return table_cols.replace(" (", " (id, ", 1) + " VALUES (%s, " + values[1:]
+
+def multi_row(insert: str, n: int) -> str:
+    """The same INSERT with n value tuples, so a whole chunk is one statement."""
+    head, values = insert.split(" VALUES ")
+    return head + " VALUES " + ", ".join([values] * n)
+
+def leaderboard_params(entry: LeaderboardEntry) -> tuple:
+    return (entry.game_id, entry.rounds, entry.seconds, entry.finished_at)
+
+# CSV as service/bulk_transfer.py writes it: a header line, "\n" line ends, \N for NULL
+LOAD_DATA_CSV = (
+    "LOAD DATA LOCAL INFILE %s IGNORE INTO TABLE {table} CHARACTER SET utf8mb4 "
+    "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' "
+    "LINES TERMINATED BY '\\n' IGNORE 1 LINES ({columns})"
+)
+
+class GameRepository(BaseGameRepository):
+    """MySQL storage engine, and the SQL every SQL-backed engine shares.
+
+    Statements are written with %s placeholders; subclasses for other drivers
+    override the connection hooks below and `placeholder`/`for_update`.
+    """
+
+    placeholder = "%s"
+    for_update = " FOR UPDATE"
+    counter_upsert = COUNTER_UPSERT
+    import_conflict = " ON DUPLICATE KEY UPDATE id = id"  # import_rows skips ids already stored
+    insert_chunk = 1000  # rows per multi-row INSERT in create_games and record_rounds
+    supports_load_data = True  # load_csv (LOAD DATA LOCAL INFILE) is available
+
+    def __init__(
+        self,
+        pool_name: str = "gtn_pool",
+        pool_size: int | None = None,
+        host: str | None = None,
+        port: int | None = None,
+        shard: Tuple[int, int] | None = None,
+    ) -> None:
+        # host/port default to Config.DB_HOST/DB_PORT; read replicas and shards pass their own
+        self.host = host or Config.DB_HOST
+        self.port = port or Config.DB_PORT
+        # (index, stride) when this database is one shard of several: every id it
+        # assigns satisfies id % stride == index + 1 (see repository/sharded_repository.py)
+        self.shard = shard
+        self._pool = self._create_pool(pool_name, pool_size or Config.DB_POOL_MAX)
+        METRICS.register_pool(self._pool)
+
+    # --- Connection hooks ---
+    def _connect(self, **options):
+        import mysql.connector  # only the MySQL engine needs the driver
+        conn = mysql.connector.connect(
+            host=self.host,
+            port=self.port,
             user=Config.DB_USER,
             password=Config.DB_PASS,
             database=Config.DB_NAME,
+            autocommit=False,
+            **options,
+        )
+        if self.shard is not None:
+            # AUTO_INCREMENT then only hands out ids that encode this shard
+            index, stride = self.shard
+            with conn.cursor() as cur:
+                cur.execute("SET SESSION auto_increment_increment = %s, auto_increment_offset = %s",
+                            (stride, index + 1))
+        return conn
+
+    def _ping(self, conn) -> bool:
+        return conn.is_connected()
+
+    def _create_pool(self, pool_name: str, pool_size: int) -> ConnectionPool:
+        return ConnectionPool(
+            self._connect,
+            min_size=min(Config.DB_POOL_MIN, pool_size),
+            max_size=pool_size,
+            timeout=Config.DB_POOL_TIMEOUT,
+            max_age=Config.DB_POOL_RECYCLE,
+            ping=self._ping,
+            name=pool_name,
         )
-        self._ensure_schema()
 
     def _conn(self):
-        return self._pool.get_connection()
+        t0 = time.perf_counter()
+        conn = self._pool.get_connection()
+        record_pool_wait(time.perf_counter() - t0)
+        return conn
+
+    def _cursor(self, conn, stream: bool = False):
+        # Tuple rows (no per-row dict); buffered unless streaming, so a statement
+        # can follow a partial fetch
+        return conn.cursor(buffered=not stream)
+
+    def _begin(self, conn) -> None:
+        # MySQL connections run with autocommit off, so the first statement opens
+        # the transaction.
+        pass
+
+    def _new_ids(self, cur, table: str, n: int) -> Optional[List[int]]:
+        """Ids for n rows about to be inserted into `table`, or None to let AUTO_INCREMENT assign them.
+
+        Called inside the write transaction; engines that cannot stride their
+        auto-increment per connection allocate shard ids here.
+        """
+        return None
+
+    def _inserted_ids(self, cur, n: int) -> List[int]:
+        """Ids of the n rows written by the multi-row INSERT just run on `cur`.
+
+        InnoDB gives the rows of one INSERT with a known row count consecutive
+        values, auto_increment_increment apart; LAST_INSERT_ID() is the first.
+        """
+        self._execute(cur, "SELECT LAST_INSERT_ID(), @@session.auto_increment_increment")
+        first, step = self._fetchone(cur)
+        return list(range(first, first + n * step, step))
+
+    def _execute(self, cur, sql: str, params: tuple = ()) -> None:
+        if self.placeholder != "%s":
+            sql = sql.replace("%s", self.placeholder)
+        t0 = time.perf_counter()
+        cur.execute(sql, params)
+        record_query(sql, params, time.perf_counter() - t0)
+
+    def _executemany(self, cur, sql: str, seq_params: List[tuple]) -> None:
+        if self.placeholder != "%s":
+            sql = sql.replace("%s", self.placeholder)
+        t0 = time.perf_counter()
+        cur.executemany(sql, seq_params)
+        record_query(sql, (f"<{len(seq_params)} rows>",), time.perf_counter() - t0)
+
+    def _fetchone(self, cur):
+        row = cur.fetchone()
+        record_rows(1 if row else 0)
+        return row
+
+    def _fetchall(self, cur) -> list:
+        rows = cur.fetchall()
+        record_rows(len(rows))
+        return rows
 
-    def _ensure_schema(self) -> None:
-        ddl_game = """
+    def _fetchmany(self, cur, size: int) -> list:
+        rows = cur.fetchmany(size)
+        record_rows(len(rows))
+        return rows
+
+    DDL = (
+        """
         CREATE TABLE IF NOT EXISTS game (
             id INT AUTO_INCREMENT PRIMARY KEY,
             answer CHAR(4) NOT NULL,
             is_finished TINYINT(1) NOT NULL DEFAULT 0,
-            started_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+            started_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            round_count INT NOT NULL DEFAULT 0,
+            last_guess CHAR(4) NULL,
+            best_exact INT NOT NULL DEFAULT 0,
+            finished_at TIMESTAMP NULL
         );
+        """,
         """
-        ddl_round = """
         CREATE TABLE IF NOT EXISTS round (
             id INT AUTO_INCREMENT PRIMARY KEY,
             game_id INT NOT NULL,
@@ -43,112 +244,533 @@ class GameRepository:
             CONSTRAINT fk_round_game FOREIGN KEY (game_id) REFERENCES game(id) ON DELETE CASCADE,
             INDEX idx_round_game_created (game_id, created_at)
         );
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS stat_counter (
+            name VARCHAR(32) NOT NULL,
+            slot INT NOT NULL,
+            value BIGINT NOT NULL DEFAULT 0,
+            PRIMARY KEY (name, slot)
+        );
+        """,
         """
+        CREATE TABLE IF NOT EXISTS leaderboard (
+            game_id INT PRIMARY KEY,
+            rounds INT NOT NULL,
+            seconds INT NOT NULL,
+            finished_at TIMESTAMP NULL,
+            CONSTRAINT fk_leaderboard_game FOREIGN KEY (game_id) REFERENCES game(id) ON DELETE CASCADE,
+            INDEX idx_leaderboard_rounds (rounds, seconds),
+            INDEX idx_leaderboard_time (seconds, rounds)
+        );
+        """,
+    )
+
+    def ensure_schema(self) -> None:
         conn = self._conn()
         try:
-            with conn.cursor() as cur:
-                cur.execute(ddl_game)
-                cur.execute(ddl_round)
+            with self._cursor(conn) as cur:
+                for ddl in self.DDL:
+                    self._execute(cur, ddl)
+                self._migrate_snapshot(cur)
             conn.commit()
         finally:
             conn.close()
 
+    def replication_lag(self) -> Optional[float]:
+        """Seconds this server's replication is behind its source, for ReplicatedGameRepository.
+
+        0.0 on a server that is not a replica; None while replication is stopped
+        or broken. Needs the REPLICATION CLIENT privilege.
+        """
+        conn = self._conn()
+        try:
+            with self._cursor(conn) as cur:
+                try:
+                    self._execute(cur, "SHOW REPLICA STATUS")  # MySQL 8.0.22+
+                except Exception:
+                    self._execute(cur, "SHOW SLAVE STATUS")
+                rows = self._fetchall(cur)
+                if not rows:
+                    return 0.0
+                names = [d[0] for d in cur.description]
+                column = "Seconds_Behind_Source" if "Seconds_Behind_Source" in names else "Seconds_Behind_Master"
+                lag = rows[0][names.index(column)]
+                return None if lag is None else float(lag)
+        finally:
+            conn.close()
+
+    def _migrate_snapshot(self, cur) -> None:
+        """Add the snapshot columns to a game table created before they existed, and backfill them."""
+        self._execute(cur, "SELECT * FROM game LIMIT 0")
+        self._fetchall(cur)
+        existing = {d[0] for d in cur.description}
+        missing = [(name, ddl) for name, ddl in SNAPSHOT_COLUMNS if name not in existing]
+        for name, ddl in missing:
+            self._execute(cur, f"ALTER TABLE game ADD COLUMN {name} {ddl}")
+        if missing:
+            self._execute(cur, SNAPSHOT_BACKFILL)
+
+    @staticmethod
+    def _row_to_game(row: tuple) -> Game:
+        # GAME_FIELDS order; is_finished comes back as 0/1
+        return Game(row[0], row[1], bool(row[2]), row[3], row[4], row[5], row[6], row[7])
+
+    @staticmethod
+    def _row_to_entry(row: tuple) -> LeaderboardEntry:
+        return LeaderboardEntry(*row)  # LEADERBOARD_FIELDS order
+
+    @staticmethod
+    def _row_to_round(row: tuple) -> Round:
+        return Round(*row)  # ROUND_FIELDS order
+
     # --- Game CRUD ---
     def create_game(self, answer: str) -> Game:
         conn = self._conn()
         try:
-            with conn.cursor(dictionary=True) as cur:
-                cur.execute(
-                    "INSERT INTO game (answer, is_finished) VALUES (%s, %s)",
-                    (answer, 0),
-                )
-                conn.commit()
-                new_id = cur.lastrowid
-                return Game(id=new_id, answer=answer, is_finished=False)
+            # Stamp started_at here so the returned Game is complete and can be cached
+            started_at = datetime.now().replace(microsecond=0)
+            self._begin(conn)
+            with self._cursor(conn) as cur:
+                ids = self._new_ids(cur, "game", 1)
+                if ids is None:
+                    self._execute(cur, GAME_INSERT, (answer, 0, started_at))
+                    game_id = cur.lastrowid
+                else:
+                    game_id = ids[0]
+                    self._execute(cur, with_id(GAME_INSERT), (game_id, answer, 0, started_at))
+                game = Game(id=game_id, answer=answer, is_finished=False, started_at=started_at)
+                self._write_stats(cur, [(None, game)])
+            conn.commit()
+            return game
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def create_games(self, answers: List[str]) -> List[Game]:
+        """Insert one game per answer in one transaction, insert_chunk rows per statement."""
+        started_at = datetime.now().replace(microsecond=0)
+        games: List[Game] = []
+        conn = self._conn()
+        try:
+            self._begin(conn)
+            with self._cursor(conn) as cur:
+                for start in range(0, len(answers), self.insert_chunk):
+                    chunk = answers[start:start + self.insert_chunk]
+                    rows = [(answer, 0, started_at) for answer in chunk]
+                    ids = self._new_ids(cur, "game", len(rows))
+                    if ids is None:
+                        self._execute(cur, multi_row(GAME_INSERT, len(rows)), tuple(chain.from_iterable(rows)))
+                        ids = self._inserted_ids(cur, len(rows))
+                    else:
+                        self._execute(cur, multi_row(with_id(GAME_INSERT), len(rows)),
+                                      tuple(chain.from_iterable((i, *r) for i, r in zip(ids, rows))))
+                    games.extend(Game(id=i, answer=answer, is_finished=False, started_at=started_at)
+                                 for i, answer in zip(ids, chunk))
+                self._write_stats(cur, [(None, game) for game in games])
+            conn.commit()
+            return games
+        except Exception:
+            conn.rollback()
+            raise
         finally:
             conn.close()
 
     def get_game(self, game_id: int) -> Optional[Game]:
         conn = self._conn()
         try:
-            with conn.cursor(dictionary=True) as cur:
-                cur.execute(
-                    "SELECT id, answer, is_finished, started_at FROM game WHERE id=%s",
+            with self._cursor(conn) as cur:
+                self._execute(
+                    cur,
+                    f"SELECT {GAME_COLUMNS} FROM game WHERE id=%s",
                     (game_id,),
                 )
-                row = cur.fetchone()
-                if not row:
-                    return None
-                return Game(
-                    id=row["id"],
-                    answer=row["answer"],
-                    is_finished=bool(row["is_finished"]),
-                    started_at=row["started_at"],
+                row = self._fetchone(cur)
+                return self._row_to_game(row) if row else None
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _games_page_sql(after_id: Optional[int], limit: Optional[int]) -> Tuple[str, tuple]:
+        # Keyset pagination on the primary key: newest first, strictly below the cursor
+        sql = f"SELECT {GAME_COLUMNS} FROM game"
+        params: tuple = ()
+        if after_id is not None:
+            sql += " WHERE id < %s"
+            params += (after_id,)
+        sql += " ORDER BY id DESC"
+        if limit is not None:
+            sql += " LIMIT %s"
+            params += (limit,)
+        return sql, params
+
+    def list_games(self, after_id: Optional[int] = None, limit: Optional[int] = None) -> List[Game]:
+        sql, params = self._games_page_sql(after_id, limit)
+        conn = self._conn()
+        try:
+            with self._cursor(conn) as cur:
+                self._execute(cur, sql, params)
+                return list(map(self._row_to_game, self._fetchall(cur)))
+        finally:
+            conn.close()
+
+    def iter_games(self, after_id: Optional[int] = None, chunk_size: int = 500) -> Iterator[Game]:
+        """Yield games newest first from an unbuffered cursor, chunk_size rows at a time.
+
+        The connection stays checked out until the generator is exhausted or closed.
+        """
+        sql, params = self._games_page_sql(after_id, None)
+        conn = self._conn()
+        try:
+            with self._cursor(conn, stream=True) as cur:
+                self._execute(cur, sql, params)
+                while True:
+                    rows = self._fetchmany(cur, chunk_size)
+                    if not rows:
+                        break
+                    for r in rows:
+                        yield self._row_to_game(r)
+        finally:
+            conn.close()
+
+    def games_version(self) -> Tuple[int, int, int]:
+        # Index lookup plus two reads of the small stat_counter table, instead of scanning game
+        conn = self._conn()
+        try:
+            with self._cursor(conn) as cur:
+                self._execute(
+                    cur,
+                    "SELECT (SELECT MAX(id) FROM game), "
+                    "(SELECT SUM(value) FROM stat_counter WHERE name = 'games_finished'), "
+                    "(SELECT SUM(value) FROM stat_counter WHERE name = 'rounds')",
                 )
+                return tuple(int(v or 0) for v in self._fetchone(cur))
         finally:
             conn.close()
 
-    def list_games(self) -> List[Game]:
+    def game_columns(self, after_id: Optional[int] = None, limit: Optional[int] = None,
+                     chunk_size: int = 500) -> GameColumns:
+        sql, params = self._games_page_sql(after_id, limit)
+        cols = GameColumns()
         conn = self._conn()
         try:
-            with conn.cursor(dictionary=True) as cur:
-                cur.execute("SELECT id, answer, is_finished, started_at FROM game ORDER BY id DESC")
-                rows = cur.fetchall()
-                return [
-                    Game(
-                        id=r["id"],
-                        answer=r["answer"],
-                        is_finished=bool(r["is_finished"]),
-                        started_at=r["started_at"],
-                    )
-                    for r in rows
-                ]
+            with self._cursor(conn, stream=True) as cur:
+                self._execute(cur, sql, params)
+                while True:
+                    rows = self._fetchmany(cur, chunk_size)
+                    if not rows:
+                        return cols
+                    cols.extend_rows(rows)
         finally:
             conn.close()
 
     def mark_finished(self, game_id: int) -> None:
         conn = self._conn()
         try:
-            with conn.cursor() as cur:
-                cur.execute("UPDATE game SET is_finished=1 WHERE id=%s", (game_id,))
-                conn.commit()
+            self._begin(conn)
+            with self._cursor(conn) as cur:
+                game = self._lock_game(cur, game_id)
+                if game is not None and not game.is_finished:
+                    done = finished(game, datetime.now().replace(microsecond=0))
+                    self._execute(cur, SNAPSHOT_UPDATE, snapshot_params(done))
+                    self._write_stats(cur, [(game, done)])
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
         finally:
             conn.close()
 
     # --- Round operations ---
+    def _lock_game(self, cur, game_id: int) -> Optional[Game]:
+        self._execute(cur, f"SELECT {GAME_COLUMNS} FROM game WHERE id=%s" + self.for_update, (game_id,))
+        row = self._fetchone(cur)
+        return self._row_to_game(row) if row else None
+
+    def _insert_round(self, cur, game_id: int, guess: str, exact: int, partial: int) -> int:
+        ids = self._new_ids(cur, "round", 1)
+        if ids is None:
+            self._execute(cur, ROUND_INSERT, (game_id, guess, exact, partial))
+            return cur.lastrowid
+        self._execute(cur, with_id(ROUND_INSERT), (ids[0], game_id, guess, exact, partial))
+        return ids[0]
+
     def add_round(self, game_id: int, guess: str, exact: int, partial: int) -> Round:
         conn = self._conn()
         try:
-            with conn.cursor(dictionary=True) as cur:
-                cur.execute(
-                    "INSERT INTO round (game_id, guess, exact_match, partial_match) VALUES (%s, %s, %s, %s)",
-                    (game_id, guess, exact, partial),
-                )
-                conn.commit()
-                rid = cur.lastrowid
-                return Round(id=rid, game_id=game_id, guess=guess, exact_match=exact, partial_match=partial)
+            self._begin(conn)
+            with self._cursor(conn) as cur:
+                game = self._lock_game(cur, game_id)
+                if game is None:
+                    # Mirrors the foreign key on round.game_id
+                    raise LookupError("Game not found.")
+                rid = self._insert_round(cur, game_id, guess, exact, partial)
+                updated = after_round(game, guess, exact, datetime.now().replace(microsecond=0))
+                self._execute(cur, SNAPSHOT_UPDATE, snapshot_params(updated))
+                self._write_stats(cur, [(game, updated)])
+            conn.commit()
+            return Round(id=rid, game_id=game_id, guess=guess, exact_match=exact, partial_match=partial)
+        except Exception:
+            conn.rollback()
+            raise
         finally:
             conn.close()
 
-    def list_rounds(self, game_id: int) -> List[Round]:
+    @staticmethod
+    def _rounds_sql(game_id: int, since_id: Optional[int], limit: Optional[int]) -> Tuple[str, tuple]:
+        # Served by idx_round_game_created (game_id, created_at); InnoDB appends the
+        # primary key to the index, so the id filter and tie-break stay in the index.
+        sql = f"SELECT {ROUND_COLUMNS} FROM round WHERE game_id=%s"
+        params: tuple = (game_id,)
+        if since_id is not None:
+            sql += " AND id > %s"
+            params += (since_id,)
+        sql += " ORDER BY created_at DESC, id DESC"
+        if limit is not None:
+            sql += " LIMIT %s"
+            params += (limit,)
+        return sql, params
+
+    def list_rounds(self, game_id: int, since_id: Optional[int] = None, limit: Optional[int] = None) -> List[Round]:
+        sql, params = self._rounds_sql(game_id, since_id, limit)
         conn = self._conn()
         try:
-            with conn.cursor(dictionary=True) as cur:
-                cur.execute(
-                    "SELECT id, game_id, guess, exact_match, partial_match, created_at "
-                    "FROM round WHERE game_id=%s ORDER BY created_at DESC",
-                    (game_id,),
+            with self._cursor(conn) as cur:
+                self._execute(cur, sql, params)
+                return list(map(self._row_to_round, self._fetchall(cur)))
+        finally:
+            conn.close()
+
+    # --- Unit of work ---
+    def record_guess(
+        self,
+        game_id: int,
+        guess: str,
+        score: Callable[[str], Tuple[int, int]],
+        history: Optional[int] = None,
+    ) -> Optional[Tuple[Game, Round, List[Round]]]:
+        """Lock the game row, score the guess, insert the round, update the game's
+        snapshot (finishing it on a win) and read back the rounds, all on one
+        connection and in one transaction.
+
+        `score` receives the secret answer and returns (exact, partial); anything it
+        raises rolls the transaction back. `history` caps the rounds read back to the
+        newest N (None reads them all). Returns None if the game does not exist.
+        """
+        conn = self._conn()
+        try:
+            self._begin(conn)
+            with self._cursor(conn) as cur:
+                game = self._lock_game(cur, game_id)
+                if game is None:
+                    conn.rollback()
+                    return None
+
+                exact, partial = score(game.answer)
+                rid = self._insert_round(cur, game_id, guess, exact, partial)
+                new_round = Round(id=rid, game_id=game_id, guess=guess, exact_match=exact, partial_match=partial)
+
+                before, game = game, after_round(game, guess, exact, datetime.now().replace(microsecond=0))
+                self._execute(cur, SNAPSHOT_UPDATE, snapshot_params(game))
+                self._write_stats(cur, [(before, game)])
+
+                self._execute(cur, *self._rounds_sql(game_id, None, history))
+                rounds = [self._row_to_round(r) for r in self._fetchall(cur)]
+            conn.commit()
+            return game, new_round, rounds
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def _insert_rounds(self, cur, rounds: List[Round]) -> None:
+        """Write `rounds` with one multi-row INSERT and fill in their ids."""
+        rows = [(r.game_id, r.guess, r.exact_match, r.partial_match) for r in rounds]
+        ids = self._new_ids(cur, "round", len(rows))
+        if ids is None:
+            self._execute(cur, multi_row(ROUND_INSERT, len(rows)), tuple(chain.from_iterable(rows)))
+            ids = self._inserted_ids(cur, len(rows))
+        else:
+            self._execute(cur, multi_row(with_id(ROUND_INSERT), len(rows)),
+                          tuple(chain.from_iterable((i, *r) for i, r in zip(ids, rows))))
+        for rnd, rid in zip(rounds, ids):
+            rnd.id = rid
+
+    def record_rounds(
+        self,
+        guesses: List[Tuple[int, str]],
+        score: Callable[[str, str], Tuple[int, int]],
+    ) -> List[Optional[Round]]:
+        if not guesses:
+            return []
+        game_ids = sorted({gid for gid, _ in guesses})
+        marks = ", ".join(["%s"] * len(game_ids))
+        conn = self._conn()
+        try:
+            self._begin(conn)
+            with self._cursor(conn) as cur:
+                # Lock every game in the batch, in id order so concurrent batches can't deadlock
+                self._execute(
+                    cur,
+                    f"SELECT {GAME_COLUMNS} FROM game WHERE id IN ({marks}) ORDER BY id" + self.for_update,
+                    tuple(game_ids),
                 )
-                rows = cur.fetchall()
-                return [
-                    Round(
-                        id=r["id"],
-                        game_id=r["game_id"],
-                        guess=r["guess"],
-                        exact_match=r["exact_match"],
-                        partial_match=r["partial_match"],
-                        created_at=r["created_at"],
-                    ) for r in rows
-                ]
+                games = {g.id: g for g in map(self._row_to_game, self._fetchall(cur))}
+                locked = dict(games)
+
+                now = datetime.now().replace(microsecond=0)
+                results: List[Optional[Round]] = []
+                written: List[Round] = []
+                touched = set()
+                for gid, guess in guesses:
+                    game = games.get(gid)
+                    if game is None:
+                        results.append(None)
+                        continue
+                    exact, partial = score(game.answer, guess)
+                    rnd = Round(id=None, game_id=gid, guess=guess, exact_match=exact, partial_match=partial)
+                    results.append(rnd)
+                    written.append(rnd)
+                    games[gid] = after_round(game, guess, exact, now)
+                    touched.add(gid)
+
+                for start in range(0, len(written), self.insert_chunk):
+                    self._insert_rounds(cur, written[start:start + self.insert_chunk])
+                if touched:
+                    self._executemany(cur, SNAPSHOT_UPDATE, [snapshot_params(games[gid]) for gid in sorted(touched)])
+                    self._write_stats(cur, [(locked[gid], games[gid]) for gid in sorted(touched)])
+            conn.commit()
+            return results
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    # --- Aggregates ---
+    def _write_stats(self, cur, changes: Iterable[Tuple[Optional[Game], Game]]) -> None:
+        """Apply snapshot changes to stat_counter and leaderboard inside the caller's transaction."""
+        counters, entries = stats_rows(changes)
+        if counters:
+            self._executemany(cur, self.counter_upsert, counters)
+        if entries:
+            self._executemany(cur, LEADERBOARD_INSERT, [leaderboard_params(e) for e in entries])
+
+    def get_stats(self) -> Dict[str, int]:
+        conn = self._conn()
+        try:
+            with self._cursor(conn) as cur:
+                self._execute(cur, "SELECT name, SUM(value) AS total FROM stat_counter GROUP BY name")
+                return {name: int(total) for name, total in self._fetchall(cur)}
+        finally:
+            conn.close()
+
+    def leaderboard(self, by: str = "rounds", limit: int = 10) -> List[LeaderboardEntry]:
+        # Served by idx_leaderboard_rounds / idx_leaderboard_time
+        sql = (
+            f"SELECT {LEADERBOARD_COLUMNS} FROM leaderboard "
+            f"ORDER BY {LEADERBOARD_ORDER_BY[by]} LIMIT %s"
+        )
+        conn = self._conn()
+        try:
+            with self._cursor(conn) as cur:
+                self._execute(cur, sql, (limit,))
+                return [self._row_to_entry(r) for r in self._fetchall(cur)]
+        finally:
+            conn.close()
+
+    def rebuild_stats(self, chunk_size: int = 500) -> Dict[str, int]:
+        """Recompute stat_counter and leaderboard from the game snapshots in one transaction.
+
+        Games are streamed from a second connection chunk_size rows at a time and
+        written back per chunk, so memory stays flat however many games there are.
+        Guesses recorded while this runs can be counted twice or not at all; run
+        it with writes paused.
+        """
+        conn = self._conn()
+        try:
+            self._begin(conn)
+            with self._cursor(conn) as cur:
+                self._execute(cur, "DELETE FROM leaderboard")
+                self._execute(cur, "DELETE FROM stat_counter")
+                chunk: List[Tuple[None, Game]] = []
+                for game in self.iter_games(chunk_size=chunk_size):
+                    chunk.append((None, game))
+                    if len(chunk) >= chunk_size:
+                        self._write_stats(cur, chunk)
+                        chunk = []
+                self._write_stats(cur, chunk)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        return self.get_stats()
+
+    # --- Bulk transfer ---
+    def export_rows(self, table: str, after_id: Optional[int] = None, chunk_size: int = 1000) -> Iterator[List[tuple]]:
+        """Stream a table from an unbuffered cursor, chunk_size rows per fetch.
+
+        Rows come straight from the driver; nothing is mapped to models. The
+        connection stays checked out until the generator is exhausted or closed.
+        """
+        fields = transfer_fields(table)
+        sql = f"SELECT {', '.join(fields)} FROM {table} WHERE id > %s ORDER BY id"
+        conn = self._conn()
+        try:
+            with self._cursor(conn, stream=True) as cur:
+                self._execute(cur, sql, (after_id or 0,))
+                while True:
+                    rows = self._fetchmany(cur, chunk_size)
+                    if not rows:
+                        break
+                    yield rows
+        finally:
+            conn.close()
+
+    def import_rows(self, table: str, rows: List[tuple]) -> int:
+        # One executemany per batch: a multi-row INSERT on MySQL, one prepared statement on SQLite
+        if not rows:
+            return 0
+        fields = transfer_fields(table)
+        sql = (f"INSERT INTO {table} ({', '.join(fields)}) VALUES ({', '.join(['%s'] * len(fields))})"
+               + self.import_conflict)
+        conn = self._conn()
+        try:
+            self._begin(conn)
+            with self._cursor(conn) as cur:
+                self._executemany(cur, sql, rows)
+                written = cur.rowcount
+            conn.commit()
+            return written
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def load_csv(self, table: str, path: str) -> int:
+        """Load a CSV export with LOAD DATA LOCAL INFILE in one statement; returns rows loaded.
+
+        Faster than import_rows for large files, but needs local_infile enabled on
+        the server and is all-or-nothing per file. Ids already stored are skipped.
+        """
+        fields = transfer_fields(table)
+        # Not pooled: allow_local_infile is fixed when a connection is opened
+        conn = self._connect(allow_local_infile=True)
+        try:
+            with self._cursor(conn) as cur:
+                self._execute(cur, LOAD_DATA_CSV.format(table=table, columns=", ".join(fields)),
+                              (os.path.abspath(path),))
+                loaded = cur.rowcount
+            conn.commit()
+            return loaded
+        except Exception:
+            conn.rollback()
+            raise
         finally:
             conn.close()
@@ -0,0 +1,239 @@
+
+from __future__ import annotations
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional, Tuple
+import functools
+import inspect
+import logging
+import threading
+import time
+from Python_Apps.GTN_MVC_Example.config import Config
+
+slow_query_log = logging.getLogger("gtn.slow_query")
+
+@dataclass
+class RequestStats:
+    """DB cost of one unit of work (normally one Flask request)."""
+    queries: int = 0
+    pool_wait: float = 0.0   # seconds spent in pool.get_connection()
+    exec_time: float = 0.0   # seconds spent executing statements
+    rows: int = 0            # rows fetched
+    repo_time: float = 0.0   # seconds spent inside repository methods
+    # One request's work may run on several threads (e.g. fanned out to a pool)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def add(self, queries: int = 0, pool_wait: float = 0.0, exec_time: float = 0.0,
+            rows: int = 0, repo_time: float = 0.0) -> None:
+        with self._lock:
+            self.queries += queries
+            self.pool_wait += pool_wait
+            self.exec_time += exec_time
+            self.rows += rows
+            self.repo_time += repo_time
+
+class QueryMetrics:
+    """Process-wide counters behind the /metrics endpoint. Thread-safe."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.queries = 0
+        self.slow_queries = 0
+        self.pool_wait = 0.0
+        self.exec_time = 0.0
+        self.rows = 0
+        self.method_calls: Dict[str, int] = {}
+        self.method_time: Dict[str, float] = {}
+        self.requests: Dict[Tuple[str, str, int], int] = {}
+        self.request_time: Dict[Tuple[str, str, int], float] = {}
+        self.pools: Dict[str, object] = {}
+        self.queues: Dict[str, object] = {}
+
+    def register_pool(self, pool) -> None:
+        """Expose a ConnectionPool's stats() as gtn_db_pool_* gauges."""
+        with self._lock:
+            self.pools[pool.name] = pool
+
+    def register_queue(self, writer) -> None:
+        """Expose a WriteBehindGameRepository's stats() as gtn_write_behind_* metrics."""
+        with self._lock:
+            self.queues[writer.name] = writer
+
+    def add_query(self, seconds: float) -> None:
+        with self._lock:
+            self.queries += 1
+            self.exec_time += seconds
+
+    def add_slow_query(self) -> None:
+        with self._lock:
+            self.slow_queries += 1
+
+    def add_pool_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.pool_wait += seconds
+
+    def add_rows(self, n: int) -> None:
+        with self._lock:
+            self.rows += n
+
+    def add_method(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.method_calls[name] = self.method_calls.get(name, 0) + 1
+            self.method_time[name] = self.method_time.get(name, 0.0) + seconds
+
+    def add_request(self, endpoint: str, method: str, status: int, seconds: float) -> None:
+        key = (endpoint, method, status)
+        with self._lock:
+            self.requests[key] = self.requests.get(key, 0) + 1
+            self.request_time[key] = self.request_time.get(key, 0.0) + seconds
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            lines = []
+
+            def metric(name: str, kind: str, help_text: str, samples) -> None:
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    lines.append(f"{name}{labels} {value}")
+
+            metric("gtn_db_queries_total", "counter", "SQL statements executed.", [("", self.queries)])
+            metric("gtn_db_slow_queries_total", "counter",
+                   f"Statements slower than {Config.SLOW_QUERY_MS}ms.", [("", self.slow_queries)])
+            metric("gtn_db_query_seconds_total", "counter", "Time spent executing statements.",
+                   [("", round(self.exec_time, 6))])
+            metric("gtn_db_pool_wait_seconds_total", "counter", "Time spent waiting for a pooled connection.",
+                   [("", round(self.pool_wait, 6))])
+            metric("gtn_db_rows_total", "counter", "Rows fetched from the database.", [("", self.rows)])
+            metric("gtn_repository_calls_total", "counter", "Repository method calls.",
+                   [(f'{{method="{m}"}}', n) for m, n in sorted(self.method_calls.items())])
+            metric("gtn_repository_seconds_total", "counter", "Time spent in repository methods.",
+                   [(f'{{method="{m}"}}', round(t, 6)) for m, t in sorted(self.method_time.items())])
+            metric("gtn_http_requests_total", "counter", "HTTP requests served.",
+                   [(f'{{endpoint="{e}",method="{m}",status="{s}"}}', n)
+                    for (e, m, s), n in sorted(self.requests.items())])
+            metric("gtn_http_request_seconds_total", "counter", "Time spent serving HTTP requests.",
+                   [(f'{{endpoint="{e}",method="{m}",status="{s}"}}', round(t, 6))
+                    for (e, m, s), t in sorted(self.request_time.items())])
+            pool_stats = {name: pool.stats() for name, pool in sorted(self.pools.items())}
+            metric("gtn_db_pool_connections", "gauge", "Pooled connections by state.",
+                   [(f'{{pool="{p}",state="{state}"}}', st[state])
+                    for p, st in pool_stats.items() for state in ("in_use", "idle")])
+            metric("gtn_db_pool_max_connections", "gauge", "Configured pool maximum.",
+                   [(f'{{pool="{p}"}}', st["max_size"]) for p, st in pool_stats.items()])
+            metric("gtn_db_pool_waiters", "gauge", "Threads waiting for a connection.",
+                   [(f'{{pool="{p}"}}', st["waiters"]) for p, st in pool_stats.items()])
+            metric("gtn_db_pool_waits_total", "counter", "Checkouts that had to wait.",
+                   [(f'{{pool="{p}"}}', st["waits_total"]) for p, st in pool_stats.items()])
+            metric("gtn_db_pool_wait_queue_seconds_total", "counter", "Time spent queued for a connection.",
+                   [(f'{{pool="{p}"}}', st["wait_seconds_total"]) for p, st in pool_stats.items()])
+            metric("gtn_db_pool_timeouts_total", "counter", "Checkouts that timed out.",
+                   [(f'{{pool="{p}"}}', st["timeouts_total"]) for p, st in pool_stats.items()])
+            metric("gtn_db_pool_recycled_total", "counter", "Connections closed for age or failed health checks.",
+                   [(f'{{pool="{p}"}}', st["recycled_total"]) for p, st in pool_stats.items()])
+            if self.queues:
+                queue_stats = {name: q.stats() for name, q in sorted(self.queues.items())}
+                for key, kind, help_text in (
+                    ("depth", "gauge", "Rounds queued and not yet written."),
+                    ("max_size", "gauge", "Configured queue bound."),
+                    ("flushes_total", "counter", "Group commits run by the flusher."),
+                    ("rounds_total", "counter", "Rounds written."),
+                    ("failed_total", "counter", "Rounds lost to failed flushes."),
+                    ("flush_seconds_total", "counter", "Time spent writing batches."),
+                    ("last_flush_seconds", "gauge", "Duration of the latest flush."),
+                    ("latency_seconds_total", "counter", "Queued-to-committed time, summed over written rounds."),
+                ):
+                    metric(f"gtn_write_behind_{key}", kind, help_text,
+                           [(f'{{queue="{q}"}}', st[key]) for q, st in queue_stats.items()])
+            return "\n".join(lines) + "\n"
+
+METRICS = QueryMetrics()
+_current: ContextVar[Optional[RequestStats]] = ContextVar("gtn_request_stats", default=None)
+# True inside a timed repository method, so the calls it makes are not counted again
+_in_method: ContextVar[bool] = ContextVar("gtn_in_repository_method", default=False)
+
+def start_request() -> Token:
+    return _current.set(RequestStats())
+
+def end_request(token: Token) -> RequestStats:
+    stats = _current.get() or RequestStats()
+    _current.reset(token)
+    return stats
+
+def current_stats() -> Optional[RequestStats]:
+    return _current.get()
+
+# --- Hooks called by the repositories ---
+def record_pool_wait(seconds: float) -> None:
+    METRICS.add_pool_wait(seconds)
+    stats = _current.get()
+    if stats is not None:
+        stats.add(pool_wait=seconds)
+
+def record_query(sql: str, params: tuple, seconds: float) -> None:
+    METRICS.add_query(seconds)
+    stats = _current.get()
+    if stats is not None:
+        stats.add(queries=1, exec_time=seconds)
+    if seconds * 1000 >= Config.SLOW_QUERY_MS:
+        METRICS.add_slow_query()
+        slow_query_log.warning("slow query (%.1f ms): %s params=%r", seconds * 1000, " ".join(sql.split()), params)
+
+def record_rows(n: int) -> None:
+    METRICS.add_rows(n)
+    stats = _current.get()
+    if stats is not None:
+        stats.add(rows=n)
+
+def _record_method(name: str, seconds: float) -> None:
+    METRICS.add_method(name, seconds)
+    stats = _current.get()
+    if stats is not None:
+        stats.add(repo_time=seconds)
+
+def timed(name: str, fn: Callable) -> Callable:
+    """Wrap a repository method so its calls and wall time are recorded under `name`.
+
+    Only the outermost call is recorded: a timed method called from another
+    one is already inside the caller's time.
+    """
+    if inspect.isgeneratorfunction(fn):
+        @functools.wraps(fn)
+        def gen_wrapper(*args, **kwargs):
+            gen = fn(*args, **kwargs)
+            if _in_method.get():
+                yield from gen
+                return
+            # Time only the steps spent producing rows, not the consumer's work in between;
+            # the flag is reset before every yield so it never leaks into the consumer
+            elapsed = 0.0
+            try:
+                while True:
+                    token = _in_method.set(True)
+                    t0 = time.perf_counter()
+                    try:
+                        item = next(gen)
+                    except StopIteration:
+                        return
+                    finally:
+                        elapsed += time.perf_counter() - t0
+                        _in_method.reset(token)
+                    yield item
+            finally:
+                gen.close()
+                _record_method(name, elapsed)
+        return gen_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if _in_method.get():
+            return fn(*args, **kwargs)
+        token = _in_method.set(True)
+        t0 = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _record_method(name, time.perf_counter() - t0)
+            _in_method.reset(token)
+    return wrapper
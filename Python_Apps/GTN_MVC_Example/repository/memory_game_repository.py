@@ -0,0 +1,230 @@
+
+from __future__ import annotations
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+from itertools import islice
+from operator import attrgetter
+from typing import Callable, Dict, Iterator, Optional, List, Tuple
+import heapq
+import threading
+from Python_Apps.GTN_MVC_Example.model.game import Game
+from Python_Apps.GTN_MVC_Example.model.leaderboard import LeaderboardEntry
+from Python_Apps.GTN_MVC_Example.model.round import Round
+from Python_Apps.GTN_MVC_Example.repository.base import BaseGameRepository, after_round, finished, stats_delta
+from Python_Apps.GTN_MVC_Example.repository.game_repository import GAME_FIELDS, ROUND_FIELDS, transfer_fields
+
+# Models keep their fields in *_FIELDS order, so these give the same rows an SQL cursor would
+_AS_ROW = {"game": attrgetter(*GAME_FIELDS), "round": attrgetter(*ROUND_FIELDS)}
+_ROUND_ID = attrgetter("id")
+
+class MemoryGameRepository(BaseGameRepository):
+    """Pure in-memory storage engine for hermetic tests and service-layer benchmarks.
+
+    Games live in a dict keyed by id, with a sorted array of ids for keyset
+    pagination; rounds live in one oldest-first list per game. One lock guards
+    everything, which stands in for the row lock record_guess takes in SQL.
+    Aggregates are plain counters and a dict of wins, updated under the same lock.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._games: Dict[int, Game] = {}
+        self._game_ids = array("q")  # ascending, ids are never reused
+        self._rounds: Dict[int, List[Round]] = {}
+        self._next_game_id = 1
+        self._next_round_id = 1
+        self._counters: Dict[str, int] = {}
+        self._wins: Dict[int, LeaderboardEntry] = {}
+
+    # --- Game CRUD ---
+    def create_game(self, answer: str) -> Game:
+        with self._lock:
+            game = Game(id=self._next_game_id, answer=answer, is_finished=False,
+                        started_at=datetime.now().replace(microsecond=0))
+            self._next_game_id += 1
+            self._games[game.id] = game
+            self._game_ids.append(game.id)
+            self._rounds[game.id] = []
+            self._track(None, game)
+            return game
+
+    def get_game(self, game_id: int) -> Optional[Game]:
+        return self._games.get(game_id)
+
+    def _games_page(self, after_id: Optional[int], limit: Optional[int]) -> List[Game]:
+        with self._lock:
+            end = len(self._game_ids) if after_id is None else bisect_left(self._game_ids, after_id)
+            start = 0 if limit is None else max(0, end - limit)
+            return [self._games[i] for i in reversed(self._game_ids[start:end])]
+
+    def list_games(self, after_id: Optional[int] = None, limit: Optional[int] = None) -> List[Game]:
+        return self._games_page(after_id, limit)
+
+    def iter_games(self, after_id: Optional[int] = None, chunk_size: int = 500) -> Iterator[Game]:
+        while True:
+            page = self._games_page(after_id, chunk_size)
+            if not page:
+                return
+            yield from page
+            after_id = page[-1].id
+
+    def games_version(self) -> Tuple[int, int, int]:
+        with self._lock:
+            max_id = self._game_ids[-1] if self._game_ids else 0
+            return max_id, self._counters.get("games_finished", 0), self._counters.get("rounds", 0)
+
+    def mark_finished(self, game_id: int) -> None:
+        with self._lock:
+            self._finish(game_id)
+
+    def _finish(self, game_id: int) -> Optional[Game]:
+        game = self._games.get(game_id)
+        if game is not None:
+            before, game = game, finished(game, datetime.now().replace(microsecond=0))
+            self._games[game_id] = game
+            self._track(before, game)
+        return game
+
+    # --- Round operations ---
+    def _insert_round(self, game_id: int, guess: str, exact: int, partial: int) -> Round:
+        rnd = Round(id=self._next_round_id, game_id=game_id, guess=guess, exact_match=exact,
+                    partial_match=partial, created_at=datetime.now().replace(microsecond=0))
+        self._next_round_id += 1
+        self._rounds.setdefault(game_id, []).append(rnd)
+        before = self._games[game_id]
+        self._games[game_id] = after_round(before, guess, exact, rnd.created_at)
+        self._track(before, self._games[game_id])
+        return rnd
+
+    def add_round(self, game_id: int, guess: str, exact: int, partial: int) -> Round:
+        with self._lock:
+            if game_id not in self._games:
+                # Mirrors the foreign key on round.game_id
+                raise LookupError("Game not found.")
+            return self._insert_round(game_id, guess, exact, partial)
+
+    def _rounds_page(self, game_id: int, since_id: Optional[int], limit: Optional[int]) -> List[Round]:
+        rounds = self._rounds.get(game_id, [])
+        start = 0 if since_id is None else bisect_right(rounds, since_id, key=lambda r: r.id)
+        newest = rounds[start:] if limit is None else rounds[max(start, len(rounds) - limit):]
+        return newest[::-1]
+
+    def list_rounds(self, game_id: int, since_id: Optional[int] = None, limit: Optional[int] = None) -> List[Round]:
+        with self._lock:
+            return self._rounds_page(game_id, since_id, limit)
+
+    # --- Unit of work ---
+    def record_guess(
+        self,
+        game_id: int,
+        guess: str,
+        score: Callable[[str], Tuple[int, int]],
+        history: Optional[int] = None,
+    ) -> Optional[Tuple[Game, Round, List[Round]]]:
+        with self._lock:
+            game = self._games.get(game_id)
+            if game is None:
+                return None
+            exact, partial = score(game.answer)
+            new_round = self._insert_round(game_id, guess, exact, partial)
+            return self._games[game_id], new_round, self._rounds_page(game_id, None, history)
+
+    def record_rounds(
+        self,
+        guesses: List[Tuple[int, str]],
+        score: Callable[[str, str], Tuple[int, int]],
+    ) -> List[Optional[Round]]:
+        with self._lock:
+            results: List[Optional[Round]] = []
+            for gid, guess in guesses:
+                game = self._games.get(gid)
+                if game is None:
+                    results.append(None)
+                    continue
+                exact, partial = score(game.answer, guess)
+                results.append(self._insert_round(gid, guess, exact, partial))
+            return results
+
+    # --- Aggregates ---
+    def _track(self, before: Optional[Game], after: Game) -> None:
+        delta, entry = stats_delta(before, after)
+        for name, n in delta.items():
+            self._counters[name] = self._counters.get(name, 0) + n
+        if entry is not None:
+            self._wins[entry.game_id] = entry
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counters)
+
+    def leaderboard(self, by: str = "rounds", limit: int = 10) -> List[LeaderboardEntry]:
+        if by == "rounds":
+            key = lambda e: (e.rounds, e.seconds, e.game_id)
+        else:
+            key = lambda e: (e.seconds, e.rounds, e.game_id)
+        with self._lock:
+            return heapq.nsmallest(limit, self._wins.values(), key=key)
+
+    def rebuild_stats(self, chunk_size: int = 500) -> Dict[str, int]:
+        with self._lock:
+            self._counters = {}
+            self._wins = {}
+            for game in self._games.values():
+                self._track(None, game)
+            return dict(self._counters)
+
+    # --- Bulk transfer ---
+    def _export_page(self, table: str, after_id: Optional[int], limit: int) -> list:
+        if table == "game":
+            start = 0 if after_id is None else bisect_right(self._game_ids, after_id)
+            return [self._games[i] for i in self._game_ids[start:start + limit]]
+        # Each game's list is already in id order; merge the parts after after_id into one
+        tails = []
+        for rounds in self._rounds.values():
+            start = 0 if after_id is None else bisect_right(rounds, after_id, key=_ROUND_ID)
+            if start < len(rounds):
+                tails.append(map(rounds.__getitem__, range(start, len(rounds))))
+        return list(islice(heapq.merge(*tails, key=_ROUND_ID), limit))
+
+    def export_rows(self, table: str, after_id: Optional[int] = None, chunk_size: int = 1000) -> Iterator[List[tuple]]:
+        # One keyset page per chunk, like iter_games: nothing is copied up front
+        transfer_fields(table)
+        as_row = _AS_ROW[table]
+        while True:
+            with self._lock:
+                page = self._export_page(table, after_id, chunk_size)
+                rows = [as_row(item) for item in page]
+            if not rows:
+                return
+            yield rows
+            after_id = page[-1].id
+
+    def import_rows(self, table: str, rows: List[tuple]) -> int:
+        transfer_fields(table)
+        written = 0
+        with self._lock:
+            if table == "game":
+                for row in rows:
+                    game = Game(row[0], row[1], bool(row[2]), *row[3:])
+                    if game.id in self._games:
+                        continue
+                    insort(self._game_ids, game.id)
+                    self._games[game.id] = game
+                    self._rounds.setdefault(game.id, [])
+                    self._next_game_id = max(self._next_game_id, game.id + 1)
+                    written += 1
+                return written
+            if any(row[1] not in self._games for row in rows):
+                # Mirrors the foreign key on round.game_id; nothing from the batch is kept
+                raise LookupError("Game not found.")
+            for row in rows:
+                rnd = Round(*row)
+                rounds = self._rounds[rnd.game_id]
+                i = bisect_left(rounds, rnd.id, key=_ROUND_ID)
+                if i < len(rounds) and rounds[i].id == rnd.id:
+                    continue
+                rounds.insert(i, rnd)
+                self._next_round_id = max(self._next_round_id, rnd.id + 1)
+                written += 1
+        return written
@@ -0,0 +1,266 @@
+from __future__ import annotations
+from collections import OrderedDict
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+import itertools
+import logging
+import threading
+import time
+from Python_Apps.GTN_MVC_Example.config import Config
+from Python_Apps.GTN_MVC_Example.model.game import Game
+from Python_Apps.GTN_MVC_Example.model.game_columns import GameColumns
+from Python_Apps.GTN_MVC_Example.model.leaderboard import LeaderboardEntry
+from Python_Apps.GTN_MVC_Example.model.round import Round
+from Python_Apps.GTN_MVC_Example.repository.base import BaseGameRepository
+
+log = logging.getLogger("gtn.replicas")
+
+# Replication lag is reported in whole seconds, so "0" can still be most of a second behind
+LAG_GRANULARITY = 1.0
+
+@dataclass
+class ReadSession:
+    """Routing state for one unit of work (normally one Flask request)."""
+    last_write: float = 0.0            # wall-clock time of the newest write the caller must read back
+    wrote: bool = False                # this unit of work wrote to the primary
+    replica: Optional["Replica"] = None  # pinned on first read, so every read sees the same snapshot
+
+_session: ContextVar[Optional[ReadSession]] = ContextVar("gtn_read_session", default=None)
+
+def begin_session(last_write: float = 0.0) -> Token:
+    """Start routing a unit of work; `last_write` carries a write made by an earlier request."""
+    return _session.set(ReadSession(last_write=last_write))
+
+def end_session(token: Token) -> ReadSession:
+    session = _session.get() or ReadSession()
+    _session.reset(token)
+    return session
+
+def current_session() -> Optional[ReadSession]:
+    return _session.get()
+
+class Replica:
+    """A read replica's repository plus its cached replication lag."""
+
+    def __init__(self, repo: BaseGameRepository, name: str, check_every: float) -> None:
+        self.repo = repo
+        self.name = name
+        self.check_every = check_every
+        self.lag: Optional[float] = None   # None: unknown, stopped or unreachable
+        self._checked_at = float("-inf")
+        self._probing = threading.Lock()
+
+    def current_lag(self) -> Optional[float]:
+        """Lag in seconds, re-probed at most every check_every seconds.
+
+        Only one thread probes at a time; the others use the last value meanwhile.
+        """
+        if time.monotonic() - self._checked_at >= self.check_every and self._probing.acquire(blocking=False):
+            try:
+                self.lag = self.repo.replication_lag()
+            except Exception:
+                log.warning("replica %s: lag probe failed", self.name, exc_info=True)
+                self.lag = None
+            finally:
+                self._checked_at = time.monotonic()
+                self._probing.release()
+        return self.lag
+
+    def mark_failed(self) -> None:
+        # Skipped until the next probe succeeds
+        self.lag = None
+        self._checked_at = time.monotonic()
+
+class ReplicatedGameRepository:
+    """Sends writes to the primary and reads to replicas that are close enough behind it.
+
+    - A replica is eligible while its lag (repo.replication_lag(), probed every
+      Config.REPLICA_LAG_CHECK seconds) is known and at most Config.REPLICA_MAX_LAG.
+      With none eligible, reads fall back to the primary.
+    - Read-your-writes: a read goes to the primary while a write made in the
+      current session (see begin_session) may not have reached the replica yet.
+      The same holds for games this process wrote recently, which keeps the
+      game cache from being refilled with a replica's older copy.
+    - Within a session the first replica chosen serves every later read, so
+      games_version() and the page it validates come from the same server.
+    - A read that fails on a replica is retried once on the primary.
+
+    Like CachingGameRepository, anything not listed here goes to the primary.
+    """
+
+    def __init__(
+        self,
+        primary: BaseGameRepository,
+        replicas: Sequence[BaseGameRepository],
+        max_lag: float | None = None,
+        check_every: float | None = None,
+        recent_writes: int = 10000,
+    ) -> None:
+        self.primary = primary
+        check_every = Config.REPLICA_LAG_CHECK if check_every is None else check_every
+        self.replicas = [Replica(r, f"replica{i}", check_every) for i, r in enumerate(replicas)]
+        self.max_lag = Config.REPLICA_MAX_LAG if max_lag is None else max_lag
+        self._next = itertools.count()
+        self._recent: "OrderedDict[int, float]" = OrderedDict()  # game id -> last write, bounded
+        self._recent_max = recent_writes
+        self._lock = threading.Lock()
+        self.reads: Dict[str, int] = {"primary": 0, **{r.name: 0 for r in self.replicas}}
+        self.fallbacks = 0
+
+    def __getattr__(self, name: str):
+        return getattr(self.primary, name)
+
+    # --- Routing ---
+    def _written(self, game_ids: Sequence[int] = ()) -> None:
+        now = time.time()
+        session = _session.get()
+        if session is not None:
+            session.last_write = now
+            session.wrote = True
+        if game_ids:
+            with self._lock:
+                for gid in game_ids:
+                    self._recent[gid] = now
+                    self._recent.move_to_end(gid)
+                while len(self._recent) > self._recent_max:
+                    self._recent.popitem(last=False)
+
+    def _usable(self, replica: Replica, last_write: float) -> bool:
+        lag = replica.current_lag()
+        if lag is None or lag > self.max_lag:
+            return False
+        # The replica has applied everything written before now - lag
+        return last_write < time.time() - lag - LAG_GRANULARITY
+
+    def _reader(self, game_id: Optional[int] = None) -> Optional[Replica]:
+        """The replica to read from, or None for the primary."""
+        if not self.replicas:
+            return None
+        session = _session.get()
+        last_write = session.last_write if session is not None else 0.0
+        if game_id is not None:
+            with self._lock:
+                last_write = max(last_write, self._recent.get(game_id, 0.0))
+        if session is not None and session.replica is not None and self._usable(session.replica, last_write):
+            return session.replica
+        start = next(self._next)
+        for i in range(len(self.replicas)):
+            replica = self.replicas[(start + i) % len(self.replicas)]
+            if self._usable(replica, last_write):
+                if session is not None:
+                    session.replica = replica
+                return replica
+        return None
+
+    def _read(self, call: Callable[[BaseGameRepository], object], game_id: Optional[int] = None):
+        replica = self._reader(game_id)
+        if replica is not None:
+            try:
+                result = call(replica.repo)
+                with self._lock:
+                    self.reads[replica.name] += 1
+                return result
+            except Exception:
+                log.warning("replica %s: read failed, retrying on the primary", replica.name, exc_info=True)
+                replica.mark_failed()
+                session = _session.get()
+                if session is not None and session.replica is replica:
+                    session.replica = None
+                with self._lock:
+                    self.fallbacks += 1
+        with self._lock:
+            self.reads["primary"] += 1
+        return call(self.primary)
+
+    def _write(self, call: Callable[[BaseGameRepository], object], game_ids: Sequence[int] = ()):
+        try:
+            return call(self.primary)
+        finally:
+            # Stamped even on failure: part of the write may have landed
+            self._written(game_ids)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "reads": dict(self.reads),
+                "fallbacks": self.fallbacks,
+                "lag": {r.name: r.lag for r in self.replicas},
+            }
+
+    # --- Reads ---
+    def get_game(self, game_id: int) -> Optional[Game]:
+        return self._read(lambda r: r.get_game(game_id), game_id)
+
+    def list_games(self, after_id: Optional[int] = None, limit: Optional[int] = None) -> List[Game]:
+        return self._read(lambda r: r.list_games(after_id, limit))
+
+    def iter_games(self, after_id: Optional[int] = None, chunk_size: int = 500) -> Iterator[Game]:
+        # Routed when the stream starts; a failure mid-stream is not retried
+        return self._read(lambda r: r.iter_games(after_id, chunk_size))
+
+    def game_columns(self, after_id: Optional[int] = None, limit: Optional[int] = None,
+                     chunk_size: int = 500) -> GameColumns:
+        return self._read(lambda r: r.game_columns(after_id, limit, chunk_size))
+
+    def games_version(self) -> Tuple[int, int, int]:
+        return self._read(lambda r: r.games_version())
+
+    def list_rounds(self, game_id: int, since_id: Optional[int] = None, limit: Optional[int] = None) -> List[Round]:
+        return self._read(lambda r: r.list_rounds(game_id, since_id, limit), game_id)
+
+    def get_stats(self) -> Dict[str, int]:
+        return self._read(lambda r: r.get_stats())
+
+    def leaderboard(self, by: str = "rounds", limit: int = 10) -> List[LeaderboardEntry]:
+        return self._read(lambda r: r.leaderboard(by, limit))
+
+    def export_rows(self, table: str, after_id: Optional[int] = None, chunk_size: int = 1000) -> Iterator[List[tuple]]:
+        return self._read(lambda r: r.export_rows(table, after_id, chunk_size))
+
+    # --- Writes ---
+    def create_game(self, answer: str) -> Game:
+        game = self._write(lambda r: r.create_game(answer))
+        self._written((game.id,))  # the id is only known once the insert is done
+        return game
+
+    def create_games(self, answers: List[str]) -> List[Game]:
+        games = self._write(lambda r: r.create_games(answers))
+        self._written([g.id for g in games])
+        return games
+
+    def mark_finished(self, game_id: int) -> None:
+        return self._write(lambda r: r.mark_finished(game_id), (game_id,))
+
+    def add_round(self, game_id: int, guess: str, exact: int, partial: int) -> Round:
+        return self._write(lambda r: r.add_round(game_id, guess, exact, partial), (game_id,))
+
+    def record_guess(
+        self,
+        game_id: int,
+        guess: str,
+        score: Callable[[str], Tuple[int, int]],
+        history: Optional[int] = None,
+    ) -> Optional[Tuple[Game, Round, List[Round]]]:
+        # The returned game and rounds are read inside the primary's transaction
+        return self._write(lambda r: r.record_guess(game_id, guess, score, history), (game_id,))
+
+    def record_rounds(
+        self,
+        guesses: List[Tuple[int, str]],
+        score: Callable[[str, str], Tuple[int, int]],
+    ) -> List[Optional[Round]]:
+        return self._write(lambda r: r.record_rounds(guesses, score), sorted({gid for gid, _ in guesses}))
+
+    def record_guesses(
+        self,
+        guesses: List[Tuple[int, str]],
+        score: Callable[[str, str], Tuple[int, int]],
+    ) -> List[Optional[Tuple[int, int]]]:
+        return self._write(lambda r: r.record_guesses(guesses, score), sorted({gid for gid, _ in guesses}))
+
+    def rebuild_stats(self, chunk_size: int = 500) -> Dict[str, int]:
+        return self._write(lambda r: r.rebuild_stats(chunk_size))
+
+    def import_rows(self, table: str, rows: List[tuple]) -> int:
+        return self._write(lambda r: r.import_rows(table, rows))
@@ -0,0 +1,227 @@
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from itertools import islice
+from operator import attrgetter, itemgetter
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple, TypeVar
+import heapq
+import itertools
+from Python_Apps.GTN_MVC_Example.model.game import Game
+from Python_Apps.GTN_MVC_Example.model.game_columns import GameColumns
+from Python_Apps.GTN_MVC_Example.model.leaderboard import LeaderboardEntry
+from Python_Apps.GTN_MVC_Example.model.round import Round
+from Python_Apps.GTN_MVC_Example.repository.base import BaseGameRepository, round_results, time_interface
+from Python_Apps.GTN_MVC_Example.repository.game_repository import GAME_FIELDS, LEADERBOARD_ORDER_BY, transfer_fields
+
+T = TypeVar("T")
+
+_GAME_ID = attrgetter("id")
+_ROW_ID = itemgetter(0)
+
+# Merge keys matching LEADERBOARD_ORDER_BY, so a merged board reads like a single table's
+LEADERBOARD_KEYS: Dict[str, Callable[[LeaderboardEntry], tuple]] = {
+    "rounds": lambda e: (e.rounds, e.seconds, e.game_id),
+    "time": lambda e: (e.seconds, e.rounds, e.game_id),
+}
+
+def shard_index(game_id: int, stride: int) -> int:
+    """The shard slot a game id encodes: shard i hands out ids with id % stride == i + 1."""
+    return (game_id - 1) % stride
+
+@time_interface
+class ShardedGameRepository:
+    """Spreads games, and the rounds of each game, over several databases by game id.
+
+    Every shard allocates ids from its own residue class (see shard_index), so
+    a game id names its shard and get_game, list_rounds, add_round and
+    record_guess go straight to it with no lookup table. New games go to the
+    shards in turn. Round ids are strided the same way, which keeps them
+    unique across shards for export and import.
+
+    Reads that span games (list_games, games_version, /stats, /leaderboard)
+    run on every shard in parallel and are merged here; list_games keeps
+    ORDER BY id DESC and its keyset pagination because ids never collide.
+    Writes to several shards (record_rounds, import_rows) commit one
+    transaction per shard, so such a batch is not atomic as a whole.
+
+    Like ReplicatedGameRepository this is not a BaseGameRepository subclass,
+    but its methods are timed: a call is recorded once, for its wall time,
+    and the shard calls it fans out to are not counted again.
+    """
+
+    def __init__(self, shards: Sequence[BaseGameRepository], stride: int) -> None:
+        if not 0 < len(shards) <= stride:
+            raise ValueError(f"Need between 1 and {stride} shards (the id stride), got {len(shards)}")
+        self.shards = list(shards)
+        self.stride = stride
+        self._next = itertools.count()
+        self._pool = ThreadPoolExecutor(max_workers=len(self.shards), thread_name_prefix="gtn-shard")
+
+    # --- Routing ---
+    def shard_for(self, game_id: int) -> Optional[BaseGameRepository]:
+        """The shard holding `game_id`, or None when the id cannot belong to any."""
+        index = shard_index(game_id, self.stride)
+        return self.shards[index] if game_id > 0 and index < len(self.shards) else None
+
+    def _scatter(self, call: Callable[[BaseGameRepository], T]) -> List[T]:
+        """call(shard) on every shard at once, results in shard order.
+
+        Each task runs in a copy of the caller's context, so the queries still
+        count towards the current request's stats.
+        """
+        if len(self.shards) == 1:
+            return [call(self.shards[0])]
+        futures = [self._pool.submit(copy_context().run, call, shard) for shard in self.shards]
+        return [f.result() for f in futures]
+
+    def _scatter_groups(self, groups: Dict[int, List[int]],
+                        call: Callable[[BaseGameRepository, List[int]], T]) -> List[T]:
+        """call(shard, positions) for each group from _grouped, results in group order."""
+        if len(groups) == 1:
+            (index, positions), = groups.items()
+            return [call(self.shards[index], positions)]
+        futures = [self._pool.submit(copy_context().run, call, self.shards[index], positions)
+                   for index, positions in groups.items()]
+        return [f.result() for f in futures]
+
+    def _grouped(self, items: Sequence[T], game_id: Callable[[T], int]) -> Dict[int, List[int]]:
+        """Positions of `items` per shard index; items for no shard are left out."""
+        groups: Dict[int, List[int]] = {}
+        for pos, item in enumerate(items):
+            gid = game_id(item)
+            if self.shard_for(gid) is not None:
+                groups.setdefault(shard_index(gid, self.stride), []).append(pos)
+        return groups
+
+    # --- Schema ---
+    def ensure_schema(self) -> None:
+        self._scatter(lambda s: s.ensure_schema())
+
+    # --- Game CRUD ---
+    def create_game(self, answer: str) -> Game:
+        return self.shards[next(self._next) % len(self.shards)].create_game(answer)
+
+    def create_games(self, answers: List[str]) -> List[Game]:
+        # Dealt out in turn from the next shard, one batch per shard, in parallel
+        first = next(self._next)
+        groups: Dict[int, List[int]] = {}
+        for pos in range(len(answers)):
+            groups.setdefault((first + pos) % len(self.shards), []).append(pos)
+        games: List[Optional[Game]] = [None] * len(answers)
+        created = self._scatter_groups(
+            groups, lambda shard, positions: shard.create_games([answers[p] for p in positions])
+        )
+        for positions, shard_games in zip(groups.values(), created):
+            for pos, game in zip(positions, shard_games):
+                games[pos] = game
+        return games
+
+    def get_game(self, game_id: int) -> Optional[Game]:
+        shard = self.shard_for(game_id)
+        return shard.get_game(game_id) if shard is not None else None
+
+    def list_games(self, after_id: Optional[int] = None, limit: Optional[int] = None) -> List[Game]:
+        # Each shard returns its own newest `limit`; the page is the newest `limit` of those
+        pages = self._scatter(lambda s: s.list_games(after_id, limit))
+        return list(islice(heapq.merge(*pages, key=_GAME_ID, reverse=True), limit))
+
+    def iter_games(self, after_id: Optional[int] = None, chunk_size: int = 500) -> Iterator[Game]:
+        # Lazy: one open stream per shard, merged newest first
+        yield from heapq.merge(*(s.iter_games(after_id, chunk_size) for s in self.shards), key=_GAME_ID, reverse=True)
+
+    def game_columns(self, after_id: Optional[int] = None, limit: Optional[int] = None,
+                     chunk_size: int = 500) -> GameColumns:
+        if limit is not None:
+            return GameColumns.from_games(self.list_games(after_id, limit))
+        return GameColumns.from_games(self.iter_games(after_id, chunk_size))
+
+    def games_version(self) -> Tuple[int, int, int]:
+        versions = self._scatter(lambda s: s.games_version())
+        return (max(v[0] for v in versions), sum(v[1] for v in versions), sum(v[2] for v in versions))
+
+    def mark_finished(self, game_id: int) -> None:
+        shard = self.shard_for(game_id)
+        if shard is not None:
+            shard.mark_finished(game_id)
+
+    # --- Round operations ---
+    def add_round(self, game_id: int, guess: str, exact: int, partial: int) -> Round:
+        shard = self.shard_for(game_id)
+        if shard is None:
+            raise LookupError("Game not found.")
+        return shard.add_round(game_id, guess, exact, partial)
+
+    def list_rounds(self, game_id: int, since_id: Optional[int] = None, limit: Optional[int] = None) -> List[Round]:
+        shard = self.shard_for(game_id)
+        return shard.list_rounds(game_id, since_id, limit) if shard is not None else []
+
+    # --- Unit of work ---
+    def record_guess(
+        self,
+        game_id: int,
+        guess: str,
+        score: Callable[[str], Tuple[int, int]],
+        history: Optional[int] = None,
+    ) -> Optional[Tuple[Game, Round, List[Round]]]:
+        shard = self.shard_for(game_id)
+        return shard.record_guess(game_id, guess, score, history) if shard is not None else None
+
+    def record_rounds(
+        self,
+        guesses: List[Tuple[int, str]],
+        score: Callable[[str, str], Tuple[int, int]],
+    ) -> List[Optional[Round]]:
+        # One transaction per shard touched, run in parallel; results go back in input order
+        groups = self._grouped(guesses, itemgetter(0))
+        results: List[Optional[Round]] = [None] * len(guesses)
+        recorded = self._scatter_groups(
+            groups, lambda shard, positions: shard.record_rounds([guesses[p] for p in positions], score)
+        )
+        for positions, shard_results in zip(groups.values(), recorded):
+            for pos, result in zip(positions, shard_results):
+                results[pos] = result
+        return results
+
+    def record_guesses(
+        self,
+        guesses: List[Tuple[int, str]],
+        score: Callable[[str, str], Tuple[int, int]],
+    ) -> List[Optional[Tuple[int, int]]]:
+        return round_results(self.record_rounds(guesses, score))
+
+    # --- Aggregates ---
+    def get_stats(self) -> Dict[str, int]:
+        totals: Dict[str, int] = {}
+        for stats in self._scatter(lambda s: s.get_stats()):
+            for name, value in stats.items():
+                totals[name] = totals.get(name, 0) + value
+        return totals
+
+    def leaderboard(self, by: str = "rounds", limit: int = 10) -> List[LeaderboardEntry]:
+        if by not in LEADERBOARD_ORDER_BY:
+            raise ValueError(f"Unknown leaderboard order: {by!r}")
+        boards = self._scatter(lambda s: s.leaderboard(by, limit))
+        return list(islice(heapq.merge(*boards, key=LEADERBOARD_KEYS[by]), limit))
+
+    def rebuild_stats(self, chunk_size: int = 500) -> Dict[str, int]:
+        # Each shard's aggregates cover its own games only
+        self._scatter(lambda s: s.rebuild_stats(chunk_size))
+        return self.get_stats()
+
+    # --- Bulk transfer ---
+    def export_rows(self, table: str, after_id: Optional[int] = None, chunk_size: int = 1000) -> Iterator[List[tuple]]:
+        """Every shard's rows merged into one ascending id order, re-chunked to chunk_size."""
+        transfer_fields(table)  # rejects unknown tables before any shard is queried
+        streams = [itertools.chain.from_iterable(s.export_rows(table, after_id, chunk_size)) for s in self.shards]
+        merged = heapq.merge(*streams, key=_ROW_ID)
+        while True:
+            chunk = list(islice(merged, chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+    def import_rows(self, table: str, rows: List[tuple]) -> int:
+        """Insert each row on the shard its game id names; rows that fit no shard are skipped."""
+        game_id = _ROW_ID if transfer_fields(table) is GAME_FIELDS else itemgetter(1)  # round.game_id
+        groups = self._grouped(rows, game_id)
+        return sum(self._scatter_groups(groups, lambda shard, positions: shard.import_rows(table, [rows[p] for p in positions])))
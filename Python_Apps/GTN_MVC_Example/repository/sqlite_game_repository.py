@@ -0,0 +1,125 @@
+
+from __future__ import annotations
+from contextlib import closing
+from typing import List, Optional, Tuple
+import sqlite3
+from Python_Apps.GTN_MVC_Example.config import Config
+from Python_Apps.GTN_MVC_Example.repository.game_repository import GameRepository
+
+SQLITE_DDL = (
+    """
+    CREATE TABLE IF NOT EXISTS game (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        answer CHAR(4) NOT NULL,
+        is_finished TINYINT(1) NOT NULL DEFAULT 0,
+        started_at TIMESTAMP NOT NULL DEFAULT (datetime('now', 'localtime')),
+        round_count INT NOT NULL DEFAULT 0,
+        last_guess CHAR(4) NULL,
+        best_exact INT NOT NULL DEFAULT 0,
+        finished_at TIMESTAMP NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS round (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        game_id INTEGER NOT NULL REFERENCES game(id) ON DELETE CASCADE,
+        guess CHAR(4) NOT NULL,
+        exact_match INT NOT NULL,
+        partial_match INT NOT NULL,
+        created_at TIMESTAMP NOT NULL DEFAULT (datetime('now', 'localtime'))
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_round_game_created ON round (game_id, created_at)",
+    """
+    CREATE TABLE IF NOT EXISTS stat_counter (
+        name VARCHAR(32) NOT NULL,
+        slot INT NOT NULL,
+        value BIGINT NOT NULL DEFAULT 0,
+        PRIMARY KEY (name, slot)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS leaderboard (
+        game_id INTEGER PRIMARY KEY REFERENCES game(id) ON DELETE CASCADE,
+        rounds INT NOT NULL,
+        seconds INT NOT NULL,
+        finished_at TIMESTAMP NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_leaderboard_rounds ON leaderboard (rounds, seconds)",
+    "CREATE INDEX IF NOT EXISTS idx_leaderboard_time ON leaderboard (seconds, rounds)",
+)
+
+SQLITE_COUNTER_UPSERT = (
+    "INSERT INTO stat_counter (name, slot, value) VALUES (%s, %s, %s) "
+    "ON CONFLICT (name, slot) DO UPDATE SET value = value + excluded.value"
+)
+
+def connect_sqlite(path: str) -> sqlite3.Connection:
+    """Open a connection the way every SQLite engine expects it configured."""
+    conn = sqlite3.connect(
+        path,
+        detect_types=sqlite3.PARSE_DECLTYPES,  # TIMESTAMP columns come back as datetime
+        isolation_level=None,                  # autocommit; transactions are explicit
+        check_same_thread=False,               # connections move between request threads
+        cached_statements=256,                 # per-connection prepared statement cache
+    )
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=5000")
+    conn.execute("PRAGMA foreign_keys=ON")
+    return conn
+
+class SQLiteGameRepository(GameRepository):
+    """SQLite storage engine (WAL mode) for local load tests and CI.
+
+    Runs the same SQL as the MySQL engine with ? placeholders. record_guess
+    takes the write lock with BEGIN IMMEDIATE instead of SELECT ... FOR UPDATE.
+    """
+
+    placeholder = "?"
+    for_update = ""
+    counter_upsert = SQLITE_COUNTER_UPSERT
+    import_conflict = " ON CONFLICT (id) DO NOTHING"
+    supports_load_data = False  # no LOAD DATA: bulk_transfer imports with batched inserts
+    insert_chunk = 150  # up to 5 parameters a row (a round with its id) stays under the 999 variables of older SQLite builds
+    DDL = SQLITE_DDL
+
+    def __init__(self, path: str | None = None, pool_size: int | None = None,
+                 pool_name: str = "gtn_sqlite_pool", shard: Tuple[int, int] | None = None) -> None:
+        self.path = path or Config.SQLITE_PATH
+        super().__init__(pool_name=pool_name, pool_size=pool_size, shard=shard)
+
+    def _connect(self) -> sqlite3.Connection:
+        return connect_sqlite(self.path)
+
+    def _ping(self, conn) -> bool:
+        return True  # a local file handle does not go stale
+
+    def replication_lag(self) -> Optional[float]:
+        # A stand-in replica is its own file; whatever copies into it decides how far behind it is
+        return 0.0
+
+    def _cursor(self, conn, stream: bool = False):
+        # sqlite3 cursors step through results lazily, so streaming needs nothing extra
+        return closing(conn.cursor())
+
+    def _begin(self, conn) -> None:
+        conn.execute("BEGIN IMMEDIATE")
+
+    def _inserted_ids(self, cur, n: int) -> List[int]:
+        # Under BEGIN IMMEDIATE nothing else inserts, so the statement's rows are
+        # consecutive and lastrowid is the last of them
+        last = cur.lastrowid
+        return list(range(last - n + 1, last + 1))
+
+    def _new_ids(self, cur, table: str, n: int) -> Optional[List[int]]:
+        # No per-connection auto-increment stride here, so a shard picks the next
+        # ids itself; BEGIN IMMEDIATE already holds the write lock
+        if self.shard is None:
+            return None
+        index, stride = self.shard
+        self._execute(cur, f"SELECT MAX(id) FROM {table}")
+        top = self._fetchone(cur)[0] or 0
+        first = top + (index - top) % stride + 1  # smallest id > top with id % stride == index + 1
+        return [first + k * stride for k in range(n)]
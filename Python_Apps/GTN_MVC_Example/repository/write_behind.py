@@ -0,0 +1,330 @@
+from __future__ import annotations
+from contextvars import ContextVar, Token
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+import atexit
+import logging
+import queue
+import threading
+import time
+import weakref
+from Python_Apps.GTN_MVC_Example.config import Config
+from Python_Apps.GTN_MVC_Example.model.game import Game
+from Python_Apps.GTN_MVC_Example.model.round import Round
+from Python_Apps.GTN_MVC_Example.repository.base import BaseGameRepository, after_round
+from Python_Apps.GTN_MVC_Example.repository.instrumentation import METRICS
+
+log = logging.getLogger("gtn.write_behind")
+
+_STOP = object()
+_LOCK_STRIPES = 61  # prime, so strided (sharded) game ids still spread over every stripe
+
+# Per-request override of WriteBehindGameRepository.wait (see wait_for_flush)
+_wait: ContextVar[Optional[bool]] = ContextVar("gtn_write_behind_wait", default=None)
+
+def wait_for_flush(wait: Optional[bool]) -> Token:
+    """Make record_guess in this context wait for its flush (True) or not (False); None keeps the default."""
+    return _wait.set(wait)
+
+def reset_wait(token: Token) -> None:
+    _wait.reset(token)
+
+class WriteBehindTimeout(TimeoutError):
+    """A waiting guess's round was not written in time; it stays queued and may still be."""
+
+class WriteBehindError(RuntimeError):
+    """The flush a queued round went out with failed; the database error is its __cause__."""
+
+class PendingRound:
+    """A queued guess; done is set once the flush it went out with commits or fails."""
+    __slots__ = ("game_id", "guess", "queued_at", "done", "result", "error")
+
+    def __init__(self, game_id: int, guess: str) -> None:
+        self.game_id = game_id
+        self.guess = guess
+        self.queued_at = time.perf_counter()
+        self.done = threading.Event()
+        self.result: Optional[Round] = None
+        self.error: Optional[BaseException] = None
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[Round]:
+        """The round as stored, id included, or None if the game no longer exists.
+
+        Raises WriteBehindTimeout if the flush has not finished within `timeout`
+        seconds and WriteBehindError if it failed.
+        """
+        if not self.done.wait(timeout):
+            raise WriteBehindTimeout(f"Round for game {self.game_id} not written within {timeout}s")
+        if self.error is not None:
+            # A new exception per waiter: the flush error is shared by its whole batch
+            raise WriteBehindError(f"Round for game {self.game_id} was not written: {self.error}") from self.error
+        return self.result
+
+class WriteBehindGameRepository:
+    """Queues record_guess rounds and writes them from a background thread in group commits.
+
+    record_guess scores the guess against the game's latest snapshot (the
+    stored one plus anything still queued for it), queues the round and
+    answers from that prediction. A flusher thread takes up to `batch_size`
+    queued rounds, whatever arrived within `max_delay` seconds of the first
+    (with the default 0, whatever queued up during the previous commit), and
+    writes them with one record_rounds call: one transaction and one
+    commit, with multi-row inserts, for the whole batch. record_rounds
+    locks and re-scores every game, so the stored result never depends on
+    the prediction.
+
+    With `wait` (Config.WRITE_BEHIND_WAIT, or wait_for_flush() per request)
+    record_guess returns once its batch has committed, which keeps the
+    durability of a direct write while sharing the commit, and answers with
+    the stored round (matched by the id its insert returned) and history
+    read back from the database. Without it, record_guess returns at once:
+    queued rounds carry no id yet and a crash loses them.
+
+    The queue is bounded; a full queue blocks callers until the flusher
+    catches up. close() (also run at interpreter exit) drains the queue
+    before the thread stops. Like CachingGameRepository, every other call is
+    passed straight to the wrapped repository; the other writes skip the
+    queue, so they may land before rounds queued earlier.
+    """
+
+    def __init__(
+        self,
+        repo: BaseGameRepository,
+        score: Callable[[str, str], Tuple[int, int]],
+        wait: bool | None = None,
+        max_queue: int | None = None,
+        batch_size: int | None = None,
+        max_delay: float | None = None,
+        name: str = "rounds",
+    ) -> None:
+        self.repo = repo
+        self.score = score
+        self.wait = Config.WRITE_BEHIND_WAIT if wait is None else wait
+        self.batch_size = batch_size or Config.WRITE_BEHIND_BATCH
+        self.max_delay = Config.WRITE_BEHIND_DELAY if max_delay is None else max_delay
+        self.name = name
+        self.max_queue = max_queue or Config.WRITE_BEHIND_QUEUE
+        self._queue: "queue.Queue[object]" = queue.Queue()
+        # Bounds the queue. Taken before a game's stripe lock, so a caller never
+        # waits for room while holding a lock the flusher needs.
+        self._slots = threading.BoundedSemaphore(self.max_queue)
+        self._stripes = [threading.Lock() for _ in range(_LOCK_STRIPES)]
+        # game id -> (predicted snapshot, its queued rounds oldest first)
+        self._pending: Dict[int, Tuple[Game, List[Tuple[PendingRound, Round]]]] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+        self.flushes = 0
+        self.rounds = 0
+        self.failed = 0
+        self.flush_seconds = 0.0    # time spent in record_rounds
+        self.latency_seconds = 0.0  # queued -> committed, summed over rounds
+        self.last_flush_seconds = 0.0
+        self._thread = threading.Thread(target=self._run, name=f"gtn-write-behind-{name}", daemon=True)
+        self._thread.start()
+        METRICS.register_queue(self)
+        ref = weakref.ref(self)
+        atexit.register(lambda: ref() is not None and ref().close())
+
+    def __getattr__(self, name: str):
+        return getattr(self.repo, name)
+
+    # --- Queue ---
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            item = self._queue.get()
+            batch: List[PendingRound] = []
+            deadline = time.monotonic() + self.max_delay
+            # A batch ends when full, when max_delay has passed, or at a flush()/close() marker
+            while isinstance(item, PendingRound):
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    item = None
+                    break
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    item = None
+            if batch:
+                self._flush(batch)
+            if isinstance(item, threading.Event):
+                item.set()  # flush(): everything queued before it is written
+            stop = item is _STOP
+        # close() stops new rounds before queueing _STOP; only flush() markers can follow it
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            if isinstance(item, threading.Event):
+                item.set()
+
+    def _flush(self, batch: List[PendingRound]) -> None:
+        t0 = time.perf_counter()
+        try:
+            results = self.repo.record_rounds([(p.game_id, p.guess) for p in batch], self.score)
+            error = None
+        except Exception as e:
+            log.exception("write-behind flush of %d rounds failed", len(batch))
+            results, error = [None] * len(batch), e
+        done = time.perf_counter()
+        with self._lock:
+            self.flushes += 1
+            self.last_flush_seconds = done - t0
+            self.flush_seconds += done - t0
+            if error is None:
+                self.rounds += len(batch)
+                self.latency_seconds += sum(done - p.queued_at for p in batch)
+            else:
+                self.failed += len(batch)
+        for p, result in zip(batch, results):
+            self._settle(p)
+            p.result, p.error = result, error
+            p.done.set()
+            self._slots.release()
+
+    def _settle(self, p: PendingRound) -> None:
+        # The stored snapshot is current again once the game's last queued round is written
+        with self._stripe(p.game_id):
+            entry = self._pending.get(p.game_id)
+            if entry is None:
+                return
+            rounds = [(q, r) for q, r in entry[1] if q is not p]
+            if rounds:
+                self._pending[p.game_id] = (entry[0], rounds)
+            else:
+                del self._pending[p.game_id]
+
+    def _stripe(self, game_id: int) -> threading.Lock:
+        return self._stripes[game_id % _LOCK_STRIPES]
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every round queued so far has been written; False on timeout."""
+        if not self._thread.is_alive():
+            return True  # closed: close() already wrote everything
+        marker = threading.Event()
+        self._queue.put(marker)
+        return marker.wait(timeout)
+
+    def close(self, timeout: float = 30.0) -> None:
+        """Stop taking rounds, write the ones queued and stop the flusher. Idempotent."""
+        # record_guess checks _closed and queues under its game's stripe lock, so
+        # once every stripe has been held no round can be queued behind _STOP
+        for stripe in self._stripes:
+            stripe.acquire()
+        try:
+            closing, self._closed = not self._closed, True
+        finally:
+            for stripe in self._stripes:
+                stripe.release()
+        if not closing:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            log.warning("write-behind flusher still busy after %.0fs; %d rounds may be lost",
+                        timeout, self._queue.qsize())
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "depth": self._queue.qsize(),
+                "max_size": self.max_queue,
+                "flushes_total": self.flushes,
+                "rounds_total": self.rounds,
+                "failed_total": self.failed,
+                "flush_seconds_total": round(self.flush_seconds, 6),
+                "last_flush_seconds": round(self.last_flush_seconds, 6),
+                "latency_seconds_total": round(self.latency_seconds, 6),
+            }
+
+    # --- Reads that see queued rounds ---
+    def get_game(self, game_id: int) -> Optional[Game]:
+        entry = self._pending.get(game_id)
+        return entry[0] if entry is not None else self.repo.get_game(game_id)
+
+    # --- Writes ---
+    def record_guess(
+        self,
+        game_id: int,
+        guess: str,
+        score: Callable[[str], Tuple[int, int]],
+        history: Optional[int] = None,
+    ) -> Optional[Tuple[Game, Round, List[Round]]]:
+        self._slots.acquire()  # blocks while the queue is full; the flusher frees the slot
+        pending = None
+        try:
+            # One guess per game at a time, so each prediction builds on the previous one
+            with self._stripe(game_id):
+                entry = self._pending.get(game_id)
+                game = entry[0] if entry is not None else self.repo.get_game(game_id)
+                if game is None:
+                    return None
+                exact, partial = score(game.answer)  # a rejected guess raises before anything is queued
+                if self._closed:
+                    raise RuntimeError("Write-behind queue is closed")
+                now = datetime.now().replace(microsecond=0)
+                predicted = after_round(game, guess, exact, now)
+                new_round = Round(id=None, game_id=game_id, guess=guess, exact_match=exact,
+                                  partial_match=partial, created_at=now)
+                pending = PendingRound(game_id, guess)
+                self._queue.put(pending)
+                queued = (entry[1] if entry is not None else []) + [(pending, new_round)]
+                self._pending[game_id] = (predicted, queued)
+        finally:
+            if pending is None:
+                self._slots.release()
+
+        wait = _wait.get()
+        if wait if wait is not None else self.wait:
+            stored = pending.wait(Config.WRITE_BEHIND_TIMEOUT)
+            if stored is None:
+                return None  # deleted before the flush
+            rounds = self.repo.list_rounds(game_id, None, history)
+            # Prefer the read-back copy, which has the database's created_at
+            stored = next((r for r in rounds if r.id == stored.id), stored)
+            return self.repo.get_game(game_id) or predicted, stored, rounds
+
+        # Provisional: queued rounds (no id yet) are newer than anything stored, so they come first.
+        # Pick the unflushed ones before reading, so one flushed meanwhile is either read back
+        # (and skipped here by the id its flush recorded) or still listed, never lost
+        unflushed = [(q, r) for q, r in reversed(queued) if not q.done.is_set()]
+        stored = self.repo.list_rounds(game_id, None, history)
+        stored_ids = {r.id for r in stored}
+        rounds = [r for q, r in unflushed if q.result is None or q.result.id not in stored_ids] + stored
+        return predicted, new_round, rounds if history is None else rounds[:history]
+
+    def _forget(self, game_ids) -> None:
+        # A write that skipped the queue makes the predicted snapshot stale
+        for gid in game_ids:
+            with self._stripe(gid):
+                self._pending.pop(gid, None)
+
+    def mark_finished(self, game_id: int) -> None:
+        try:
+            self.repo.mark_finished(game_id)
+        finally:
+            self._forget((game_id,))
+
+    def add_round(self, game_id: int, guess: str, exact: int, partial: int) -> Round:
+        try:
+            return self.repo.add_round(game_id, guess, exact, partial)
+        finally:
+            self._forget((game_id,))
+
+    def record_rounds(
+        self,
+        guesses: List[Tuple[int, str]],
+        score: Callable[[str, str], Tuple[int, int]],
+    ) -> List[Optional[Round]]:
+        try:
+            return self.repo.record_rounds(guesses, score)
+        finally:
+            self._forget({gid for gid, _ in guesses})
+
+    def record_guesses(
+        self,
+        guesses: List[Tuple[int, str]],
+        score: Callable[[str, str], Tuple[int, int]],
+    ) -> List[Optional[Tuple[int, int]]]:
+        try:
+            return self.repo.record_guesses(guesses, score)
+        finally:
+            self._forget({gid for gid, _ in guesses})
@@ -0,0 +1,37 @@
+
+from __future__ import annotations
+from typing import List, Tuple, Optional
+from Python_Apps.GTN_MVC_Example.repository.async_game_repository import AsyncGameRepository, make_async_repository
+from Python_Apps.GTN_MVC_Example.model.game import Game
+from Python_Apps.GTN_MVC_Example.model.round import Round
+from Python_Apps.GTN_MVC_Example.service.game_rules import GameRules
+
+class AsyncGameService(GameRules):
+    def __init__(self, repo: AsyncGameRepository | None = None) -> None:
+        self.repo = repo or make_async_repository()
+
+    # ---- Use cases ----
+    async def start_game(self) -> Game:
+        answer = self._generate_answer()
+        return await self.repo.create_game(answer)
+
+    async def get_game(self, game_id: int) -> Optional[Game]:
+        game = await self.repo.get_game(game_id)
+        return self._mask_answer_if_needed(game) if game else None
+
+    async def list_games(self, after_id: Optional[int] = None, limit: Optional[int] = None) -> List[Game]:
+        games = await self.repo.list_games(after_id, limit)
+        return [self._mask_answer_if_needed(g) for g in games]
+
+    async def list_rounds(self, game_id: int, since_id: Optional[int] = None, limit: Optional[int] = None) -> List[Round]:
+        return await self.repo.list_rounds(game_id, since_id, limit)
+
+    async def make_guess(self, game_id: int, guess: str, history: Optional[int] = None) -> dict:
+        def score(answer: str) -> Tuple[int, int]:
+            self._validate_guess(guess)
+            return self._calculate_matches(answer, guess)
+
+        recorded = await self.repo.record_guess(game_id, guess, score, history)
+        if not recorded:
+            raise LookupError("Game not found.")
+        return self._guess_result(*recorded)
@@ -0,0 +1,220 @@
+
+"""Bulk export and import of the game and round tables, as CSV or NDJSON.
+
+Export streams a table in id order from an unbuffered cursor (export_rows)
+and writes it chunk by chunk. Import reads the file line by line and inserts
+--chunk-size rows per transaction (import_rows), or hands a CSV to MySQL's
+LOAD DATA LOCAL INFILE with --load-data. Only one chunk is in memory at a
+time, however large the table.
+
+After every chunk, progress goes to <file>.checkpoint: the last id and the
+bytes written for an export, the bytes of input consumed for an import.
+--resume carries on from there; an interrupted export first drops whatever
+it wrote past the checkpoint, and an import replays at most one batch, whose
+ids are skipped. The checkpoint is removed once the run completes.
+
+Import games before their rounds (round.game_id is a foreign key). Import
+creates the schema if it is missing, as the migrate command would, and
+importing games rebuilds the /stats aggregates at the end. The engine is
+picked as for the app (GTN_DB_ENGINE and friends), so moving data between
+environments is an export under one set of variables and an import under
+the other.
+
+From the repository root:
+
+    python -m Python_Apps.GTN_MVC_Example.service.bulk_transfer export game games.csv
+    python -m Python_Apps.GTN_MVC_Example.service.bulk_transfer export round rounds.ndjson --resume
+    python -m Python_Apps.GTN_MVC_Example.service.bulk_transfer import game games.csv --chunk-size 5000
+"""
+from __future__ import annotations
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import argparse
+import csv
+import io
+import json
+import os
+import time
+from Python_Apps.GTN_MVC_Example.repository.base import BaseGameRepository
+from Python_Apps.GTN_MVC_Example.repository.game_repository import transfer_fields
+
+FORMATS = ("csv", "ndjson")
+CSV_NULL = "\\N"  # what LOAD DATA reads as NULL
+
+def _time(value: str) -> datetime:
+    return datetime.fromisoformat(value)
+
+# Parse one exported value per column, in GAME_FIELDS / ROUND_FIELDS order
+PARSERS: Dict[str, Tuple[Callable, ...]] = {
+    "game": (int, str, int, _time, int, str, int, _time),
+    "round": (int, int, str, int, int, _time),
+}
+
+def format_for(path: str) -> str:
+    ext = os.path.splitext(path)[1].lower()
+    return "ndjson" if ext in (".ndjson", ".jsonl") else "csv"
+
+def _cell(value):
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, bool):
+        return int(value)
+    return value
+
+def encode_rows(rows: List[tuple], fields: Sequence[str], fmt: str) -> bytes:
+    if fmt == "ndjson":
+        return "".join(
+            json.dumps(dict(zip(fields, map(_cell, row))), separators=(",", ":")) + "\n" for row in rows
+        ).encode("utf-8")
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerows([CSV_NULL if v is None else _cell(v) for v in row] for row in rows)
+    return buf.getvalue().encode("utf-8")
+
+def decode_lines(lines: List[bytes], table: str, fmt: str) -> List[tuple]:
+    fields, parsers = transfer_fields(table), PARSERS[table]
+    if fmt == "ndjson":
+        records = ([obj.get(f) for f in fields] for obj in map(json.loads, lines))
+    else:
+        records = csv.reader(line.decode("utf-8") for line in lines)
+    rows = []
+    for cells in records:
+        if len(cells) != len(fields):
+            raise ValueError(f"Expected {len(fields)} {table} columns, got {len(cells)}: {cells!r}")
+        rows.append(tuple(None if c is None or c == CSV_NULL else parse(c) for c, parse in zip(cells, parsers)))
+    return rows
+
+# --- Checkpoints ---
+def _checkpoint_path(path: str) -> str:
+    return path + ".checkpoint"
+
+def _load_checkpoint(path: str, command: str, table: str, fmt: str) -> Optional[dict]:
+    try:
+        with open(_checkpoint_path(path)) as f:
+            state = json.load(f)
+    except FileNotFoundError:
+        return None
+    if (state.get("command"), state.get("table"), state.get("format")) != (command, table, fmt):
+        raise ValueError(f"{_checkpoint_path(path)} belongs to a {state.get('command')} of "
+                         f"{state.get('table')} as {state.get('format')}; remove it to start over")
+    return state
+
+def _save_checkpoint(path: str, state: dict) -> None:
+    tmp = _checkpoint_path(path) + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp, _checkpoint_path(path))  # atomic, so a crash never leaves half a checkpoint
+
+def _clear_checkpoint(path: str) -> None:
+    try:
+        os.remove(_checkpoint_path(path))
+    except FileNotFoundError:
+        pass
+
+# --- Export / import ---
+def export_table(repo: BaseGameRepository, table: str, path: str, fmt: str,
+                 chunk_size: int = 5000, resume: bool = False) -> int:
+    """Write `table` to `path`; returns the rows in the file."""
+    fields = transfer_fields(table)
+    state = _load_checkpoint(path, "export", table, fmt) if resume else None
+    if state is None:
+        state = {"command": "export", "table": table, "format": fmt, "last_id": None, "rows": 0, "offset": 0}
+    with open(path, "r+b" if state["offset"] else "wb") as out:
+        out.seek(state["offset"])
+        out.truncate()  # drop a chunk written after the last checkpoint
+        if state["offset"] == 0 and fmt == "csv":
+            out.write((",".join(fields) + "\n").encode("utf-8"))
+        for rows in repo.export_rows(table, state["last_id"], chunk_size):
+            out.write(encode_rows(rows, fields, fmt))
+            # The checkpoint may only point at bytes that are on disk
+            out.flush()
+            os.fsync(out.fileno())
+            state.update(last_id=rows[-1][0], rows=state["rows"] + len(rows), offset=out.tell())
+            _save_checkpoint(path, state)
+    _clear_checkpoint(path)
+    return state["rows"]
+
+def import_table(repo: BaseGameRepository, table: str, path: str, fmt: str,
+                 chunk_size: int = 5000, resume: bool = False) -> Tuple[int, int]:
+    """Insert the rows of `path` into `table` in batches; returns (rows read, rows inserted)."""
+    fields = transfer_fields(table)
+    state = _load_checkpoint(path, "import", table, fmt) if resume else None
+    if state is None:
+        state = {"command": "import", "table": table, "format": fmt, "offset": 0, "rows": 0, "inserted": 0}
+    with open(path, "rb") as src:
+        offset = state["offset"]
+        src.seek(offset)
+        if offset == 0 and fmt == "csv":
+            header = src.readline()
+            offset += len(header)
+            if header.decode("utf-8").strip().split(",") != list(fields):
+                raise ValueError(f"{path}: header does not match the {table} columns {', '.join(fields)}")
+        batch: List[bytes] = []
+
+        def flush() -> None:
+            rows = decode_lines(batch, table, fmt)
+            inserted = repo.import_rows(table, rows)
+            state.update(offset=offset, rows=state["rows"] + len(rows), inserted=state["inserted"] + inserted)
+            _save_checkpoint(path, state)
+            batch.clear()
+
+        # Exported values never contain a newline, so every record is one line
+        for line in src:
+            offset += len(line)
+            if line.strip():
+                batch.append(line)
+            if len(batch) >= chunk_size:
+                flush()
+        if batch:
+            flush()
+    _clear_checkpoint(path)
+    return state["rows"], state["inserted"]
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Bulk export and import of GTN games and rounds.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name, help_text in (("export", "stream a table to a file"), ("import", "load a file into a table")):
+        cmd = sub.add_parser(name, help=help_text)
+        cmd.add_argument("table", choices=("game", "round"))
+        cmd.add_argument("path", help=".csv, or .ndjson/.jsonl for one JSON object per line")
+        cmd.add_argument("--format", choices=FORMATS, help="overrides the format implied by the file extension")
+        cmd.add_argument("--chunk-size", type=int, default=5000, help="rows per fetch, batch and checkpoint")
+        cmd.add_argument("--resume", action="store_true", help="continue from <path>.checkpoint if present")
+        if name == "import":
+            cmd.add_argument("--load-data", action="store_true",
+                             help="CSV only, MySQL: one LOAD DATA LOCAL INFILE instead of batched inserts")
+            cmd.add_argument("--no-rebuild-stats", action="store_true",
+                             help="skip rebuilding the /stats aggregates after importing games")
+    args = parser.parse_args(argv)
+    fmt = args.format or format_for(args.path)
+
+    from Python_Apps.GTN_MVC_Example.repository.factory import make_repository
+    repo = make_repository()
+    t0 = time.perf_counter()
+    if args.command == "export":
+        rows = export_table(repo, args.table, args.path, fmt, args.chunk_size, args.resume)
+        print(f"exported {rows} {args.table} rows to {args.path} in {time.perf_counter() - t0:.1f}s")
+        return
+
+    repo.ensure_schema()
+    loaded = None
+    if args.load_data:
+        if fmt != "csv":
+            parser.error("--load-data needs a CSV file")
+        # Only the MySQL engine (directly or as a replicated primary) has load_csv
+        if getattr(repo, "supports_load_data", False):
+            loaded = repo.load_csv(args.table, args.path)
+        else:
+            print(f"LOAD DATA unavailable on {type(repo).__name__}; falling back to batched inserts")
+    if loaded is not None:
+        print(f"loaded {loaded} new {args.table} rows from {args.path} in {time.perf_counter() - t0:.1f}s")
+    else:
+        rows, inserted = import_table(repo, args.table, args.path, fmt, args.chunk_size, args.resume)
+        print(f"imported {rows} {args.table} rows ({inserted} new) from {args.path} "
+              f"in {time.perf_counter() - t0:.1f}s")
+    if args.table == "game" and not args.no_rebuild_stats:
+        counters = repo.rebuild_stats(args.chunk_size)
+        print(f"rebuilt aggregates for {counters.get('games_started', 0)} games")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+
+from __future__ import annotations
+from dataclasses import replace
+from typing import List, Tuple
+import random
+from Python_Apps.GTN_MVC_Example.model.game import Game
+from Python_Apps.GTN_MVC_Example.model.round import Round
+from Python_Apps.GTN_MVC_Example.service.scoring import CODES, SCORER
+
+class GameRules:
+    """Game rules shared by the sync GameService and the AsyncGameService."""
+
+    # ---- Rules / Helpers ----
+    def _generate_answer(self) -> str:
+        # 4 distinct digits (0-9), no repeats
+        digits = [str(d) for d in range(10)]
+        random.shuffle(digits)
+        return "".join(digits[:4])
+
+    def _generate_answers(self, count: int) -> List[str]:
+        # Uniform over the 5040 valid codes, the same distribution as _generate_answer
+        return random.choices(CODES, k=count)
+
+    def _validate_guess(self, guess: str) -> None:
+        if not guess or len(guess) != 4 or not guess.isdigit():
+            raise ValueError("Guess must be a 4-digit number.")
+        if len(set(guess)) != 4:
+            raise ValueError("Digits must be unique (no repeats).")
+
+    def _calculate_matches(self, secret: str, guess: str) -> Tuple[int, int]:
+        return SCORER.score(secret, guess)
+
+    def _mask_answer_if_needed(self, game: Game) -> Game:
+        if not game.is_finished:
+            return replace(game, answer="****")
+        return game
+
+    def _guess_result(self, game: Game, new_round: Round, rounds: List[Round]) -> dict:
+        status = "WIN" if new_round.exact_match == 4 else "CONTINUE"
+
+        # Return updated game (masked if needed) and the newest `history` rounds (all if None)
+        return {
+            "status": status,
+            "game": self._mask_answer_if_needed(game),
+            "rounds": rounds,
+            "result": {"exactMatch": new_round.exact_match, "partialMatch": new_round.partial_match},
+        }
@@ -1,79 +1,132 @@
 
 from __future__ import annotations
-from typing import List, Tuple, Optional
-import random
-from Python_Apps.GTN_MVC_Example.repository.game_repository import GameRepository
+from typing import Dict, Iterator, List, Tuple, Optional
+from Python_Apps.GTN_MVC_Example.repository.base import BaseGameRepository
+from Python_Apps.GTN_MVC_Example.repository.factory import make_repository
+from Python_Apps.GTN_MVC_Example.repository.game_cache import CachingGameRepository
 from Python_Apps.GTN_MVC_Example.model.game import Game
+from Python_Apps.GTN_MVC_Example.model.leaderboard import LeaderboardEntry
 from Python_Apps.GTN_MVC_Example.model.round import Round
+from Python_Apps.GTN_MVC_Example.config import Config
+from Python_Apps.GTN_MVC_Example.service.game_rules import GameRules
+from Python_Apps.GTN_MVC_Example.service.hint_service import HintService
+from Python_Apps.GTN_MVC_Example.service.response_cache import ResponseCache
+from Python_Apps.GTN_MVC_Example.service.stats_service import StatsService
 
-class GameService:
-    def __init__(self, repo: GameRepository | None = None) -> None:
-        self.repo = repo or GameRepository()
-
-    # ---- Rules / Helpers ----
-    def _generate_answer(self) -> str:
-        # 4 distinct digits (0-9), no repeats
-        digits = [str(d) for d in range(10)]
-        random.shuffle(digits)
-        return "".join(digits[:4])
-
-    def _validate_guess(self, guess: str) -> None:
-        if not guess or len(guess) != 4 or not guess.isdigit():
-            raise ValueError("Guess must be a 4-digit number.")
-        if len(set(guess)) != 4:
-            raise ValueError("Digits must be unique (no repeats).")
-
-    def _calculate_matches(self, secret: str, guess: str) -> Tuple[int, int]:
-        exact = sum(1 for i in range(4) if guess[i] == secret[i])
-        partial = sum(1 for ch in guess if ch in secret) - exact
-        return exact, partial
-
-    def _mask_answer_if_needed(self, game: Game) -> Game:
-        if not game.is_finished:
-            return Game(id=game.id, answer="****", is_finished=game.is_finished, started_at=game.started_at)
-        return game
+class GameService(GameRules):
+    def __init__(self, repo: BaseGameRepository | None = None) -> None:
+        if repo is None:
+            repo = make_repository()
+            if Config.WRITE_BEHIND:
+                from Python_Apps.GTN_MVC_Example.repository.write_behind import WriteBehindGameRepository
+                repo = WriteBehindGameRepository(repo, self._calculate_matches)
+            repo = CachingGameRepository(repo)
+        self.repo = repo
+        self.hints = HintService(self.repo)
+        self.aggregates = StatsService(self.repo)
+        # Shared cache of serialized GET responses, invalidated below as games change
+        self.responses: ResponseCache | None = None
+        if Config.RESPONSE_CACHE_SIZE > 0:
+            self.responses = ResponseCache(Config.RESPONSE_CACHE_SIZE, Config.RESPONSE_CACHE_TTL)
+
+    def _invalidate(self, *game_ids: int) -> None:
+        if self.responses is not None:
+            self.responses.invalidate("games", *(f"game:{gid}" for gid in game_ids))
 
     # ---- Use cases ----
     def start_game(self) -> Game:
         answer = self._generate_answer()
-        return self.repo.create_game(answer)
+        game = self.repo.create_game(answer)
+        self._invalidate()
+        return game
+
+    def start_games(self, count: int) -> List[Game]:
+        """Start `count` games with one repository call; returned in id order."""
+        games = self.repo.create_games(self._generate_answers(count))
+        self._invalidate()
+        return sorted(games, key=lambda g: g.id)  # already sorted unless sharded
 
     def get_game(self, game_id: int) -> Optional[Game]:
         game = self.repo.get_game(game_id)
         return self._mask_answer_if_needed(game) if game else None
 
-    def list_games(self) -> List[Game]:
-        games = self.repo.list_games()
+    def list_games(self, after_id: Optional[int] = None, limit: Optional[int] = None) -> List[Game]:
+        games = self.repo.list_games(after_id, limit)
         return [self._mask_answer_if_needed(g) for g in games]
 
-    def list_rounds(self, game_id: int) -> List[Round]:
-        return self.repo.list_rounds(game_id)
+    def iter_games(self, after_id: Optional[int] = None) -> Iterator[Game]:
+        for g in self.repo.iter_games(after_id, Config.GAMES_STREAM_CHUNK):
+            yield self._mask_answer_if_needed(g)
 
-    def make_guess(self, game_id: int, guess: str) -> dict:
-        # Fetch actual game first (unmasked)
-        game = self.repo.get_game(game_id)
-        if not game:
-            raise LookupError("Game not found.")
+    def games_version(self) -> Tuple[int, int, int]:
+        return self.repo.games_version()
+
+    def list_rounds(self, game_id: int, since_id: Optional[int] = None, limit: Optional[int] = None) -> List[Round]:
+        return self.repo.list_rounds(game_id, since_id, limit)
 
-        self._validate_guess(guess)
-        exact, partial = self._calculate_matches(game.answer, guess)
+    def hint(self, game_id: int) -> Optional[dict]:
+        return self.hints.hint(game_id)
 
-        # Record the round
-        _ = self.repo.add_round(game_id, guess, exact, partial)
+    def stats(self) -> Dict[str, int]:
+        return self.aggregates.stats()
 
-        # If win condition
-        if exact == 4:
-            self.repo.mark_finished(game_id)
-            status = "WIN"
+    def leaderboard(self, by: str = "rounds", limit: int = 10) -> List[LeaderboardEntry]:
+        return self.aggregates.leaderboard(by, limit)
+
+    def make_guess(self, game_id: int, guess: str, history: Optional[int] = None,
+                   wait: Optional[bool] = None) -> dict:
+        """Score and record one guess.
+
+        `wait` only matters with Config.WRITE_BEHIND: True answers once the
+        round is committed, False as soon as it is queued, None per
+        Config.WRITE_BEHIND_WAIT.
+        """
+        def score(answer: str) -> Tuple[int, int]:
+            # Runs inside the repository transaction, after the game row is locked
+            self._validate_guess(guess)
+            return self._calculate_matches(answer, guess)
+
+        if wait is None:
+            recorded = self.repo.record_guess(game_id, guess, score, history)
         else:
-            status = "CONTINUE"
-
-        # Return updated game (masked if needed) and all rounds
-        masked = self.get_game(game_id)
-        rounds = self.list_rounds(game_id)
-        return {
-            "status": status,
-            "game": masked,
-            "rounds": rounds,
-            "result": {"exactMatch": exact, "partialMatch": partial},
-        }
+            from Python_Apps.GTN_MVC_Example.repository.write_behind import reset_wait, wait_for_flush
+            token = wait_for_flush(wait)
+            try:
+                recorded = self.repo.record_guess(game_id, guess, score, history)
+            finally:
+                reset_wait(token)
+        if not recorded:
+            raise LookupError("Game not found.")
+        self._invalidate(game_id)
+        return self._guess_result(*recorded)
+
+    def make_guesses(self, guesses: List[Tuple[int, str]]) -> List[dict]:
+        """Validate, score and record many (game_id, guess) pairs in one repository call.
+
+        Returns one result per pair, in order: status and matches, or an error.
+        """
+        errors: dict = {}
+        valid: List[Tuple[int, str]] = []
+        for i, (gid, guess) in enumerate(guesses):
+            try:
+                self._validate_guess(guess)
+                valid.append((gid, guess))
+            except ValueError as ve:
+                errors[i] = str(ve)
+
+        recorded = iter(self.repo.record_guesses(valid, self._calculate_matches))
+        self._invalidate(*{gid for gid, _ in valid})
+        results = []
+        for i, (gid, guess) in enumerate(guesses):
+            entry = {"gameId": gid, "guess": guess}
+            result = None if i in errors else next(recorded)
+            if i in errors:
+                entry["error"] = errors[i]
+            elif result is None:
+                entry["error"] = "Game not found"
+            else:
+                exact, partial = result
+                entry["status"] = "WIN" if exact == 4 else "CONTINUE"
+                entry["result"] = {"exactMatch": exact, "partialMatch": partial}
+            results.append(entry)
+        return results
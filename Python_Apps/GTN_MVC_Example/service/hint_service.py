@@ -0,0 +1,49 @@
+
+from __future__ import annotations
+from collections import OrderedDict
+from typing import Optional, Tuple
+import threading
+from Python_Apps.GTN_MVC_Example.config import Config
+from Python_Apps.GTN_MVC_Example.repository.base import BaseGameRepository
+from Python_Apps.GTN_MVC_Example.service.solver import SolverState, best_guess
+
+class HintService:
+    """Suggests the next guess for a game from its recorded rounds.
+
+    Solver state is cached per game (bounded LRU), and each call only folds in
+    the rounds recorded since the last one, fetched with list_rounds(since_id=...).
+    """
+
+    def __init__(self, repo: BaseGameRepository, max_games: int | None = None) -> None:
+        self.repo = repo
+        self.max_games = Config.HINT_CACHE_SIZE if max_games is None else max_games
+        self._states: "OrderedDict[int, Tuple[SolverState, threading.Lock]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _state_for(self, game_id: int) -> Tuple[SolverState, threading.Lock]:
+        with self._lock:
+            state = self._states.get(game_id)
+            if state is None:
+                state = self._states[game_id] = (SolverState(), threading.Lock())
+            self._states.move_to_end(game_id)
+            while len(self._states) > self.max_games:
+                self._states.popitem(last=False)
+            return state
+
+    def hint(self, game_id: int) -> Optional[dict]:
+        game = self.repo.get_game(game_id)
+        if not game:
+            return None
+        state, lock = self._state_for(game_id)
+        with lock:  # one game's state is only advanced by one caller at a time
+            new_rounds = self.repo.list_rounds(game_id, since_id=state.last_round_id)
+            for r in sorted(new_rounds, key=lambda r: r.id):
+                state.apply(r.guess, r.exact_match, r.partial_match, r.id)
+            suggestion = None if game.is_finished else best_guess(state)
+            return {
+                "gameId": game_id,
+                "isFinished": game.is_finished,
+                "suggestion": suggestion,
+                "remainingCandidates": len(state),
+                "roundsConsidered": state.rounds_applied,
+            }
@@ -0,0 +1,50 @@
+
+"""Per-process, lazily built services for the Flask apps.
+
+create_app() attaches a ServiceProvider rather than a built service, so
+importing the app or calling create_app() opens no connections and needs no
+database. The service is built on first use in each process: when a
+pre-forking server (gunicorn --preload) forks its workers, every worker builds
+its own repository and pool instead of inheriting the parent's sockets.
+"""
+from __future__ import annotations
+from typing import Callable, Generic, Optional, TypeVar
+import os
+import threading
+import weakref
+
+T = TypeVar("T")
+
+class ServiceProvider(Generic[T]):
+    """Builds `factory()` once per process, on the first get(), and shares it between threads."""
+
+    def __init__(self, factory: Callable[[], T]) -> None:
+        self._factory = factory
+        self._instance: Optional[T] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        if hasattr(os, "register_at_fork"):
+            ref = weakref.ref(self)
+            os.register_at_fork(after_in_child=lambda: ref() is not None and ref()._after_fork())
+
+    def _after_fork(self) -> None:
+        # The lock may have been held by a parent thread that does not exist here.
+        # The parent's instance is dropped, not closed: its sockets still belong to the parent.
+        self._lock = threading.Lock()
+        self._instance = None
+        self._pid = None
+
+    def get(self) -> T:
+        instance = self._instance
+        if instance is not None and self._pid == os.getpid():
+            return instance
+        with self._lock:
+            # The pid check also covers platforms without register_at_fork
+            if self._instance is None or self._pid != os.getpid():
+                self._instance = self._factory()
+                self._pid = os.getpid()
+            return self._instance
+
+    @property
+    def built(self) -> bool:
+        return self._instance is not None and self._pid == os.getpid()
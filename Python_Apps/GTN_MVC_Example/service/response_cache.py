@@ -0,0 +1,97 @@
+
+from __future__ import annotations
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Set, Tuple
+import threading
+import time
+
+@dataclass(slots=True)
+class CachedResponse:
+    body: bytes
+    mimetype: str
+    etag: str
+    last_modified: datetime | None = None
+    headers: Dict[str, str] = field(default_factory=dict)  # e.g. X-Next-After-Id
+
+class ResponseCache:
+    """Bounded LRU of serialized GET responses keyed by path and query string, with a TTL.
+
+    Entries carry tags ("games", "game:<id>"); GameService invalidates tags as it
+    starts games and records guesses. Invalidation only reaches this process,
+    so with several workers the TTL bounds how stale another worker's copy gets.
+
+    A response built while an invalidation ran may already be stale, so callers
+    read `generation` before loading and pass it to put(), which then skips it.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 30.0) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self._items: "OrderedDict[str, Tuple[float, CachedResponse, Tuple[str, ...]]]" = OrderedDict()
+        self._tagged: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.generation = 0  # bumped by every invalidate()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    self._drop(key)
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: str, response: CachedResponse, tags: Iterable[str], generation: int | None = None) -> None:
+        if self.max_size <= 0:
+            return
+        tags = tuple(tags)
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            if key in self._items:
+                self._drop(key)
+            self._items[key] = (time.monotonic() + self.ttl, response, tags)
+            for tag in tags:
+                self._tagged.setdefault(tag, set()).add(key)
+            while len(self._items) > self.max_size:
+                self._drop(next(iter(self._items)))
+
+    def _drop(self, key: str) -> None:
+        _, _, tags = self._items.pop(key)
+        for tag in tags:
+            keys = self._tagged.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tagged[tag]
+
+    def invalidate(self, *tags: str) -> None:
+        with self._lock:
+            self.generation += 1
+            for tag in tags:
+                for key in list(self._tagged.get(tag, ())):
+                    self._drop(key)
+                    self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._tagged.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._items),
+                "maxSize": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+            }
@@ -0,0 +1,122 @@
+
+"""Precomputed exact/partial scoring over the 5040 valid GTN codes.
+
+Every code of 4 distinct digits gets an integer index (CODES[i] / CODE_INDEX).
+A score is packed into one byte as exact * 5 + partial (0..24; see pack/unpack).
+Rows of the guess x secret score table are computed on first use and memoized;
+with NumPy installed a row is one vectorized pass over all codes, otherwise it
+falls back to array('B') rows built in Python.
+
+Scoring is symmetric for distinct-digit codes (score(a, b) == score(b, a)), so
+row(i) serves both "one guess against many secrets" and "many guesses against
+one secret".
+"""
+from __future__ import annotations
+from array import array
+from itertools import permutations
+from typing import Dict, Iterable, List, Sequence, Tuple
+import threading
+
+try:  # optional dependency: vectorized rows and a uint8 table
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without NumPy
+    np = None
+
+CODES: List[str] = ["".join(p) for p in permutations("0123456789", 4)]
+CODE_INDEX: Dict[str, int] = {code: i for i, code in enumerate(CODES)}
+N_CODES = len(CODES)  # 5040
+N_SCORES = 25         # packed scores are 0..24
+
+_MASKS = [sum(1 << int(ch) for ch in code) for code in CODES]
+_POPCOUNT = [bin(m).count("1") for m in range(1024)]
+_UNPACK: List[Tuple[int, int]] = [divmod(s, 5) for s in range(N_SCORES)]
+
+def pack(exact: int, partial: int) -> int:
+    return exact * 5 + partial
+
+def unpack(score: int) -> Tuple[int, int]:
+    return _UNPACK[score]
+
+def _score_codes(secret: str, guess: str) -> Tuple[int, int]:
+    # Original rule, kept for inputs that are not valid codes (repeated digits)
+    exact = sum(1 for i in range(4) if guess[i] == secret[i])
+    partial = sum(1 for ch in guess if ch in secret) - exact
+    return exact, partial
+
+class ScoringEngine:
+    """Thread-safe, lazily memoized score table over CODES."""
+
+    def __init__(self, use_numpy: bool = True) -> None:
+        self.use_numpy = use_numpy and np is not None
+        self._rows: Dict[int, object] = {}
+        self._lock = threading.Lock()
+        if self.use_numpy:
+            self._digits = np.array([[int(ch) for ch in code] for code in CODES], dtype=np.uint8)
+            self._masks = np.array(_MASKS, dtype=np.uint16)
+            self._popcount = np.array(_POPCOUNT, dtype=np.uint8)
+
+    # --- Single scores (GameService hot path) ---
+    def score(self, secret: str, guess: str) -> Tuple[int, int]:
+        i = CODE_INDEX.get(secret)
+        j = CODE_INDEX.get(guess)
+        if i is None or j is None:
+            return _score_codes(secret, guess)
+        return unpack(self.score_index(i, j))
+
+    def score_index(self, secret: int, guess: int) -> int:
+        row = self._rows.get(guess)
+        if row is not None:
+            return int(row[secret])
+        s, g = CODES[secret], CODES[guess]
+        exact = (s[0] == g[0]) + (s[1] == g[1]) + (s[2] == g[2]) + (s[3] == g[3])
+        return pack(exact, _POPCOUNT[_MASKS[secret] & _MASKS[guess]] - exact)
+
+    # --- Rows and the full table ---
+    def _compute_row(self, guess: int):
+        if self.use_numpy:
+            exact = (self._digits == self._digits[guess]).sum(axis=1, dtype=np.uint8)
+            common = self._popcount[self._masks & self._masks[guess]]
+            return (exact * 4 + common).astype(np.uint8)  # exact*5 + (common - exact)
+        g = CODES[guess]
+        gmask = _MASKS[guess]
+        row = array("B", bytes(N_CODES))
+        for i, s in enumerate(CODES):
+            exact = (s[0] == g[0]) + (s[1] == g[1]) + (s[2] == g[2]) + (s[3] == g[3])
+            row[i] = exact * 4 + _POPCOUNT[_MASKS[i] & gmask]
+        return row
+
+    def row(self, guess: int):
+        """Packed scores of CODES[guess] against every code (uint8 ndarray or array('B'))."""
+        row = self._rows.get(guess)
+        if row is None:
+            row = self._compute_row(guess)
+            with self._lock:
+                row = self._rows.setdefault(guess, row)
+        return row
+
+    def table(self):
+        """Materialize the full 5040 x 5040 table (about 25 MB as uint8)."""
+        if self.use_numpy:
+            return np.stack([self.row(i) for i in range(N_CODES)])
+        return [self.row(i) for i in range(N_CODES)]
+
+    # --- Batched API ---
+    def score_many(self, guess: int, secrets: Sequence[int] | None = None):
+        """Packed scores of one guess against many secrets (all codes if None)."""
+        row = self.row(guess)
+        if secrets is None:
+            return row
+        if self.use_numpy:
+            return row[np.asarray(secrets, dtype=np.intp)]
+        return array("B", (row[s] for s in secrets))
+
+    def score_guesses(self, guesses: Sequence[int], secret: int):
+        """Packed scores of many guesses against one secret."""
+        return self.score_many(secret, guesses)  # symmetric
+
+    def score_codes(self, guess: str, secrets: Iterable[str]) -> List[Tuple[int, int]]:
+        """Convenience wrapper over score_many for code strings."""
+        packed = self.score_many(CODE_INDEX[guess], [CODE_INDEX[s] for s in secrets])
+        return [_UNPACK[int(p)] for p in packed]
+
+SCORER = ScoringEngine()
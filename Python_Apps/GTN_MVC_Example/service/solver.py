@@ -0,0 +1,140 @@
+
+"""Candidate-elimination solver for GTN (Knuth-style minimax).
+
+The candidates are the codes consistent with every (guess, exact, partial) seen
+so far. Each round filters them with one vectorized row lookup from the scoring
+engine. The suggested next guess is the code whose worst-case partition of the
+remaining candidates is smallest.
+
+Offline use, from the repository root:
+
+    python -m Python_Apps.GTN_MVC_Example.service.solver --games 200
+"""
+from __future__ import annotations
+from collections import Counter
+from typing import Iterable, List, Optional, Tuple
+import argparse
+import random
+import time
+from Python_Apps.GTN_MVC_Example.service.scoring import SCORER, CODES, CODE_INDEX, N_CODES, N_SCORES, pack, np
+
+OPENING_GUESS = "0123"   # every first guess is equivalent up to relabelling digits, so skip the search
+FULL_POOL_MAX = 50       # search every code as a guess only once this few candidates remain
+
+# Second guess after OPENING_GUESS scored (exact, partial): minimax over every code,
+# worked out offline because that search over hundreds of candidates takes ~0.1 s each
+OPENING_REPLIES = {
+    (0, 0): "4567", (0, 1): "1456", (0, 2): "1204", (0, 3): "1045", (0, 4): "0231",
+    (1, 0): "0145", (1, 1): "0145", (1, 2): "0145", (1, 3): "0231",
+    (2, 0): "0245", (2, 1): "0245", (2, 2): "0124", (3, 0): "0145",
+}
+
+class SolverState:
+    """Remaining candidates for one game plus the last round folded into them."""
+
+    __slots__ = ("candidates", "last_round_id", "rounds_applied", "first_round")
+
+    def __init__(self) -> None:
+        self.candidates = np.arange(N_CODES, dtype=np.int32) if np is not None else list(range(N_CODES))
+        self.last_round_id: Optional[int] = None
+        self.rounds_applied = 0
+        self.first_round: Optional[Tuple[str, int, int]] = None
+
+    def __len__(self) -> int:
+        return len(self.candidates)
+
+    def apply(self, guess: str, exact: int, partial: int, round_id: Optional[int] = None) -> None:
+        """Keep only the candidates that would have produced this (exact, partial) for `guess`."""
+        guess_idx = CODE_INDEX.get(guess)
+        if guess_idx is not None:
+            packed = pack(exact, partial)
+            scores = SCORER.score_many(guess_idx, self.candidates)
+            if np is not None:
+                self.candidates = self.candidates[scores == packed]
+            else:
+                self.candidates = [c for c, s in zip(self.candidates, scores) if s == packed]
+        if round_id is not None:
+            self.last_round_id = round_id
+        if self.rounds_applied == 0:
+            self.first_round = (guess, exact, partial)
+        self.rounds_applied += 1
+
+    def codes(self) -> List[str]:
+        return [CODES[int(i)] for i in self.candidates]
+
+def _worst_case(guess: int, candidates) -> int:
+    scores = SCORER.score_many(guess, candidates)
+    if np is not None:
+        return int(np.bincount(scores, minlength=N_SCORES).max())
+    return max(Counter(scores).values())
+
+def _worst_cases_all_codes(candidates):
+    """_worst_case of every code as a guess, built from the candidates' rows alone.
+
+    Scores are symmetric, so column g of the candidates' rows scores guess g
+    against each of them: len(candidates) rows to compute rather than N_CODES.
+    """
+    buckets = np.stack([SCORER.row(int(c)) for c in candidates]).astype(np.intp)
+    buckets += np.arange(N_CODES, dtype=np.intp) * N_SCORES  # one bucket per (guess, score)
+    counts = np.bincount(buckets.ravel(), minlength=N_CODES * N_SCORES)
+    return counts.reshape(N_CODES, N_SCORES).max(axis=1)
+
+def best_guess(state: SolverState) -> Optional[str]:
+    """Minimax next guess; ties go to a code that could still be the answer, then the lowest code."""
+    n = len(state)
+    if n == 0:
+        return None
+    if n == 1:
+        return CODES[int(state.candidates[0])]
+    if state.rounds_applied == 0:
+        return OPENING_GUESS
+    if state.rounds_applied == 1 and state.first_round[0] == OPENING_GUESS:
+        reply = OPENING_REPLIES.get(state.first_round[1:])
+        if reply is not None:
+            return reply
+
+    if n <= FULL_POOL_MAX and np is not None:
+        keys = _worst_cases_all_codes(state.candidates) * 2 + 1
+        keys[state.candidates] -= 1  # possible answers win ties
+        return CODES[int(keys.argmin())]  # argmin keeps the lowest code among equal keys
+
+    candidate_set = {int(c) for c in state.candidates}
+    pool: Iterable[int] = range(N_CODES) if n <= FULL_POOL_MAX else sorted(candidate_set)
+    best: Tuple[int, int, int] | None = None
+    for g in pool:
+        key = (_worst_case(g, state.candidates), 0 if g in candidate_set else 1, g)
+        if best is None or key < best:
+            best = key
+    return CODES[best[2]]
+
+def solve(secret: str, max_rounds: int = 12) -> List[str]:
+    """Play a whole game offline against `secret`; returns the guesses made."""
+    state = SolverState()
+    guesses = []
+    for _ in range(max_rounds):
+        guess = best_guess(state)
+        guesses.append(guess)
+        exact, partial = SCORER.score(secret, guess)
+        if exact == 4:
+            break
+        state.apply(guess, exact, partial)
+    return guesses
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Run the GTN solver offline against random secrets.")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    t0 = time.perf_counter()
+    lengths = Counter(len(solve(rng.choice(CODES))) for _ in range(args.games))
+    elapsed = time.perf_counter() - t0
+    total = sum(k * v for k, v in lengths.items())
+    print(f"{args.games} games, {total / args.games:.2f} guesses on average, worst {max(lengths)}, "
+          f"{elapsed / args.games * 1000:.1f} ms per game")
+    for k in sorted(lengths):
+        print(f"  {k} guesses: {lengths[k]}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+
+"""Read side of the /stats and /leaderboard aggregates, and the command that rebuilds them.
+
+The repositories keep the aggregates current as rounds and wins are recorded
+(stat_counter and leaderboard, see stats_delta in repository/base.py); this
+service only caches reads of them for Config.STATS_CACHE_TTL seconds.
+
+Rebuild from the stored games, from the repository root:
+
+    python -m Python_Apps.GTN_MVC_Example.service.stats_service rebuild --chunk-size 1000
+"""
+from __future__ import annotations
+from typing import Callable, Dict, List, Tuple, TypeVar
+import argparse
+import threading
+import time
+from Python_Apps.GTN_MVC_Example.config import Config
+from Python_Apps.GTN_MVC_Example.model.leaderboard import LeaderboardEntry
+from Python_Apps.GTN_MVC_Example.repository.base import BaseGameRepository
+
+T = TypeVar("T")
+
+class StatsService:
+    """TTL-cached reads of the aggregate counters and the leaderboard."""
+
+    def __init__(self, repo: BaseGameRepository, ttl: float | None = None) -> None:
+        self.repo = repo
+        self.ttl = Config.STATS_CACHE_TTL if ttl is None else ttl
+        # Keys are ("stats",) and ("leaderboard", by, limit); limit is capped, so this stays small
+        self._cache: Dict[tuple, Tuple[float, object]] = {}
+        self._lock = threading.Lock()
+
+    def _cached(self, key: tuple, load: Callable[[], T]) -> T:
+        now = time.monotonic()
+        with self._lock:
+            hit = self._cache.get(key)
+            if hit is not None and hit[0] > now:
+                return hit[1]
+        value = load()
+        with self._lock:
+            self._cache[key] = (now + self.ttl, value)
+        return value
+
+    def stats(self) -> Dict[str, int]:
+        return self._cached(("stats",), self.repo.get_stats)
+
+    def leaderboard(self, by: str = "rounds", limit: int = 10) -> List[LeaderboardEntry]:
+        return self._cached(("leaderboard", by, limit), lambda: self.repo.leaderboard(by, limit))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Maintain the GTN /stats and /leaderboard aggregates.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rebuild = sub.add_parser("rebuild", help="recompute the aggregates from every stored game")
+    rebuild.add_argument("--chunk-size", type=int, default=1000, help="games fetched and written per chunk")
+    args = parser.parse_args(argv)
+
+    from Python_Apps.GTN_MVC_Example.repository.factory import make_repository
+    repo = make_repository()
+    t0 = time.perf_counter()
+    counters = repo.rebuild_stats(args.chunk_size)
+    print(f"rebuilt aggregates for {counters.get('games_started', 0)} games "
+          f"in {time.perf_counter() - t0:.1f}s")
+    for name in sorted(counters):
+        print(f"  {name}: {counters[name]}")
+
+if __name__ == "__main__":
+    main()
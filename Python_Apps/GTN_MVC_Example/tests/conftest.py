@@ -0,0 +1,27 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# The app is imported as Python_Apps.GTN_MVC_Example.*, which resolves from the repository root
+ROOT = Path(__file__).resolve().parents[3]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from Python_Apps.GTN_MVC_Example.repository.memory_game_repository import MemoryGameRepository  # noqa: E402
+from Python_Apps.GTN_MVC_Example.repository.sqlite_game_repository import SQLiteGameRepository  # noqa: E402
+
+@pytest.fixture
+def make_repo(tmp_path):
+    """make_repo(engine, name="gtn"): another empty repository for this test."""
+    def make(engine, name="gtn"):
+        if engine == "memory":
+            return MemoryGameRepository()
+        repo = SQLiteGameRepository(str(tmp_path / f"{name}.sqlite3"), pool_name=f"gtn_test_{name}")
+        repo.ensure_schema()
+        return repo
+    return make
+
+@pytest.fixture(params=["sqlite", "memory"])
+def repo(request, make_repo):
+    return make_repo(request.param)
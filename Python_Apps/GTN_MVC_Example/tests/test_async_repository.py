@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from Python_Apps.GTN_MVC_Example.repository.async_game_repository import AsyncSQLiteGameRepository
+from Python_Apps.GTN_MVC_Example.service.async_game_service import AsyncGameService
+
+def run(tmp_path, scenario):
+    """Run scenario(repo, service) on a fresh aiosqlite database, closing the pool on the same loop."""
+    async def main():
+        repo = AsyncSQLiteGameRepository(str(tmp_path / "gtn.sqlite3"), pool_size=4)
+        await repo.ensure_schema()
+        try:
+            return await scenario(repo, AsyncGameService(repo))
+        finally:
+            await repo.close()
+    return asyncio.run(main())
+
+def test_guess_scores_and_updates_snapshot(tmp_path):
+    async def scenario(repo, svc):
+        game = await repo.create_game("1234")
+        miss = await svc.make_guess(game.id, "1243")
+        win = await svc.make_guess(game.id, "1234")
+        return miss, win, await repo.get_game(game.id)
+
+    miss, win, stored = run(tmp_path, scenario)
+    assert miss["status"] == "CONTINUE"
+    assert miss["result"] == {"exactMatch": 2, "partialMatch": 2}
+    assert miss["game"].answer == "****"
+    assert win["status"] == "WIN"
+    assert win["game"].answer == "1234"
+    assert (stored.round_count, stored.last_guess, stored.best_exact, stored.is_finished) == (2, "1234", 4, True)
+
+def test_history_is_newest_first_and_limited(tmp_path):
+    async def scenario(repo, svc):
+        game = await repo.create_game("1234")
+        for guess in ("5678", "0123", "4567"):
+            await svc.make_guess(game.id, guess)
+        last = await svc.make_guess(game.id, "9012", history=2)
+        return last, await svc.list_rounds(game.id), await svc.list_rounds(game.id, limit=1)
+
+    last, rounds, newest = run(tmp_path, scenario)
+    assert [r.guess for r in last["rounds"]] == ["9012", "4567"]
+    assert [r.guess for r in rounds] == ["9012", "4567", "0123", "5678"]
+    assert [r.id for r in rounds] == sorted((r.id for r in rounds), reverse=True)
+    assert newest == rounds[:1]
+
+def test_concurrent_guesses_are_all_recorded(tmp_path):
+    guesses = ["5678", "0123", "4567", "9012", "3456", "7890", "2345", "6789"] * 3
+
+    async def scenario(repo, svc):
+        game = await repo.create_game("1234")
+        results = await asyncio.gather(*(svc.make_guess(game.id, g) for g in guesses))
+        return results, await repo.get_game(game.id), await svc.list_rounds(game.id)
+
+    results, stored, rounds = run(tmp_path, scenario)
+    assert len(results) == len(guesses)
+    assert stored.round_count == len(guesses)
+    assert len({r.id for r in rounds}) == len(guesses)
+    assert sorted(r.guess for r in rounds) == sorted(guesses)
+
+def test_unknown_game_and_invalid_guess(tmp_path):
+    async def scenario(repo, svc):
+        game = await repo.create_game("1234")
+        with pytest.raises(LookupError):
+            await svc.make_guess(game.id + 1, "1234")
+        with pytest.raises(ValueError):
+            await svc.make_guess(game.id, "1123")
+        return await repo.get_game(game.id)
+
+    assert run(tmp_path, scenario).round_count == 0
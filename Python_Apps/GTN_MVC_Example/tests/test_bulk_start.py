@@ -0,0 +1,64 @@
+import pytest
+
+from Python_Apps.GTN_MVC_Example.app import create_app
+from Python_Apps.GTN_MVC_Example.config import Config
+from Python_Apps.GTN_MVC_Example.repository.sharded_repository import ShardedGameRepository, shard_index
+from Python_Apps.GTN_MVC_Example.repository.sqlite_game_repository import SQLiteGameRepository
+from Python_Apps.GTN_MVC_Example.service.game_service import GameService
+
+STRIDE = 4
+
+def client_for(repo):
+    svc = GameService(repo)
+    return create_app(lambda: svc).test_client()
+
+@pytest.fixture
+def sharded(tmp_path):
+    shards = []
+    for i in range(3):
+        shard = SQLiteGameRepository(str(tmp_path / f"shard{i}.sqlite3"), pool_name=f"gtn_test_shard{i}",
+                                     shard=(i, STRIDE))
+        shard.ensure_schema()
+        shards.append(shard)
+    return ShardedGameRepository(shards, STRIDE)
+
+def test_create_games_returns_ids_in_input_order(repo):
+    answers = ["1234", "5678", "0123", "4567"]
+    games = repo.create_games(answers)
+    assert [g.answer for g in games] == answers
+    assert [g.id for g in games] == list(range(games[0].id, games[0].id + len(answers)))
+    assert [repo.get_game(g.id).answer for g in games] == answers
+    assert repo.create_games([]) == []
+
+def test_start_count_creates_consecutive_games(repo):
+    client = client_for(repo)
+    first = client.post("/start").get_json()["gameId"]
+    resp = client.post("/start?count=5")
+    assert resp.status_code == 201
+    body = resp.get_json()
+    assert body["gameIds"] == list(range(first + 1, first + 6))
+    assert (body["count"], body["firstGameId"], body["lastGameId"], body["contiguous"]) == (5, first + 1, first + 5, True)
+    for gid in body["gameIds"]:
+        game = client.get(f"/game/{gid}").get_json()
+        assert not game["isFinished"] and game["answer"] == "****"
+
+@pytest.mark.parametrize("count", ["0", "-1", "x", "2.5"])
+def test_start_count_must_be_a_positive_integer(repo, count):
+    resp = client_for(repo).post(f"/start?count={count}")
+    assert resp.status_code == 400
+    assert repo.list_games() == []
+
+def test_start_count_is_capped(repo, monkeypatch):
+    monkeypatch.setattr(Config, "START_BATCH_MAX", 3)
+    client = client_for(repo)
+    assert client.post("/start?count=4").status_code == 400
+    assert client.post("/start?count=3").get_json()["count"] == 3
+
+def test_sharded_start_returns_ids_in_order(sharded):
+    body = client_for(sharded).post("/start?count=7").get_json()
+    ids = body["gameIds"]
+    assert ids == sorted(ids) and len(set(ids)) == 7
+    assert not body["contiguous"]
+    assert {shard_index(gid, STRIDE) for gid in ids} == {0, 1, 2}
+    for gid in ids:
+        assert sharded.shard_for(gid).get_game(gid) is not None
@@ -0,0 +1,82 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from Python_Apps.GTN_MVC_Example.service.game_service import GameService
+from Python_Apps.GTN_MVC_Example.service.scoring import SCORER
+
+GUESSES = ["5678", "0123", "4567", "9012", "3456", "7890", "2345", "6789"]
+
+def score_for(guess):
+    return lambda answer: SCORER.score(answer, guess)
+
+class _TrackedConnection:
+    def __init__(self, conn, calls):
+        self._conn = conn
+        self._calls = calls
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def commit(self):
+        self._calls.append("commit")
+        return self._conn.commit()
+
+@pytest.fixture
+def sqlite_calls(make_repo, monkeypatch):
+    """A SQLite repository whose connection checkouts and commits are logged."""
+    repo = make_repo("sqlite")
+    calls = []
+    checkout = repo._conn
+
+    def tracked():
+        calls.append("checkout")
+        return _TrackedConnection(checkout(), calls)
+
+    monkeypatch.setattr(repo, "_conn", tracked)
+    return repo, calls
+
+def test_guess_is_one_checkout_and_one_commit(sqlite_calls):
+    repo, calls = sqlite_calls
+    svc = GameService(repo)
+    game = repo.create_game("1234")
+    calls.clear()
+    result = svc.make_guess(game.id, "1243")
+    assert calls == ["checkout", "commit"]
+    assert result["result"] == {"exactMatch": 2, "partialMatch": 2}
+    assert [r.guess for r in result["rounds"]] == ["1243"]
+
+    calls.clear()
+    with pytest.raises(LookupError):
+        svc.make_guess(game.id + 1000, "1243")
+    assert calls == ["checkout"]  # rolled back, nothing committed
+
+def test_record_guess_returns_snapshot_round_and_history(repo):
+    game = repo.create_game("1234")
+    repo.record_guess(game.id, "1243", score_for("1243"))
+    updated, new_round, history = repo.record_guess(game.id, "1234", score_for("1234"), 1)
+    assert (new_round.exact_match, new_round.partial_match) == (4, 0)
+    assert [r.id for r in history] == [new_round.id]
+    assert (updated.round_count, updated.best_exact, updated.is_finished) == (2, 4, True)
+    assert [r.guess for r in repo.list_rounds(game.id)] == ["1234", "1243"]
+    assert repo.get_game(game.id).is_finished
+    assert repo.record_guess(game.id + 1000, "1234", score_for("1234")) is None
+
+def test_rejected_guess_writes_nothing(repo):
+    svc = GameService(repo)
+    game = repo.create_game("1234")
+    with pytest.raises(ValueError):
+        svc.make_guess(game.id, "1123")
+    with pytest.raises(ValueError):
+        svc.make_guess(game.id, "12a4")
+    assert repo.list_rounds(game.id) == []
+    assert repo.get_game(game.id).round_count == 0
+
+def test_concurrent_guesses_on_one_game(repo):
+    game = repo.create_game("1234")
+    guesses = GUESSES * 4
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda g: repo.record_guess(game.id, g, score_for(g)), guesses))
+    assert repo.get_game(game.id).round_count == len(guesses)
+    assert len({r.id for r in repo.list_rounds(game.id)}) == len(guesses)
+    assert repo.get_stats()["rounds"] == len(guesses)
@@ -0,0 +1,48 @@
+import pytest
+
+from Python_Apps.GTN_MVC_Example.app import create_app
+from Python_Apps.GTN_MVC_Example.config import Config
+from Python_Apps.GTN_MVC_Example.service.game_service import GameService
+from Python_Apps.GTN_MVC_Example.service.scoring import SCORER
+
+@pytest.fixture
+def client(repo):
+    svc = GameService(repo)
+    return create_app(lambda: svc).test_client()
+
+def test_record_guesses_scores_in_input_order(repo):
+    a, b = repo.create_game("1234"), repo.create_game("5678")
+    missing = b.id + 1000
+    pairs = [(b.id, "5678"), (missing, "1234"), (a.id, "1243"), (a.id, "1234")]
+    assert repo.record_guesses(pairs, SCORER.score) == [(4, 0), None, (2, 2), (4, 0)]
+    assert [r.guess for r in repo.list_rounds(a.id)] == ["1234", "1243"]
+    assert repo.get_game(a.id).is_finished and repo.get_game(b.id).is_finished
+    assert repo.record_guesses([], SCORER.score) == []
+
+def test_post_guesses_answers_each_guess_in_order(repo, client):
+    game = repo.create_game("1234")
+    body = [{"gameId": game.id, "guess": "1243"}, [game.id, "1123"], [game.id + 1000, "1234"], [game.id, "1234"]]
+    resp = client.post("/guesses", json=body)
+    assert resp.status_code == 200
+    first, invalid, missing, win = resp.get_json()
+    assert first == {"gameId": game.id, "guess": "1243", "status": "CONTINUE",
+                     "result": {"exactMatch": 2, "partialMatch": 2}}
+    assert "error" in invalid and "error" in missing
+    assert (win["status"], win["result"]) == ("WIN", {"exactMatch": 4, "partialMatch": 0})
+    assert [r.guess for r in repo.list_rounds(game.id)] == ["1234", "1243"]
+
+@pytest.mark.parametrize("body", [
+    {"gameId": 1, "guess": "1234"},
+    [[True, "1234"]],
+    [{"gameId": "1", "guess": "1234"}],
+    [[1, 1234]],
+    [[1, "1234", "extra"]],
+])
+def test_post_guesses_rejects_malformed_bodies(repo, client, body):
+    repo.create_game("1234")
+    assert client.post("/guesses", json=body).status_code == 400
+    assert repo.list_rounds(1) == []
+
+def test_post_guesses_caps_the_batch(client, monkeypatch):
+    monkeypatch.setattr(Config, "GUESS_BATCH_MAX", 2)
+    assert client.post("/guesses", json=[[1, "1234"]] * 3).status_code == 400
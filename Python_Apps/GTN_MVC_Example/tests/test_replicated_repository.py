@@ -0,0 +1,105 @@
+import time
+
+import pytest
+
+from Python_Apps.GTN_MVC_Example.repository.memory_game_repository import MemoryGameRepository
+from Python_Apps.GTN_MVC_Example.repository.replicated_repository import (
+    LAG_GRANULARITY, ReplicatedGameRepository, begin_session, end_session,
+)
+from Python_Apps.GTN_MVC_Example.service.scoring import SCORER
+
+def replica(lag=0.0):
+    """A memory engine standing in for a replica; it only has what a test copies into it."""
+    repo = MemoryGameRepository()
+    repo.replication_lag = lambda: lag
+    return repo
+
+@pytest.fixture
+def session():
+    token = begin_session()
+    yield
+    end_session(token)
+
+def make_router(*replicas, max_lag=5.0):
+    # check_every=0: every read re-probes the lag, so tests can change it between reads
+    return ReplicatedGameRepository(MemoryGameRepository(), list(replicas), max_lag=max_lag, check_every=0)
+
+def test_reads_go_to_a_replica_that_is_caught_up(session):
+    router = make_router(replica())
+    router.primary.create_game("1234")  # straight to the primary: nothing to read back
+    assert router.list_games() == []   # the replica's (empty) copy
+    assert router.stats()["reads"] == {"primary": 0, "replica0": 1}
+
+def test_session_reads_its_own_writes_from_the_primary(session):
+    router = make_router(replica())
+    game = router.create_game("1234")
+    router.record_guess(game.id, "1243", lambda answer: SCORER.score(answer, "1243"))
+    assert router.get_game(game.id).round_count == 1
+    assert [g.id for g in router.list_games()] == [game.id]
+    assert router.stats()["reads"] == {"primary": 2, "replica0": 0}
+
+def test_recent_write_from_an_earlier_request_is_read_back():
+    router = make_router(replica())
+    token = begin_session()
+    game = router.create_game("1234")
+    end_session(token)
+    # A later request carrying the write's time (the gtn_last_write cookie)
+    token = begin_session(last_write=time.time())
+    try:
+        assert [g.id for g in router.list_games()] == [game.id]
+    finally:
+        end_session(token)
+    # Any request reading that game goes to the primary until the replica can have it
+    token = begin_session()
+    try:
+        assert router.get_game(game.id) is not None
+        assert router.list_games() == []
+    finally:
+        end_session(token)
+    assert router.stats()["reads"] == {"primary": 2, "replica0": 1}
+
+def test_write_older_than_the_lag_reads_from_the_replica():
+    router = make_router(replica(lag=0.0))
+    token = begin_session(last_write=time.time() - LAG_GRANULARITY - 1)
+    try:
+        router.list_games()
+    finally:
+        end_session(token)
+    assert router.stats()["reads"]["replica0"] == 1
+
+@pytest.mark.parametrize("lag", [30.0, None])
+def test_lagging_or_unknown_replica_falls_back_to_primary(session, lag):
+    router = make_router(replica(lag=lag))
+    router.primary.create_game("1234")
+    assert len(router.list_games()) == 1
+    assert router.stats()["reads"] == {"primary": 1, "replica0": 0}
+
+def test_failed_lag_probe_skips_the_replica(session):
+    broken = replica()
+    def probe():
+        raise ConnectionError("replica unreachable")
+    broken.replication_lag = probe
+    router = make_router(broken)
+    router.list_games()
+    assert router.stats()["reads"]["primary"] == 1
+    assert router.stats()["lag"]["replica0"] is None
+
+def test_failed_replica_read_is_retried_on_primary(session):
+    broken = replica()
+    def fail(*args):
+        raise ConnectionError("replica went away")
+    broken.list_games = fail
+    router = make_router(broken)
+    router.primary.create_game("1234")
+    assert len(router.list_games()) == 1
+    stats = router.stats()
+    assert stats["fallbacks"] == 1
+    assert stats["reads"] == {"primary": 1, "replica0": 0}
+
+def test_session_stays_on_the_replica_it_picked(session):
+    router = make_router(replica(), replica())
+    for _ in range(4):
+        router.list_games()
+    reads = router.stats()["reads"]
+    assert reads["primary"] == 0
+    assert sorted(reads.values()) == [0, 0, 4]
@@ -0,0 +1,63 @@
+import pytest
+
+from Python_Apps.GTN_MVC_Example.service.scoring import SCORER
+
+def score_for(guess):
+    return lambda answer: SCORER.score(answer, guess)
+
+def test_create_and_get(repo):
+    game = repo.create_game("1234")
+    stored = repo.get_game(game.id)
+    assert (stored.id, stored.answer, stored.is_finished, stored.round_count) == (game.id, "1234", False, 0)
+    assert repo.get_game(game.id + 1000) is None
+
+def test_list_games_pages_newest_first(repo):
+    ids = [g.id for g in repo.create_games(["1234"] * 7)]
+    first = repo.list_games(limit=3)
+    second = repo.list_games(after_id=first[-1].id, limit=3)
+    assert [g.id for g in first + second] == ids[::-1][:6]
+    assert [g.id for g in repo.iter_games(chunk_size=2)] == ids[::-1]
+
+def test_list_rounds_since_and_limit(repo):
+    game = repo.create_game("1234")
+    for guess in ("5678", "0123", "4567", "9012"):
+        repo.record_guess(game.id, guess, score_for(guess))
+    rounds = repo.list_rounds(game.id)
+    assert [r.guess for r in rounds] == ["9012", "4567", "0123", "5678"]
+    assert repo.list_rounds(game.id, since_id=rounds[2].id) == rounds[:2]
+    assert repo.list_rounds(game.id, limit=3) == rounds[:3]
+    assert repo.list_rounds(game.id, since_id=rounds[0].id) == []
+
+def test_record_rounds_returns_ids_in_input_order(repo):
+    a, b = repo.create_games(["1234", "5678"])
+    missing = b.id + 1000
+    rounds = repo.record_rounds([(b.id, "5678"), (missing, "1234"), (a.id, "1243")], SCORER.score)
+    assert rounds[1] is None
+    assert [(r.game_id, r.exact_match, r.partial_match) for r in (rounds[0], rounds[2])] == [(b.id, 4, 0), (a.id, 2, 2)]
+    assert repo.list_rounds(b.id)[0].id == rounds[0].id
+    assert repo.list_rounds(a.id)[0].id == rounds[2].id
+    assert repo.record_guesses([(a.id, "1234"), (missing, "1234")], SCORER.score) == [(4, 0), None]
+
+def test_stats_and_leaderboard_match_a_rebuild(repo):
+    games = repo.create_games(["1234", "5678", "0123"])
+    for guess in ("5678", "1234"):
+        repo.record_guess(games[0].id, guess, score_for(guess))
+    repo.record_guess(games[1].id, "5678", score_for("5678"))
+    repo.mark_finished(games[2].id)
+    stats = repo.get_stats()
+    assert (stats["games_started"], stats["games_finished"], stats["games_won"], stats["rounds"]) == (3, 3, 2, 3)
+    board = repo.leaderboard("rounds", 10)
+    assert [(e.game_id, e.rounds) for e in board] == [(games[1].id, 1), (games[0].id, 2)]
+    assert repo.rebuild_stats() == stats
+
+@pytest.mark.parametrize("target", ["sqlite", "memory"])
+def test_export_import_round_trip(repo, target, make_repo):
+    games = repo.create_games(["1234", "5678"])
+    repo.record_guesses([(games[0].id, "1243"), (games[1].id, "5678"), (games[0].id, "1234")], SCORER.score)
+    copy = make_repo(target, "copy")
+    for table in ("game", "round"):
+        for chunk in repo.export_rows(table, chunk_size=2):
+            copy.import_rows(table, chunk)
+    for table in ("game", "round"):
+        assert list(copy.export_rows(table)) == list(repo.export_rows(table))
+    assert copy.rebuild_stats() == repo.get_stats()
@@ -0,0 +1,52 @@
+import random
+
+import pytest
+
+from Python_Apps.GTN_MVC_Example.service.game_rules import GameRules
+from Python_Apps.GTN_MVC_Example.service.scoring import (
+    CODES, CODE_INDEX, N_CODES, SCORER, ScoringEngine, np, pack, unpack,
+)
+
+def reference_matches(secret, guess):
+    # GameService._calculate_matches before the scoring table replaced it
+    exact = sum(1 for i in range(4) if guess[i] == secret[i])
+    partial = sum(1 for ch in guess if ch in secret) - exact
+    return exact, partial
+
+GUESSES = random.Random(11).sample(CODES, 40) + ["0123", "9876"]
+
+def test_codes_are_every_distinct_digit_code():
+    assert N_CODES == len(set(CODES)) == 5040
+    assert all(len(set(code)) == 4 for code in CODES)
+    assert all(CODE_INDEX[code] == i for i, code in enumerate(CODES))
+
+def test_pack_round_trips():
+    for exact in range(5):
+        for partial in range(5 - exact):
+            assert unpack(pack(exact, partial)) == (exact, partial)
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_rows_match_the_original_calculation(use_numpy):
+    engine = ScoringEngine(use_numpy=use_numpy)
+    for guess in GUESSES:
+        row = engine.score_many(CODE_INDEX[guess])
+        assert [unpack(int(s)) for s in row] == [reference_matches(secret, guess) for secret in CODES]
+
+def test_single_scores_match_the_original_calculation():
+    rules = GameRules()
+    for guess in GUESSES:
+        for secret in random.Random(guess).sample(CODES, 50):
+            assert SCORER.score(secret, guess) == reference_matches(secret, guess)
+            assert rules._calculate_matches(secret, guess) == reference_matches(secret, guess)
+    # Codes outside the table still score the original way
+    assert SCORER.score("1123", "1234") == reference_matches("1123", "1234")
+
+def test_score_many_subsets_and_symmetry():
+    guess = CODE_INDEX["0123"]
+    secrets = [CODE_INDEX[c] for c in ("0123", "3210", "4567", "0145")]
+    assert [unpack(int(s)) for s in SCORER.score_many(guess, secrets)] == [(4, 0), (0, 4), (0, 0), (2, 0)]
+    assert list(SCORER.score_guesses(secrets, guess)) == list(SCORER.score_many(guess, secrets))
+
+@pytest.mark.skipif(np is None, reason="needs NumPy")
+def test_numpy_row_is_uint8():
+    assert SCORER.row(0).dtype == np.uint8
@@ -0,0 +1,103 @@
+import pytest
+
+from Python_Apps.GTN_MVC_Example.repository.sharded_repository import ShardedGameRepository, shard_index
+from Python_Apps.GTN_MVC_Example.repository.sqlite_game_repository import SQLiteGameRepository
+from Python_Apps.GTN_MVC_Example.service.scoring import SCORER
+
+STRIDE = 4
+
+@pytest.fixture
+def sharded(tmp_path):
+    shards = []
+    for i in range(3):
+        shard = SQLiteGameRepository(str(tmp_path / f"shard{i}.sqlite3"), pool_name=f"gtn_test_shard{i}",
+                                     shard=(i, STRIDE))
+        shard.ensure_schema()
+        shards.append(shard)
+    return ShardedGameRepository(shards, STRIDE)
+
+def test_ids_name_their_shard(sharded):
+    games = [sharded.create_game("1234") for _ in range(6)] + sharded.create_games(["5678"] * 7)
+    assert len({g.id for g in games}) == len(games)
+    for i, shard in enumerate(sharded.shards):
+        ids = [g.id for g in shard.list_games()]
+        assert ids and all(gid % STRIDE == i + 1 for gid in ids)
+    for game in games:
+        assert sharded.shard_for(game.id) is sharded.shards[shard_index(game.id, STRIDE)]
+        assert sharded.get_game(game.id).answer == game.answer
+
+def test_round_ids_are_strided_like_game_ids(sharded):
+    games = sharded.create_games(["1234"] * 6)
+    rounds = sharded.record_rounds([(g.id, "5678") for g in games] * 2, SCORER.score)
+    assert len({r.id for r in rounds}) == len(rounds)
+    for rnd in rounds:
+        assert shard_index(rnd.id, STRIDE) == shard_index(rnd.game_id, STRIDE)
+        assert sharded.list_rounds(rnd.game_id)[0].game_id == rnd.game_id
+
+def test_unroutable_ids_find_nothing(sharded):
+    sharded.create_games(["1234"] * 3)
+    orphan = STRIDE  # id % STRIDE == 0 names shard 3, which does not exist
+    assert sharded.shard_for(orphan) is None
+    assert sharded.get_game(orphan) is None
+    assert sharded.list_rounds(orphan) == []
+    with pytest.raises(LookupError):
+        sharded.add_round(orphan, "1234", 4, 0)
+
+def test_batches_keep_input_order(sharded):
+    answers = ["1234", "5678", "0123", "4567", "9012"]
+    games = sharded.create_games(answers)
+    assert [g.answer for g in games] == answers
+    pairs = [(games[3].id, "4567"), (STRIDE, "1234"), (games[0].id, "1243"), (games[4].id, "5678")]
+    assert sharded.record_guesses(pairs, SCORER.score) == [(4, 0), None, (2, 2), (0, 0)]
+
+def test_list_games_merges_newest_first(sharded):
+    ids = sorted(g.id for g in sharded.create_games(["1234"] * 10))
+    newest_first = ids[::-1]
+    assert [g.id for g in sharded.list_games()] == newest_first
+    first = sharded.list_games(limit=4)
+    second = sharded.list_games(after_id=first[-1].id, limit=4)
+    assert [g.id for g in first + second] == newest_first[:8]
+    assert [g.id for g in sharded.iter_games(chunk_size=3)] == newest_first
+
+def test_export_rows_merges_ascending_and_rechunks(sharded):
+    games = sharded.create_games(["1234"] * 8)
+    sharded.record_rounds([(g.id, "5678") for g in games], SCORER.score)
+    for table in ("game", "round"):
+        chunks = list(sharded.export_rows(table, chunk_size=3))
+        ids = [row[0] for chunk in chunks for row in chunk]
+        assert ids == sorted(ids) and len(ids) == 8
+        assert [len(c) for c in chunks] == [3, 3, 2]
+    after = sorted(g.id for g in games)[4]
+    assert [row[0] for chunk in sharded.export_rows("game", after) for row in chunk] == sorted(g.id for g in games)[5:]
+
+def test_aggregates_merge_across_shards(sharded):
+    games = sharded.create_games(["1234", "5678", "0123"])
+    wins = {games[0].id: ["1243", "2143", "1234"], games[1].id: ["5678"], games[2].id: ["3210", "0123"]}
+    for gid, guesses in wins.items():
+        for guess in guesses:
+            sharded.record_guess(gid, guess, lambda answer, g=guess: SCORER.score(answer, g))
+    stats = sharded.get_stats()
+    assert (stats["games_started"], stats["games_won"], stats["rounds"]) == (3, 3, 6)
+    board = sharded.leaderboard("rounds", 2)
+    assert [(e.game_id, e.rounds) for e in board] == [(games[1].id, 1), (games[2].id, 2)]
+    assert sharded.games_version() == (max(g.id for g in games), 3, 6)
+    assert sharded.rebuild_stats() == stats
+
+def test_import_rows_route_by_game_id(sharded, tmp_path):
+    games = sharded.create_games(["1234"] * 5)
+    sharded.record_rounds([(g.id, "5678") for g in games], SCORER.score)
+    copy = ShardedGameRepository([
+        SQLiteGameRepository(str(tmp_path / f"copy{i}.sqlite3"), pool_name=f"gtn_test_copy{i}", shard=(i, STRIDE))
+        for i in range(3)
+    ], STRIDE)
+    copy.ensure_schema()
+    for table in ("game", "round"):
+        for chunk in sharded.export_rows(table):
+            copy.import_rows(table, chunk)
+    for i, shard in enumerate(copy.shards):
+        assert [g.id for g in shard.list_games()] == [g.id for g in sharded.shards[i].list_games()]
+    assert list(copy.export_rows("round")) == list(sharded.export_rows("round"))
+
+def test_more_shards_than_the_stride_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        ShardedGameRepository([SQLiteGameRepository(str(tmp_path / "one.sqlite3"))] * 3, 2)
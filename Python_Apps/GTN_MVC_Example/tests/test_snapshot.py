@@ -0,0 +1,71 @@
+from datetime import datetime
+
+from Python_Apps.GTN_MVC_Example.model.game import Game
+from Python_Apps.GTN_MVC_Example.repository.game_cache import CachingGameRepository, GameCache
+from Python_Apps.GTN_MVC_Example.service.scoring import SCORER
+
+def score_for(guess):
+    return lambda answer: SCORER.score(answer, guess)
+
+def assert_snapshot_matches_rounds(repo, game_id, marked_finished=False):
+    game = repo.get_game(game_id)
+    rounds = repo.list_rounds(game_id)  # newest first
+    assert game.round_count == len(rounds)
+    assert game.last_guess == (rounds[0].guess if rounds else None)
+    assert game.best_exact == max((r.exact_match for r in rounds), default=0)
+    won = any(r.exact_match == 4 for r in rounds)
+    assert game.is_finished == (won or marked_finished)
+    assert (game.finished_at is not None) == game.is_finished
+
+def test_snapshot_follows_each_kind_of_write(repo):
+    played, batched, added, marked, fresh = (repo.create_game(a) for a in ("1234", "5678", "0123", "4567", "9012"))
+    for guess in ("5678", "1243", "1234", "4321"):  # keeps counting after the win
+        repo.record_guess(played.id, guess, score_for(guess))
+    repo.record_guesses([(batched.id, "5687"), (batched.id, "0123"), (played.id, "1235")], SCORER.score)
+    repo.add_round(added.id, "0132", 2, 2)
+    repo.add_round(added.id, "0123", 4, 0)
+    repo.record_guess(marked.id, "4576", score_for("4576"))
+    repo.mark_finished(marked.id)
+
+    for game in (played, batched, added, fresh):
+        assert_snapshot_matches_rounds(repo, game.id)
+    assert_snapshot_matches_rounds(repo, marked.id, marked_finished=True)
+    assert repo.get_game(played.id).round_count == 5
+
+def test_record_guess_returns_the_stored_snapshot(repo):
+    game = repo.create_game("1234")
+    for guess in ("5678", "1243"):
+        snapshot, _, _ = repo.record_guess(game.id, guess, score_for(guess))
+        assert snapshot == repo.get_game(game.id)
+
+def game(round_count, is_finished=False):
+    return Game(id=1, answer="1234", is_finished=is_finished, started_at=datetime(2024, 1, 1),
+                round_count=round_count)
+
+def test_cache_never_goes_back_to_an_older_snapshot():
+    cache = GameCache(max_size=10, ttl=60)
+    cache.put(game(2))
+    cache.put(game(1))
+    assert cache.get(1).round_count == 2
+    cache.put(game(2, is_finished=True))
+    cache.put(game(2))
+    assert cache.get(1).is_finished
+
+def test_cache_skips_snapshots_read_before_an_invalidation():
+    cache = GameCache(max_size=10, ttl=60)
+    generation = cache.generation
+    cache.invalidate(1)
+    cache.put(game(1), generation)
+    assert cache.get(1) is None
+    cache.put(game(1), cache.generation)
+    assert cache.get(1).round_count == 1
+
+def test_caching_repository_serves_the_newest_snapshot(repo):
+    cached = CachingGameRepository(repo, GameCache(max_size=10, ttl=60))
+    game = cached.create_game("1234")
+    cached.record_guess(game.id, "5678", score_for("5678"))
+    assert cached.get_game(game.id).round_count == 1
+    cached.record_guesses([(game.id, "1243")], SCORER.score)
+    assert cached.get_game(game.id).round_count == 2
+    cached.mark_finished(game.id)
+    assert cached.get_game(game.id).is_finished
@@ -0,0 +1,116 @@
+import pytest
+
+from Python_Apps.GTN_MVC_Example.app import create_app
+from Python_Apps.GTN_MVC_Example.config import Config
+from Python_Apps.GTN_MVC_Example.repository.write_behind import WriteBehindGameRepository, WriteBehindTimeout
+from Python_Apps.GTN_MVC_Example.service.game_service import GameService
+from Python_Apps.GTN_MVC_Example.service.scoring import SCORER
+
+def score_for(guess):
+    return lambda answer: SCORER.score(answer, guess)
+
+@pytest.fixture
+def write_behind(repo):
+    """write_behind(**options): a WriteBehindGameRepository over `repo`, closed after the test."""
+    queues = []
+
+    def make(**options):
+        wb = WriteBehindGameRepository(repo, SCORER.score, **options)
+        queues.append(wb)
+        return wb
+
+    yield make
+    for wb in queues:
+        wb.close()
+
+def test_group_commit_writes_a_batch_in_one_flush(repo, write_behind):
+    wb = write_behind(wait=False, max_delay=5.0)
+    games = [repo.create_game("1234") for _ in range(4)]
+    for g in games:
+        for guess in ("5678", "1243"):
+            wb.record_guess(g.id, guess, score_for(guess))
+    assert wb.flushes == 0 and repo.list_rounds(games[0].id) == []
+    assert wb.flush(timeout=5)
+    assert (wb.flushes, wb.rounds) == (1, 8)
+    for g in games:
+        assert [r.guess for r in repo.list_rounds(g.id)] == ["1243", "5678"]
+        assert repo.get_game(g.id).round_count == 2
+
+def test_batches_are_written_in_queue_order(repo, write_behind):
+    wb = write_behind(wait=False, max_delay=5.0, batch_size=3)
+    game = repo.create_game("1234")
+    guesses = ["5678", "0123", "4567", "9012", "3456", "7890", "1243"]
+    for guess in guesses:
+        wb.record_guess(game.id, guess, score_for(guess))
+    assert wb.flush(timeout=5)
+    assert wb.flushes == 3
+    rounds = repo.list_rounds(game.id)
+    assert [r.guess for r in rounds] == guesses[::-1]
+    assert [r.id for r in rounds] == sorted((r.id for r in rounds), reverse=True)
+
+def test_waiting_guess_answers_with_the_stored_round(repo, write_behind):
+    wb = write_behind(wait=True)
+    game = repo.create_game("1234")
+    wb.record_guess(game.id, "5678", score_for("5678"))
+    snapshot, new_round, history = wb.record_guess(game.id, "1234", score_for("1234"))
+    stored = repo.list_rounds(game.id)
+    assert new_round == stored[0] and new_round.id is not None
+    assert history == stored
+    assert (snapshot.round_count, snapshot.is_finished) == (2, True)
+    assert wb.record_guess(game.id + 1000, "1234", score_for("1234")) is None
+
+def test_provisional_guess_lists_queued_rounds_first(repo, write_behind):
+    wb = write_behind(wait=False, max_delay=5.0)
+    game = repo.create_game("1234")
+    repo.record_guess(game.id, "5678", score_for("5678"))
+    wb.record_guess(game.id, "0123", score_for("0123"))
+    snapshot, new_round, history = wb.record_guess(game.id, "1243", score_for("1243"))
+    assert new_round.id is None and (new_round.exact_match, new_round.partial_match) == (2, 2)
+    assert [r.guess for r in history] == ["1243", "0123", "5678"]
+    assert snapshot.round_count == 3
+    assert [r.guess for r in wb.record_guess(game.id, "4567", score_for("4567"), 2)[2]] == ["4567", "1243"]
+
+@pytest.mark.parametrize("flush_first", [True, False])
+def test_round_flushed_during_a_provisional_read_is_listed_once(repo, write_behind, monkeypatch, flush_first):
+    wb = write_behind(wait=False, max_delay=5.0)
+    game = repo.create_game("1234")
+    wb.record_guess(game.id, "5678", score_for("5678"))
+    list_rounds = repo.list_rounds
+
+    def flush_around_read(*args):
+        # The flusher commits the queued rounds just before or just after this read
+        if flush_first:
+            wb.flush(timeout=5)
+        rounds = list_rounds(*args)
+        if not flush_first:
+            wb.flush(timeout=5)
+        return rounds
+
+    monkeypatch.setattr(repo, "list_rounds", flush_around_read)
+    _, _, history = wb.record_guess(game.id, "0123", score_for("0123"))
+    assert [r.guess for r in history] == ["0123", "5678"]
+
+def test_waiting_guess_times_out_with_503(repo, write_behind, monkeypatch):
+    wb = write_behind(wait=True, max_delay=5.0)
+    game = repo.create_game("1234")
+    monkeypatch.setattr(Config, "WRITE_BEHIND_TIMEOUT", 0.05)
+    with pytest.raises(WriteBehindTimeout):
+        wb.record_guess(game.id, "5678", score_for("5678"))
+
+    client = create_app(lambda: GameService(wb)).test_client()
+    resp = client.post(f"/{game.id}/0123")
+    assert resp.status_code == 503
+    assert resp.headers["Retry-After"] == "1"
+    assert wb.flush(timeout=5)
+    assert [r.guess for r in repo.list_rounds(game.id)] == ["0123", "5678"]  # still written
+
+def test_close_writes_what_is_queued_and_refuses_more(repo, write_behind):
+    wb = write_behind(wait=False, max_delay=5.0)
+    game = repo.create_game("1234")
+    for guess in ("5678", "0123"):
+        wb.record_guess(game.id, guess, score_for(guess))
+    wb.close()
+    assert [r.guess for r in repo.list_rounds(game.id)] == ["0123", "5678"]
+    with pytest.raises(RuntimeError):
+        wb.record_guess(game.id, "1243", score_for("1243"))
+    assert wb.flush(timeout=1)
@@ -0,0 +1,124 @@
+
+"""Flask JSON provider that serializes GTN models without building dicts first.
+
+Game, Round and LeaderboardEntry objects are written by the direct encoders in
+view/json_view.py, so controllers can hand models (or lists of them, or dicts
+holding them) straight to jsonify. Everything else is encoded as Flask's own
+provider would.
+
+Two backends, picked by Config.JSON_PROVIDER:
+  orjson  - orjson.dumps, with each model embedded as a pre-encoded Fragment
+            (orjson < 3.9 has no Fragment and gets the model's dict view instead)
+  stdlib  - a small writer over dicts/lists that appends text pieces and joins once
+  auto    - orjson 3.9+ when installed, else stdlib (which beats orjson's dict path)
+"""
+from __future__ import annotations
+from json.encoder import encode_basestring_ascii as _str
+import json
+from flask.json.provider import DefaultJSONProvider
+from Python_Apps.GTN_MVC_Example.config import Config
+from Python_Apps.GTN_MVC_Example.view.json_view import MODEL_DICTS, MODEL_ENCODERS
+
+try:  # optional dependency: faster encoding of everything that is not a model
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+HAS_ORJSON = orjson is not None
+HAS_FRAGMENT = HAS_ORJSON and hasattr(orjson, "Fragment")
+
+def _write(obj, out: list, default) -> None:
+    enc = MODEL_ENCODERS.get(type(obj))
+    if enc is not None:
+        out.append(enc(obj))
+    elif isinstance(obj, str):
+        out.append(_str(obj))
+    elif obj is None:
+        out.append("null")
+    elif obj is True:
+        out.append("true")
+    elif obj is False:
+        out.append("false")
+    elif isinstance(obj, int):
+        out.append(int.__repr__(obj))
+    elif isinstance(obj, float):
+        out.append(json.dumps(obj))
+    elif isinstance(obj, dict):
+        out.append("{")
+        first = True
+        for k, v in obj.items():
+            if not first:
+                out.append(",")
+            first = False
+            out.append(_str(k if isinstance(k, str) else json.dumps(k).strip('"')))
+            out.append(":")
+            _write(v, out, default)
+        out.append("}")
+    elif isinstance(obj, (list, tuple)):
+        item_enc = MODEL_ENCODERS.get(type(obj[0])) if obj else None
+        if item_enc is not None and all(type(v) is type(obj[0]) for v in obj):
+            # A page of one model type (/games, /rounds): one join, no per-item dispatch
+            out.append("[" + ",".join(map(item_enc, obj)) + "]")
+            return
+        out.append("[")
+        first = True
+        for v in obj:
+            if not first:
+                out.append(",")
+            first = False
+            _write(v, out, default)
+        out.append("]")
+    else:
+        _write(default(obj), out, default)
+
+def stdlib_dumps(obj, default=DefaultJSONProvider.default) -> str:
+    out: list = []
+    _write(obj, out, default)
+    return "".join(out)
+
+def _orjson_default(obj):
+    if HAS_FRAGMENT:
+        enc = MODEL_ENCODERS.get(type(obj))
+        if enc is not None:
+            return orjson.Fragment(enc(obj))
+    else:
+        to_dict = MODEL_DICTS.get(type(obj))
+        if to_dict is not None:
+            return to_dict(obj)
+    return DefaultJSONProvider.default(obj)
+
+def orjson_dumps_bytes(obj) -> bytes:
+    # Models are dataclasses, which orjson would otherwise encode itself with snake_case keys
+    return orjson.dumps(obj, default=_orjson_default, option=orjson.OPT_PASSTHROUGH_DATACLASS)
+
+class FastJSONProvider(DefaultJSONProvider):
+    """DefaultJSONProvider with a model-aware, pluggable encoder. Output is always compact and unsorted."""
+
+    sort_keys = False
+
+    def __init__(self, app, backend: str | None = None) -> None:
+        super().__init__(app)
+        backend = backend or Config.JSON_PROVIDER
+        if backend == "auto":
+            backend = "orjson" if HAS_FRAGMENT else "stdlib"
+        if backend == "orjson" and not HAS_ORJSON:
+            raise ValueError("JSON_PROVIDER=orjson needs orjson installed.")
+        if backend not in ("orjson", "stdlib"):
+            raise ValueError(f"Unknown JSON provider: {backend!r}")
+        self.backend = backend
+
+    def dumps(self, obj, **kwargs) -> str:
+        if kwargs:  # explicit json.dumps options (indent, sort_keys, ...) take the stock path
+            return super().dumps(obj, **kwargs)
+        if self.backend == "orjson":
+            return orjson_dumps_bytes(obj).decode()
+        return stdlib_dumps(obj)
+
+    def _encode(self, obj) -> bytes:
+        if self.backend == "orjson":
+            return orjson_dumps_bytes(obj) + b"\n"
+        return (stdlib_dumps(obj) + "\n").encode()
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self._encode(obj), mimetype=self.mimetype)
@@ -1,4 +1,6 @@
+from json.encoder import encode_basestring_ascii as _str
 from Python_Apps.GTN_MVC_Example.model.game import Game
+from Python_Apps.GTN_MVC_Example.model.leaderboard import LeaderboardEntry
 from Python_Apps.GTN_MVC_Example.model.round import Round
 
 def game_to_dict(g: Game) -> dict:
@@ -8,6 +10,10 @@ def game_to_dict(g: Game) -> dict:
         "answer": g.answer,
         "isFinished": g.is_finished,
         "startedAt": g.started_at.isoformat() if g.started_at else None,
+        "roundCount": g.round_count,
+        "lastGuess": g.last_guess,
+        "bestExact": g.best_exact,
+        "finishedAt": g.finished_at.isoformat() if g.finished_at else None,
     }
 
 def round_to_dict(r: Round) -> dict:
@@ -25,3 +31,79 @@ def games_to_list(rows: list[Game]) -> list[dict]:
 
 def rounds_to_list(rows: list[Round]) -> list[dict]:
     return [round_to_dict(r) for r in rows]
+
+def stats_to_dict(c: dict[str, int]) -> dict:
+    started = c.get("games_started", 0)
+    finished = c.get("games_finished", 0)
+    won = c.get("games_won", 0)
+    distribution = sorted(
+        (int(name[len("wins_in_"):]), n) for name, n in c.items() if name.startswith("wins_in_") and n
+    )
+    return {
+        "gamesStarted": started,
+        "gamesFinished": finished,
+        "gamesWon": won,
+        "winRate": round(won / finished, 4) if finished else None,
+        "roundsPlayed": c.get("rounds", 0),
+        "averageRoundsToWin": round(c.get("win_rounds", 0) / won, 2) if won else None,
+        "averageSecondsToWin": round(c.get("win_seconds", 0) / won, 1) if won else None,
+        # wins by number of rounds taken
+        "guessDistribution": {str(rounds): n for rounds, n in distribution},
+    }
+
+def leaderboard_entry_to_dict(e: LeaderboardEntry) -> dict:
+    return {
+        "gameId": e.game_id,
+        "rounds": e.rounds,
+        "seconds": e.seconds,
+        "finishedAt": e.finished_at.isoformat() if e.finished_at else None,
+    }
+
+def leaderboard_to_list(rows: list[LeaderboardEntry]) -> list[dict]:
+    return [leaderboard_entry_to_dict(e) for e in rows]
+
+# --- Direct encoders ---
+# Same fields and camelCase names as the *_to_dict functions above, written
+# straight to compact JSON text without an intermediate dict. Used by
+# view/json_provider.py and the NDJSON stream; keep the two in step.
+
+def _opt_str(s: str | None) -> str:
+    return "null" if s is None else _str(s)
+
+# isoformat() is the single most expensive step; timestamps are second-resolution
+# and cluster heavily (a page of games started in the same few seconds), so memoize.
+_DT_TEXT: dict = {}
+_DT_TEXT_MAX = 4096
+
+def _dt(d) -> str:
+    if d is None:
+        return "null"
+    text = _DT_TEXT.get(d)
+    if text is None:
+        if len(_DT_TEXT) >= _DT_TEXT_MAX:
+            _DT_TEXT.clear()
+        text = _DT_TEXT[d] = '"' + d.isoformat() + '"'
+    return text
+
+def game_json(g: Game) -> str:
+    return (
+        f'{{"gameId":{g.id},"answer":{_str(g.answer)},'
+        f'"isFinished":{"true" if g.is_finished else "false"},"startedAt":{_dt(g.started_at)},'
+        f'"roundCount":{g.round_count},"lastGuess":{_opt_str(g.last_guess)},'
+        f'"bestExact":{g.best_exact},"finishedAt":{_dt(g.finished_at)}}}'
+    )
+
+def round_json(r: Round) -> str:
+    return (
+        f'{{"roundId":{"null" if r.id is None else r.id},"gameId":{r.game_id},"guess":{_str(r.guess)},'
+        f'"exactMatch":{r.exact_match},"partialMatch":{r.partial_match},"createdAt":{_dt(r.created_at)}}}'
+    )
+
+def leaderboard_entry_json(e: LeaderboardEntry) -> str:
+    return (
+        f'{{"gameId":{e.game_id},"rounds":{e.rounds},"seconds":{e.seconds},'
+        f'"finishedAt":{_dt(e.finished_at)}}}'
+    )
+
+MODEL_ENCODERS = {Game: game_json, Round: round_json, LeaderboardEntry: leaderboard_entry_json}
+MODEL_DICTS = {Game: game_to_dict, Round: round_to_dict, LeaderboardEntry: leaderboard_entry_to_dict}
@@ -1,16 +1,60 @@
-from flask import Flask, request, jsonify, Response
-import mysql.connector
+from flask import Flask, request, jsonify, Response, g
+import mysql.connector.pooling
 import json
 import random
+import threading
 
 app = Flask(__name__)
 
-myDB = mysql.connector.connect(
+DB_CONFIG = dict(
     host='localhost',
     database='gtn',     # CREATE A DATABASE CALLED GTN
     user='root',         
     password='RootRoot' # CHANGE PASSWORD TO YOUR PASSWORD
 )
+POOL_SIZE = 10  # connections shared by all request threads; match to your thread count
+
+# The pool is created on the first request, so the app can start without a live DB
+_pool = None
+_poolLock = threading.Lock()
+# mysql.connector's pool raises when empty instead of waiting, so requests queue here first
+_poolSlots = threading.BoundedSemaphore(POOL_SIZE)
+
+def getPool():
+    global _pool
+    if _pool is None:
+        with _poolLock:
+            if _pool is None:
+                _pool = mysql.connector.pooling.MySQLConnectionPool(
+                    pool_name="gtn_one_file", pool_size=POOL_SIZE, **DB_CONFIG
+                )
+    return _pool
+
+def getDB():
+    # One pooled connection per request, handed back in closeDB
+    if "db" not in g:
+        _poolSlots.acquire()
+        try:
+            g.db = getPool().get_connection()
+        except Exception:
+            _poolSlots.release()
+            raise
+    return g.db
+
+@app.teardown_appcontext
+def closeDB(exc):
+    myDB = g.pop("db", None)
+    if myDB is None:
+        return
+    try:
+        try:
+            myDB.rollback()  # drop anything left uncommitted by a failed request
+        finally:
+            myDB.close()     # returns the connection to the pool, even if it died mid-request
+    except Exception:
+        app.logger.exception("cleaning up the request's database connection failed")
+    finally:
+        _poolSlots.release()
 
 def getAnswer():
     myList = ["0","1","2","3","4","5","6","7","8","9"]
@@ -20,23 +64,22 @@ def getAnswer():
     
 @app.route("/start", methods=["POST"])
 def startGame():
-    mycursor = myDB.cursor()
+    myDB = getDB()
     answer = getAnswer()
     sql = "insert into game (answer, isfinished) values (%s, %s)"
     vals = (answer, False)
-    mycursor.execute(sql, vals)
+    with myDB.cursor() as mycursor:
+        mycursor.execute(sql, vals)
+        game_id = mycursor.lastrowid
     myDB.commit()
-    game_id = mycursor.lastrowid
-    mycursor.close()
 
     return f"Game: {game_id} added" # Return the new gameId
 
 @app.route("/game/<int:gameId>")
 def getGame(gameId):
-    mycursor = myDB.cursor(dictionary=True)
-    mycursor.execute("select * from game where gameId = %s", (gameId,))
-    game = mycursor.fetchone()
-    mycursor.close()
+    with getDB().cursor(dictionary=True) as mycursor:
+        mycursor.execute("select * from game where gameId = %s", (gameId,))
+        game = mycursor.fetchone()
 
     if game.get('isFinished') == False:
         game['answer'] = "****"        
@@ -46,9 +89,9 @@ def getGame(gameId):
 @app.route("/games")
 def getAllGames():
     allGames = []
-    mycursor = myDB.cursor(dictionary=True)
-    mycursor.execute("Select * from game")
-    allGames = mycursor.fetchall()
+    with getDB().cursor(dictionary=True) as mycursor:
+        mycursor.execute("Select * from game")
+        allGames = mycursor.fetchall()
 
     for game in allGames:
         if game.get('isFinished') == False:
@@ -59,32 +102,33 @@ def getAllGames():
 @app.route("/rounds/<int:gameId>")
 def getAllRounds(gameId):
     allRounds = []
-    mycursor = myDB.cursor(dictionary=True)
-    mycursor.execute("Select * from round where gameId = %s order by myTimeStamp desc", (gameId,))
-    allRounds = mycursor.fetchall()
+    with getDB().cursor(dictionary=True) as mycursor:
+        mycursor.execute("Select * from round where gameId = %s order by myTimeStamp desc", (gameId,))
+        allRounds = mycursor.fetchall()
 
     return allRounds
 
 
 @app.route("/<int:gameId>/<guess>", methods=["POST"])
 def makeGuess(gameId, guess):
-    mycursor = myDB.cursor(dictionary=True)
-    mycursor.execute("select * from game where gameId = %s", (gameId,))
-    game = mycursor.fetchone()
-    mycursor.close()
+    myDB = getDB()
+    with myDB.cursor(dictionary=True) as mycursor:
+        mycursor.execute("select * from game where gameId = %s", (gameId,))
+        game = mycursor.fetchone()
 
     # Calculate partial and exact matches
     secret_Answer = game.get("answer")
     if guess == secret_Answer:
-        mycursor = myDB.cursor(dictionary=True)
-        mycursor.execute("update game set isfinished = True where gameId = %s", (gameId,))
+        with myDB.cursor() as mycursor:
+            mycursor.execute("update game set isfinished = True where gameId = %s", (gameId,))
+        myDB.commit()
         return "You win!"
 
     exactMatch, partialMatch = calculate_matches(secret_Answer, guess)
-    mycursor = myDB.cursor(dictionary=True)
     sql = "insert into round(gameId, guess, exactMatch, partialMatch) values (%s,%s,%s,%s)"
     vals = (gameId, guess, exactMatch, partialMatch)
-    mycursor.execute(sql, vals)
+    with myDB.cursor() as mycursor:
+        mycursor.execute(sql, vals)
     myDB.commit()
 
     guesses = getAllRounds(gameId)
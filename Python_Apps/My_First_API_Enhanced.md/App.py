@@ -1,6 +1,7 @@
-from flask import Flask, jsonify, request, Response
-import mysql.connector
+from flask import Flask, jsonify, request, Response, g, stream_with_context
+import mysql.connector.pooling
 import json
+import threading
 
 app = Flask(__name__)
 app.json.sort_keys = False  # This line was added to preserve the output order of the data
@@ -18,26 +19,122 @@ def c_to_f(c):
     f = (c * 9/5) + 32
     return f"<h3>{c} degrees Celcius = {f:.2f} degrees Fahrenheit</h3>"
 
-myDB = mysql.connector.connect(
+DB_CONFIG = dict(
     host = 'localhost',
     database = 'hotelschema',
     user = 'root',
     password = 'RootRoot'
 )
+POOL_SIZE = 10         # connections shared by all request threads
+GUESTS_PAGE_MAX = 1000 # largest ?limit= on /guests
+INSERT_BATCH = 1000    # rows per executemany() in a bulk POST /guests
+
+GUEST_FIELDS = ("fName", "lName", "address", "city", "state", "zip", "phone")
+INSERT_GUEST = ("insert into guest(fName, lName, address, city, state, zip, phone) "
+                "values(%s,%s,%s,%s,%s,%s,%s)")
+
+# The pool is created on the first request, so the app can start without a live DB
+_pool = None
+_poolLock = threading.Lock()
+# mysql.connector's pool raises when empty instead of waiting, so requests queue here first
+_poolSlots = threading.BoundedSemaphore(POOL_SIZE)
+
+def getPool():
+    global _pool
+    if _pool is None:
+        with _poolLock:
+            if _pool is None:
+                _pool = mysql.connector.pooling.MySQLConnectionPool(
+                    pool_name="hotel", pool_size=POOL_SIZE,
+                    consume_results=True,  # a stream cut short leaves unread rows; drain them on close
+                    **DB_CONFIG
+                )
+    return _pool
+
+def getDB():
+    # One pooled connection per request, handed back in closeDB
+    if "db" not in g:
+        _poolSlots.acquire()
+        try:
+            g.db = getPool().get_connection()
+        except Exception:
+            _poolSlots.release()
+            raise
+    return g.db
+
+@app.teardown_appcontext
+def closeDB(exc):
+    myDB = g.pop("db", None)
+    if myDB is None:
+        return
+    try:
+        try:
+            myDB.rollback()  # drop anything left uncommitted by a failed request
+        finally:
+            myDB.close()     # returns the connection to the pool, even if it died mid-request
+    except Exception:
+        app.logger.exception("cleaning up the request's database connection failed")
+    finally:
+        _poolSlots.release()
 
 # Here is example of a GET ALL function
+# ?after_id=&limit= pages by guestId (keyset: no OFFSET scan); ?stream=ndjson streams one guest per line
 @app.route("/guests")
 def allGuests():
-    guests = []
-    myCursor = myDB.cursor(dictionary=True)
-    myCursor.execute("select * from guest")
-    for row in myCursor:
-        guests.append(row)
-    myCursor.close()
-    return Response(
+    afterId = request.args.get("after_id", type=int)
+    limit = request.args.get("limit", type=int)
+    sql = "select * from guest"
+    vals = ()
+    if afterId is not None:
+        sql += " where guestId > %s"
+        vals += (afterId,)
+    sql += " order by guestId"
+    if limit is not None:
+        limit = max(1, min(limit, GUESTS_PAGE_MAX))
+        sql += " limit %s"
+        vals += (limit,)
+
+    if request.args.get("stream") == "ndjson":
+        # Rows go out as the (unbuffered) cursor reads them, so memory stays flat for any table size.
+        # stream_with_context keeps the request's connection checked out until the last row is sent.
+        def generate():
+            with getDB().cursor(dictionary=True) as myCursor:
+                myCursor.execute(sql, vals)
+                for row in myCursor:
+                    yield json.dumps(row, sort_keys=False) + "\n"
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson'), 200
+
+    with getDB().cursor(dictionary=True) as myCursor:
+        myCursor.execute(sql, vals)
+        guests = myCursor.fetchall()
+    resp = Response(
         json.dumps(guests, sort_keys=False),
         mimetype='application/json'
-    ), 200
+    )
+    if limit is not None and len(guests) == limit:
+        # Pass this back as ?after_id= to get the next page
+        resp.headers["X-Next-After-Id"] = str(guests[-1]["guestId"])
+    return resp, 200
+
+# Here is an example of a BULK ADD function: POST a JSON array of guests
+@app.route("/guests", methods=['POST'])
+def addGuests():
+    data = request.get_json(silent=True)
+    if not isinstance(data, list) or not data or not all(isinstance(d, dict) for d in data):
+        return jsonify({"error": "Expected a non-empty JSON array of guests."}), 400
+
+    # executemany() turns each batch into one multi-row insert; all batches share one transaction
+    myDB = getDB()
+    rows = [tuple(d.get(f) for f in GUEST_FIELDS) for d in data]
+    firstId = None
+    with myDB.cursor() as myCursor:
+        for i in range(0, len(rows), INSERT_BATCH):
+            myCursor.executemany(INSERT_GUEST, rows[i:i + INSERT_BATCH])
+            if firstId is None:
+                firstId = myCursor.lastrowid  # id of the first row in the first batch
+    myDB.commit()
+
+    return jsonify({"inserted": len(rows), "firstGuestId": firstId}, "records added"), 201
 
 # Here is an example of an ADD function
 @app.route("/guest", methods=['POST'])
@@ -54,20 +151,17 @@ def addGuest():
     zip = data.get("zip")
     phone = data.get("phone")
 
-    # create a db connection and put data into db
-    myCursor = myDB.cursor()
-    sql = ("insert into guest(fName, lName, address, city, state, zip, phone) "
-           "values(%s,%s,%s,%s,%s,%s,%s)")
+    # borrow this request's pooled connection and put data into db
+    myDB = getDB()
     vals = (fName, lName, address, city, state, zip, phone)
-    myCursor.execute(sql, vals)
-    myDB.commit()
-
-    # To get the last inserted Id, this line must go AFTER commit and BEFORE you close the cursor
-    # **********
-    newId = myCursor.lastrowid
-    # **********
+    with myDB.cursor() as myCursor:
+        myCursor.execute(INSERT_GUEST, vals)
+        myDB.commit()
 
-    myCursor.close()
+        # To get the last inserted Id, this line must go AFTER commit and BEFORE you close the cursor
+        # **********
+        newId = myCursor.lastrowid
+        # **********
 
     # return the new data with the new ID
     new_record = {
@@ -87,11 +181,10 @@ def addGuest():
 @app.route("/guest/<int:id>")
 def getById(id):
     guests = []
-    myCursor = myDB.cursor()
-    myCursor.execute("select * from guest where guestId = %s", (id,)) # Must have comma after id
-    for row in myCursor:
-        guests.append(row)
-    myCursor.close()
+    with getDB().cursor() as myCursor:
+        myCursor.execute("select * from guest where guestId = %s", (id,)) # Must have comma after id
+        for row in myCursor:
+            guests.append(row)
     return jsonify(guests), 200  # notice the output on this one!
 
 